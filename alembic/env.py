@@ -32,6 +32,15 @@ target_metadata = Base.metadata
 config.set_main_option("sqlalchemy.url", settings.PG_URL)
 
 
+# Колонки search_vector и их GIN-индексы есть только в миграции (PostgreSQL),
+# в моделях их нет, поэтому autogenerate не должен предлагать их удалить.
+SEARCH_OBJECTS = {"search_vector", "ix_questions_search_vector", "ix_answer_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    return not (reflected and name in SEARCH_OBJECTS)
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -48,6 +57,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -57,7 +67,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
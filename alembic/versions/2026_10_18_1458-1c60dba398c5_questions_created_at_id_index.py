@@ -0,0 +1,28 @@
+"""questions created_at id index
+
+Revision ID: 1c60dba398c5
+Revises: 8dad6641d86b
+Create Date: 2026-10-18 14:58:17.523173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c60dba398c5'
+down_revision: Union[str, Sequence[str], None] = '8dad6641d86b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_questions_created_at_id', 'questions', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_questions_created_at_id', table_name='questions')
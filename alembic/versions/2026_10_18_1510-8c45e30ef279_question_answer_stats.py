@@ -0,0 +1,43 @@
+"""question answer stats
+
+Revision ID: 8c45e30ef279
+Revises: 1c60dba398c5
+Create Date: 2026-10-18 15:10:41.914527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c45e30ef279'
+down_revision: Union[str, Sequence[str], None] = '1c60dba398c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Значения для существующих вопросов заполняет команда
+    python -m app.commands.backfill_question_stats
+    """
+    op.add_column('questions', sa.Column('answer_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('questions', sa.Column('last_answer_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_questions_answer_count_id', 'questions', ['answer_count', 'id'], unique=False)
+    op.create_index(
+        'ix_questions_last_activity_id',
+        'questions',
+        [sa.text('coalesce(last_answer_at, created_at)'), 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_questions_last_activity_id', table_name='questions')
+    op.drop_index('ix_questions_answer_count_id', table_name='questions')
+    op.drop_column('questions', 'last_answer_at')
+    op.drop_column('questions', 'answer_count')
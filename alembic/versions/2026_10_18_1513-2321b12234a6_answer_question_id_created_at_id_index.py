@@ -0,0 +1,33 @@
+"""answer question_id created_at id index
+
+Revision ID: 2321b12234a6
+Revises: 8c45e30ef279
+Create Date: 2026-10-18 15:13:48.391784
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2321b12234a6'
+down_revision: Union[str, Sequence[str], None] = '8c45e30ef279'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_answer_question_id_created_at_id',
+        'answer',
+        ['question_id', 'created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_answer_question_id_created_at_id', table_name='answer')
@@ -0,0 +1,34 @@
+"""question version
+
+Revision ID: 5b7e0c2d9a41
+Revises: 2321b12234a6
+Create Date: 2026-10-18 15:30:12.204611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e0c2d9a41'
+down_revision: Union[str, Sequence[str], None] = '2321b12234a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('questions', sa.Column('version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column(
+        'questions',
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.execute("UPDATE questions SET updated_at = coalesce(last_answer_at, created_at)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('questions', 'updated_at')
+    op.drop_column('questions', 'version')
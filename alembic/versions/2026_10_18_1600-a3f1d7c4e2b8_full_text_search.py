@@ -0,0 +1,62 @@
+"""full text search
+
+Revision ID: a3f1d7c4e2b8
+Revises: 5b7e0c2d9a41
+Create Date: 2026-10-18 16:00:27.518302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1d7c4e2b8'
+down_revision: Union[str, Sequence[str], None] = '5b7e0c2d9a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "to_tsvector('russian'::regconfig, coalesce(text, '')) || "
+    "to_tsvector('english'::regconfig, coalesce(text, ''))"
+)
+TABLES = ('questions', 'answer')
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Только для PostgreSQL: на других базах поиск работает по индексу в памяти
+    (app.search.index). Генерируемые колонки заполняются при добавлении, что
+    переписывает таблицы — на больших таблицах выполняйте в окно обслуживания.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(SEARCH_VECTOR, persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f'ix_{table}_search_vector',
+            table,
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in TABLES:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,37 @@
+"""question activity rollup for trending
+
+Revision ID: f2c8a61d9b47
+Revises: e91b4c7a0d35
+Create Date: 2026-10-18 17:00:12.408317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8a61d9b47'
+down_revision: Union[str, Sequence[str], None] = 'e91b4c7a0d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'question_activity',
+        sa.Column('question_id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.BigInteger(), nullable=False),
+        sa.Column('answers', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('question_id', 'bucket_start'),
+    )
+    op.create_index('ix_question_activity_bucket_start', 'question_activity', ['bucket_start'], unique=False)
+    # Начальное заполнение за последние 7 дней — app.commands.backfill_trending.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_question_activity_bucket_start', table_name='question_activity')
+    op.drop_table('question_activity')
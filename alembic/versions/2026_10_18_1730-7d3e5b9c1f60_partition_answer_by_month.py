@@ -0,0 +1,125 @@
+"""partition answer by month
+
+Revision ID: 7d3e5b9c1f60
+Revises: f2c8a61d9b47
+Create Date: 2026-10-18 17:30:41.226094
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e5b9c1f60'
+down_revision: Union[str, Sequence[str], None] = 'f2c8a61d9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Секции на столько месяцев вперёд создаются сразу; дальше их создаёт
+# приложение при старте и app.commands.answer_partitions.
+MONTHS_AHEAD = 3
+SEARCH_VECTOR = (
+    "to_tsvector('russian'::regconfig, coalesce(text, '')) || "
+    "to_tsvector('english'::regconfig, coalesce(text, ''))"
+)
+COLUMNS = "id, question_id, user_id, text, created_at"
+INDEXES = (
+    ('answer_pkey', 'answer_unpartitioned_pkey'),
+    ('ix_answer_question_id_created_at_id', 'ix_answer_unpartitioned_question_id_created_at_id'),
+    ('ix_answer_search_vector', 'ix_answer_unpartitioned_search_vector'),
+)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Только для PostgreSQL: таблица `answer` становится секционированной по
+    created_at (секция на месяц, answer_pYYYYMM, и answer_default для дат вне
+    секций). Первичный ключ секционированной таблицы обязан включать ключ
+    секционирования, поэтому он становится (id, created_at); ID по-прежнему
+    выдаёт та же последовательность answer_id_seq.
+
+    Данные копируются из старой таблицы одним INSERT ... SELECT под
+    блокировкой — на больших таблицах выполняйте в окно обслуживания.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    bind = op.get_bind()
+    op.execute('ALTER TABLE answer RENAME TO answer_unpartitioned')
+    for name, renamed in INDEXES:
+        op.execute(f'ALTER INDEX IF EXISTS {name} RENAME TO {renamed}')
+    op.execute('ALTER TABLE answer_unpartitioned RENAME CONSTRAINT answer_question_id_fkey TO answer_unpartitioned_question_id_fkey')
+    # Последовательность удалилась бы вместе со старой таблицей.
+    op.execute('ALTER SEQUENCE answer_id_seq OWNED BY NONE')
+
+    op.execute(f"""
+        CREATE TABLE answer (
+            id integer NOT NULL DEFAULT nextval('answer_id_seq'),
+            question_id integer NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
+            user_id uuid NOT NULL,
+            text varchar(255) NOT NULL,
+            created_at timestamp with time zone NOT NULL DEFAULT now(),
+            search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED,
+            CONSTRAINT answer_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute('ALTER SEQUENCE answer_id_seq OWNED BY answer.id')
+    op.create_index('ix_answer_question_id_created_at_id', 'answer', ['question_id', 'created_at', 'id'])
+    op.create_index('ix_answer_search_vector', 'answer', ['search_vector'], postgresql_using='gin')
+
+    oldest = bind.execute(sa.text('SELECT min(created_at) FROM answer_unpartitioned')).scalar()
+    now = datetime.now(timezone.utc)
+    month = (oldest or now).astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = _add_months(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE answer_p{month:%Y%m} PARTITION OF answer "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute('CREATE TABLE answer_default PARTITION OF answer DEFAULT')
+
+    op.execute(f'INSERT INTO answer ({COLUMNS}) SELECT {COLUMNS} FROM answer_unpartitioned')
+    op.execute('DROP TABLE answer_unpartitioned')
+    op.execute('ANALYZE answer')
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Возвращает обычную таблицу `answer` с первичным ключом по id; архивные
+    секции (app.commands.archive_answers) копируются вместе с остальными.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('ALTER TABLE answer RENAME TO answer_partitioned')
+    op.execute('ALTER INDEX answer_pkey RENAME TO answer_partitioned_pkey')
+    op.execute('ALTER INDEX ix_answer_question_id_created_at_id RENAME TO ix_answer_partitioned_question_id_created_at_id')
+    op.execute('ALTER INDEX ix_answer_search_vector RENAME TO ix_answer_partitioned_search_vector')
+    op.execute('ALTER TABLE answer_partitioned RENAME CONSTRAINT answer_question_id_fkey TO answer_partitioned_question_id_fkey')
+    op.execute('ALTER SEQUENCE answer_id_seq OWNED BY NONE')
+    op.execute(f"""
+        CREATE TABLE answer (
+            id integer NOT NULL DEFAULT nextval('answer_id_seq'),
+            question_id integer NOT NULL REFERENCES questions (id) ON DELETE CASCADE,
+            user_id uuid NOT NULL,
+            text varchar(255) NOT NULL,
+            created_at timestamp with time zone NOT NULL DEFAULT now(),
+            search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED,
+            CONSTRAINT answer_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute('ALTER SEQUENCE answer_id_seq OWNED BY answer.id')
+    op.execute(f'INSERT INTO answer ({COLUMNS}) SELECT {COLUMNS} FROM answer_partitioned')
+    op.execute('DROP TABLE answer_partitioned')
+    op.create_index('ix_answer_question_id_created_at_id', 'answer', ['question_id', 'created_at', 'id'])
+    op.create_index('ix_answer_search_vector', 'answer', ['search_vector'], postgresql_using='gin')
@@ -0,0 +1,57 @@
+"""answer user_id created_at id index
+
+Revision ID: b4a9e2f7c318
+Revises: 7d3e5b9c1f60
+Create Date: 2026-10-18 18:00:09.653120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4a9e2f7c318'
+down_revision: Union[str, Sequence[str], None] = '7d3e5b9c1f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = 'ix_answer_user_id_created_at_id'
+COLUMNS = ['user_id', 'created_at', 'id']
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    В PostgreSQL индекс строится без блокировки записи (CONCURRENTLY). У
+    секционированной таблицы так нельзя построить индекс целиком, поэтому
+    сначала создаётся пустой индекс только на родительской таблице (ON ONLY),
+    затем индекс каждой секции строится CONCURRENTLY и присоединяется к нему;
+    после присоединения последней секции индекс становится действительным.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.create_index(INDEX, 'answer', COLUMNS, unique=False)
+        return
+    partitions = bind.execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('answer') ORDER BY c.relname"
+    )).scalars().all()
+    if not partitions:
+        with op.get_context().autocommit_block():
+            op.create_index(INDEX, 'answer', COLUMNS, unique=False, postgresql_concurrently=True)
+        return
+    op.execute(f"CREATE INDEX {INDEX} ON ONLY answer (user_id, created_at, id)")
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition}_user_id_created_at_id_idx "
+                f"ON {partition} (user_id, created_at, id)"
+            )
+            op.execute(f"ALTER INDEX {INDEX} ATTACH PARTITION {partition}_user_id_created_at_id_idx")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(INDEX, table_name='answer')
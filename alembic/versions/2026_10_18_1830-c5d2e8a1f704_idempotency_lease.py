@@ -0,0 +1,29 @@
+"""idempotency key lease
+
+Revision ID: c5d2e8a1f704
+Revises: b4a9e2f7c318
+Create Date: 2026-10-18 18:30:12.402817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2e8a1f704'
+down_revision: Union[str, Sequence[str], None] = 'b4a9e2f7c318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующие незавершённые записи получают NULL: их аренда считается истёкшей.
+    op.add_column('idempotency_keys', sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_keys', 'locked_until')
@@ -0,0 +1,40 @@
+"""idempotency keys scoped per client
+
+Revision ID: 8e4f1a6c2b93
+Revises: c5d2e8a1f704
+Create Date: 2026-10-18 18:45:40.118263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f1a6c2b93'
+down_revision: Union[str, Sequence[str], None] = 'c5d2e8a1f704'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Клиент старых записей неизвестен: они доживают свой TTL под пустым клиентом
+    # и повтором уже не находятся (запрос выполнится заново).
+    op.add_column(
+        'idempotency_keys',
+        sa.Column('client', sa.String(length=255), server_default='', nullable=False),
+    )
+    op.alter_column('idempotency_keys', 'client', server_default=None)
+    op.drop_constraint('idempotency_keys_pkey', 'idempotency_keys', type_='primary')
+    op.create_primary_key('idempotency_keys_pkey', 'idempotency_keys', ['client', 'key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Одинаковые ключи разных клиентов не уместятся в первичный ключ по key.
+    op.execute("DELETE FROM idempotency_keys WHERE client <> ''")
+    op.drop_constraint('idempotency_keys_pkey', 'idempotency_keys', type_='primary')
+    op.create_primary_key('idempotency_keys_pkey', 'idempotency_keys', ['key'])
+    op.drop_column('idempotency_keys', 'client')
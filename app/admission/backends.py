@@ -0,0 +1,142 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from app.logs.logger import logger
+
+
+class RateLimiter(ABC):
+    """
+    Интерфейс ограничителя частоты запросов по алгоритму token bucket.
+
+    У каждого клиента своя «корзина» вместимостью burst токенов, которая
+    пополняется со скоростью rate токенов в секунду; запрос забирает один
+    токен. Пустая корзина — запрос отклоняется, acquire() возвращает, через
+    сколько секунд появится токен (для Retry-After).
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.allowed = 0
+        self.limited = 0
+
+    async def acquire(self, key: str) -> float:
+        """
+        Забирает токен из корзины клиента.
+
+        key: Идентификатор клиента.
+        return: 0, если запрос разрешён, иначе сколько секунд ждать токена.
+        """
+        wait = await self._acquire(key)
+        if wait > 0:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    @abstractmethod
+    async def _acquire(self, key: str) -> float:
+        """Забирает токен; возвращает ожидание в секундах (0 — разрешено)."""
+
+    def stats(self) -> dict:
+        """Счётчики ограничителя."""
+        return {
+            "backend": type(self).__name__,
+            "rate": self.rate,
+            "burst": self.burst,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+class NullRateLimiter(RateLimiter):
+    """Ограничение частоты отключено: разрешён любой запрос."""
+
+    async def _acquire(self, key: str) -> float:
+        return 0.0
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    Корзины в памяти процесса.
+
+    Хранится не больше max_keys корзин: при переполнении вытесняется корзина
+    клиента, дольше всех не делавшего запросов (она почти наверняка уже полна).
+    При нескольких воркерах лимит фактически умножается на их число.
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int):
+        super().__init__(rate, burst)
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def _acquire(self, key: str) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> dict:
+        return {**super().stats(), "keys": len(self._buckets), "max_keys": self.max_keys}
+
+
+# Корзина — хэш {tokens, ts}; время берётся с сервера Redis, чтобы расхождение
+# часов воркеров не влияло на пополнение.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    Общие для всех воркеров корзины в Redis (атомарно, Lua-скриптом).
+
+    Принимает асинхронный клиент с методом eval, например redis.asyncio.Redis.
+    Если Redis недоступен, запрос пропускается (fail open): ограничение
+    частоты не должно останавливать сервис.
+    """
+
+    def __init__(self, client: Any, rate: float, burst: int, prefix: str = "qa:ratelimit:"):
+        super().__init__(rate, burst)
+        self.client = client
+        self.prefix = prefix
+        self.errors = 0
+
+    async def _acquire(self, key: str) -> float:
+        try:
+            wait = await self.client.eval(TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, self.rate, self.burst)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Ограничитель частоты в Redis недоступен, запрос пропущен: {e}")
+            return 0.0
+        return float(wait)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "errors": self.errors}
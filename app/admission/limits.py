@@ -0,0 +1,116 @@
+import math
+from typing import Callable, Optional
+
+from app.admission.backends import MemoryRateLimiter, NullRateLimiter, RateLimiter, RedisRateLimiter
+from app.config import Settings
+from app.database.database import database
+from app.utils.component import Component
+
+SHED_INFLIGHT = "inflight"
+SHED_POOL_WAIT = "pool_wait"
+
+
+def create_rate_limiter(
+    backend: str,
+    rate: float,
+    burst: int,
+    max_keys: int,
+    redis_url: Optional[str] = None,
+) -> RateLimiter:
+    """
+    Создаёт ограничитель частоты по имени из настроек.
+
+    backend: "memory", "redis" или "none".
+    rate: Пополнение корзины, запросов в секунду.
+    burst: Вместимость корзины (допустимый всплеск).
+    max_keys: Максимум корзин в памяти (для "memory").
+    redis_url: URL сервера (для "redis", нужен пакет redis).
+    """
+    if backend == "memory":
+        return MemoryRateLimiter(rate=rate, burst=burst, max_keys=max_keys)
+    if backend == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("Для RATE_LIMIT_BACKEND=redis установите пакет redis") from e
+        return RedisRateLimiter(Redis.from_url(redis_url), rate=rate, burst=burst)
+    if backend == "none":
+        return NullRateLimiter(rate=rate, burst=burst)
+    raise ValueError(f"Неизвестный бэкенд ограничения частоты: {backend}")
+
+
+class LoadShedder:
+    """
+    Глобальный admission-контроль процесса.
+
+    Запрос отклоняется сразу (503 + Retry-After), если одновременно
+    выполняется max_inflight запросов или недавнее ожидание соединения из
+    пула превысило max_pool_wait_ms: при всплеске лучше быстро отказать части
+    клиентов, чем заставить всех ждать pool_timeout и получить 500.
+    Нулевой порог отключает соответствующую проверку.
+    """
+
+    def __init__(self, max_inflight: int, max_pool_wait_ms: float, pool_wait: Callable[[], float]):
+        self.max_inflight = max_inflight
+        self.max_pool_wait = max_pool_wait_ms / 1000
+        self.pool_wait = pool_wait
+        self.inflight = 0
+        self.shed = {SHED_INFLIGHT: 0, SHED_POOL_WAIT: 0}
+
+    def try_enter(self) -> Optional[tuple[str, int]]:
+        """
+        Пытается допустить запрос.
+
+        return: None, если запрос допущен (после него нужно вызвать leave()),
+            иначе (причина отказа, Retry-After в секундах).
+        """
+        if self.max_inflight and self.inflight >= self.max_inflight:
+            self.shed[SHED_INFLIGHT] += 1
+            return SHED_INFLIGHT, 1
+        if self.max_pool_wait:
+            wait = self.pool_wait()
+            if wait > self.max_pool_wait:
+                self.shed[SHED_POOL_WAIT] += 1
+                return SHED_POOL_WAIT, max(1, math.ceil(wait))
+        self.inflight += 1
+        return None
+
+    def leave(self) -> None:
+        self.inflight -= 1
+
+    def stats(self) -> dict:
+        """Счётчики отклонённых запросов и текущая нагрузка."""
+        return {
+            "inflight": self.inflight,
+            "max_inflight": self.max_inflight,
+            "pool_wait_recent_seconds": round(self.pool_wait(), 6),
+            "max_pool_wait_seconds": self.max_pool_wait,
+            "shed": dict(self.shed),
+        }
+
+
+def recent_pool_wait() -> float:
+    """Наибольшее недавнее ожидание соединения среди пулов primary и реплик."""
+    return max(metrics.recent_wait() for metrics in (database.pool_metrics, *database.replica_metrics))
+
+
+def rate_limiter_from_settings(settings: Settings) -> RateLimiter:
+    return create_rate_limiter(
+        backend=settings.RATE_LIMIT_BACKEND,
+        rate=settings.RATE_LIMIT_RATE,
+        burst=settings.RATE_LIMIT_BURST,
+        max_keys=settings.RATE_LIMIT_MAX_KEYS,
+        redis_url=settings.REDIS_URL,
+    )
+
+
+def load_shedder_from_settings(settings: Settings) -> LoadShedder:
+    return LoadShedder(
+        max_inflight=settings.SHED_MAX_INFLIGHT,
+        max_pool_wait_ms=settings.SHED_POOL_WAIT_MS,
+        pool_wait=recent_pool_wait,
+    )
+
+
+rate_limiter: Component[RateLimiter] = Component(rate_limiter_from_settings)
+load_shedder: Component[LoadShedder] = Component(load_shedder_from_settings)
@@ -0,0 +1,103 @@
+import math
+import re
+from typing import Optional
+
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.admission.backends import RateLimiter
+from app.admission.limits import LoadShedder, load_shedder, rate_limiter
+from app.config import settings
+from app.utils.client import get_client_id
+
+# Метрики должны отвечать и под нагрузкой.
+EXEMPT_PATHS = re.compile(r"^/metrics(/|$)")
+# Подписки SSE живут долго и не держат соединение с базой: в число
+# одновременных запросов они не входят.
+UNLIMITED_PATHS = re.compile(r"^/questions/\d+/events$")
+RATE_LIMIT_KEYS = ("client", "ip", "user")
+
+
+def rate_limit_key(scope: Scope, key_by: str) -> str:
+    """
+    Ключ корзины клиента.
+
+    key_by: "ip" — IP-адрес, "client" — X-Client-Id или IP, "user" — параметр
+        user_id запроса, а без него — как "client".
+
+    X-Client-Id и user_id задаёт сам вызывающий: подставляя новое значение в
+    каждый запрос, он каждый раз получает новую корзину. Поэтому "client" и
+    "user" годятся только за прокси, который аутентифицирует клиента и сам
+    проставляет (или проверяет) эти значения; иначе используйте "ip".
+    """
+    connection = HTTPConnection(scope)
+    if key_by == "user":
+        user_id = connection.query_params.get("user_id")
+        if user_id:
+            return f"user:{user_id}"
+    if key_by == "ip":
+        return f"ip:{connection.client.host if connection.client else 'anonymous'}"
+    return f"client:{get_client_id(connection)}"
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware admission-контроля: ограничение частоты по клиенту
+    и сброс нагрузки.
+
+    Сначала запрос проверяется ограничителем частоты (token bucket на клиента,
+    429 + Retry-After), затем LoadShedder (503 + Retry-After при превышении
+    числа одновременных запросов или ожидания пула). Отказ формируется до
+    маршрута, не занимая соединение с базой.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: RateLimiter = rate_limiter,
+        shedder: LoadShedder = load_shedder,
+        key_by: Optional[str] = None,
+    ):
+        # Ключ читается при создании middleware, а не при импорте: create_app
+        # задаёт настройки раньше.
+        key_by = key_by or settings.RATE_LIMIT_KEY
+        if key_by not in RATE_LIMIT_KEYS:
+            raise ValueError(f"Неизвестный ключ ограничения частоты: {key_by}")
+        self.app = app
+        self.limiter = limiter
+        self.shedder = shedder
+        self.key_by = key_by
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or EXEMPT_PATHS.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        wait = await self.limiter.acquire(rate_limit_key(scope, self.key_by))
+        if wait > 0:
+            response = JSONResponse(
+                {"detail": "Слишком много запросов"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+            await response(scope, receive, send)
+            return
+
+        if UNLIMITED_PATHS.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        rejected = self.shedder.try_enter()
+        if rejected is not None:
+            _, retry_after = rejected
+            response = JSONResponse(
+                {"detail": "Сервис перегружен, повторите позже"},
+                status_code=503,
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.shedder.leave()
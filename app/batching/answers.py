@@ -0,0 +1,141 @@
+import asyncio
+import contextvars
+import uuid
+from typing import Optional
+
+from sqlalchemy import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.config import Settings
+from app.logs.logger import logger
+from app.repositories.answers import AnswerRepository
+from app.utils.component import Component
+
+
+class AnswerBatcher:
+    """
+    Групповая запись ответов (group commit) для пиковой нагрузки.
+
+    Запросы не пишут каждый свою транзакцию, а ставят ответ в очередь и ждут
+    future. Фоновая задача забирает из очереди до `max_items` ответов — как только
+    их набралось столько или прошло `max_delay_ms` с начала ожидания — и пишет
+    их одной транзакцией (AnswerRepository.create_answers_batch). Пока пачка
+    пишется, следующая копится, поэтому при всплеске один commit приходится на
+    много запросов, а в спокойное время задержка не больше `max_delay_ms`.
+
+    Пачка пишется собственной сессией на том же движке, что и сессия запроса
+    (session.bind): запрос, отменённый во время записи, не закрывает её из-под
+    пачки, а соединение из пула занимается одно на пачку. Если пачка упала
+    целиком (например, один ответ нарушил ограничение базы), её ответы пишутся
+    по одному, и ошибку получает только виновный запрос.
+    """
+
+    def __init__(self, max_items: int, max_delay_ms: float):
+        self.max_items = max_items
+        self.max_delay = max_delay_ms / 1000
+        self._pending: list[tuple[dict, AsyncEngine, asyncio.Future]] = []
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.items = 0
+        self.fallbacks = 0
+
+    async def submit(self, question_id: int, text: str, user_id: uuid.UUID, session: AsyncSession) -> Optional[Row]:
+        """
+        Ставит ответ в очередь и ждёт, пока его пачка будет записана.
+
+        Args:
+            question_id (int): ID вопроса.
+            text (str): Текст ответа.
+            user_id (uuid.UUID): UUID пользователя.
+            session (AsyncSession): Сессия запроса (из неё берётся движок базы).
+
+        Returns:
+            Row | None: Строка (id, created_at) или None, если вопроса нет.
+        """
+        future = asyncio.get_running_loop().create_future()
+        item = {"question_id": question_id, "text": text, "user_id": user_id}
+        self._pending.append((item, session.bind, future))
+        if self._task is None:
+            self._full = asyncio.Event()
+            # Новый контекст: иначе задача унаследует метрики запроса, который её запустил.
+            self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+        if len(self._pending) >= self.max_items:
+            self._full.set()
+        return await future
+
+    async def _run(self) -> None:
+        try:
+            while self._pending:
+                if len(self._pending) < self.max_items:
+                    self._full.clear()
+                    try:
+                        await asyncio.wait_for(self._full.wait(), self.max_delay)
+                    except asyncio.TimeoutError:
+                        pass
+                batch = self._pending[:self.max_items]
+                del self._pending[:self.max_items]
+                engines: dict[AsyncEngine, list] = {}
+                for entry in batch:
+                    engines.setdefault(entry[1], []).append(entry)
+                for entries in engines.values():
+                    await self._write(entries)
+        finally:
+            self._task = None
+
+    async def _write(self, batch: list[tuple[dict, AsyncEngine, asyncio.Future]]) -> None:
+        try:
+            async with AsyncSession(batch[0][1], expire_on_commit=False) as session:
+                results = await AnswerRepository.create_answers_batch([item for item, _, _ in batch], session)
+        except SQLAlchemyError as e:
+            if len(batch) == 1:
+                self._resolve(batch[0][2], error=e)
+                return
+            self.fallbacks += 1
+            logger.warning(f"Пачка из {len(batch)} ответов не записана ({e}), запись по одному")
+            for entry in batch:
+                await self._write([entry])
+            return
+        except Exception as e:
+            # Например, база недоступна: ошибку получают все запросы пачки,
+            # а фоновая задача продолжает обслуживать очередь.
+            logger.exception(f"Ошибка записи пачки ответов: {e}")
+            for _, _, future in batch:
+                self._resolve(future, error=e)
+            return
+        self.batches += 1
+        self.items += len(batch)
+        for (_, _, future), result in zip(batch, results):
+            self._resolve(future, result)
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result: Optional[Row] = None, error: Optional[BaseException] = None) -> None:
+        # Запрос мог быть отменён (клиент ушёл), пока пачка писалась.
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def stats(self) -> dict:
+        """Счётчики пачек."""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "fallbacks": self.fallbacks,
+            "pending": len(self._pending),
+            "max_items": self.max_items,
+            "max_delay_ms": self.max_delay * 1000,
+        }
+
+
+def answer_batcher_from_settings(settings: Settings) -> AnswerBatcher:
+    return AnswerBatcher(
+        max_items=settings.ANSWER_BATCH_MAX_ITEMS,
+        max_delay_ms=settings.ANSWER_BATCH_MAX_DELAY_MS,
+    )
+
+
+answer_batcher: Component[AnswerBatcher] = Component(answer_batcher_from_settings)
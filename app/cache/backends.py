@@ -0,0 +1,142 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class CacheBackend(ABC):
+    """
+    Интерфейс бэкенда кэша сериализованных ответов API.
+
+    Значения — готовые байты JSON, ключи — строки вида "question:1".
+    Счётчики попаданий, промахов и вытеснений доступны через stats().
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Возвращает значение по ключу или None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        """Сохраняет значение на время ttl."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Удаляет ключи (инвалидация)."""
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Полностью очищает кэш."""
+
+    def stats(self) -> dict:
+        """Счётчики работы кэша."""
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class NullCache(CacheBackend):
+    """Отключённый кэш: ничего не хранит, каждое обращение — промах."""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+    async def clear(self) -> None:
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """
+    Кэш в памяти процесса с TTL и вытеснением по LRU.
+
+    Размер ограничен max_size записями: при переполнении удаляется
+    запись, к которой дольше всего не обращались. Истёкшие записи
+    удаляются при обращении к ним.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        super().__init__(ttl)
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._data), "max_size": self.max_size}
+
+
+class RedisCache(CacheBackend):
+    """
+    Кэш в Redis (или совместимом хранилище).
+
+    Принимает асинхронный клиент с методами get/set(ex=...)/delete,
+    например redis.asyncio.Redis. Вытеснением занимается сам сервер
+    (maxmemory-policy), поэтому счётчик evictions здесь не ведётся.
+    """
+
+    def __init__(self, client: Any, ttl: int, prefix: str = "qa:"):
+        super().__init__(ttl)
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self.client.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        await self.client.set(self.prefix + key, value, ex=self.ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self.client.delete(*(self.prefix + key for key in keys))
+
+    async def clear(self) -> None:
+        keys = [key async for key in self.client.scan_iter(match=self.prefix + "*")]
+        if keys:
+            await self.client.delete(*keys)
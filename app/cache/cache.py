@@ -0,0 +1,59 @@
+from typing import Optional
+
+from app.cache.backends import CacheBackend, MemoryCache, NullCache, RedisCache
+from app.config import Settings
+from app.utils.component import Component
+
+
+def question_key(question_id: int) -> str:
+    """
+    Ключ поколения кэша вопроса.
+
+    Под ним лежит токен поколения, который входит в ключи страниц вопроса
+    (question_page_key). Удаление этого ключа инвалидирует сразу все
+    закэшированные страницы ответов вопроса: новые чтения получат новый токен,
+    а старые записи вытеснятся по TTL/LRU.
+    """
+    return f"question:{question_id}"
+
+
+def question_page_key(question_id: int, generation: bytes, limit: int, cursor: Optional[str]) -> str:
+    return f"question:{question_id}:{generation.decode()}:{limit}:{cursor or ''}"
+
+
+def answer_key(answer_id: int) -> str:
+    return f"answer:{answer_id}"
+
+
+def create_cache(backend: str, ttl: int, max_size: int, redis_url: Optional[str] = None) -> CacheBackend:
+    """
+    Создаёт бэкенд кэша по имени из настроек.
+
+    backend: "memory", "redis" или "none".
+    ttl: Время жизни записи в секундах.
+    max_size: Максимальное количество записей (для "memory").
+    redis_url: URL сервера (для "redis", нужен пакет redis).
+    """
+    if backend == "memory":
+        return MemoryCache(ttl=ttl, max_size=max_size)
+    if backend == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("Для CACHE_BACKEND=redis установите пакет redis") from e
+        return RedisCache(Redis.from_url(redis_url), ttl=ttl)
+    if backend == "none":
+        return NullCache(ttl=ttl)
+    raise ValueError(f"Неизвестный бэкенд кэша: {backend}")
+
+
+def cache_from_settings(settings: Settings) -> CacheBackend:
+    return create_cache(
+        backend=settings.CACHE_BACKEND,
+        ttl=settings.CACHE_TTL,
+        max_size=settings.CACHE_MAX_SIZE,
+        redis_url=settings.REDIS_URL,
+    )
+
+
+cache: Component[CacheBackend] = Component(cache_from_settings)
@@ -0,0 +1,61 @@
+"""Секции таблицы ответов: создание вперёд, список и план запроса.
+
+Таблица `answer` в PostgreSQL секционирована по месяцам created_at (миграция
+7d3e5b9c1f60). Секции на ANSWER_PARTITIONS_AHEAD месяцев вперёд создаёт
+приложение при старте; команду стоит запускать по cron (например, раз в
+сутки), чтобы секции появлялись и без перезапуска. Ответы, попавшие в секцию
+по умолчанию (answer_default), переносятся в созданную секцию их месяца.
+
+`--explain QUESTION_ID` печатает план запроса первой страницы ответов
+вопроса (как в GET /questions/{id}): в нём видно, что читаются только
+секции месяцев, когда вопрос получал ответы.
+
+Запуск:
+    python -m app.commands.answer_partitions --months-ahead 3
+    python -m app.commands.answer_partitions --explain 42
+"""
+
+import argparse
+import asyncio
+from typing import Optional
+
+from app.config import settings
+from app.database.database import database
+from app.database.partitions import ensure_answer_partitions
+from app.logs.logger import logger, setup_logging
+from app.repositories.answers import AnswerRepository
+from app.repositories.partitions import AnswerPartitionRepository
+from app.repositories.questions import QuestionRepository
+
+
+async def main(months_ahead: int, explain: Optional[int]) -> None:
+    setup_logging()
+    try:
+        async with database.session_factory() as session:
+            if not await AnswerPartitionRepository.is_partitioned(session):
+                logger.warning("Таблица ответов не секционирована (нужны PostgreSQL и миграция 7d3e5b9c1f60)")
+                return
+        await ensure_answer_partitions(database.session_factory, months_ahead)
+        async with database.session_factory() as session:
+            for row in await AnswerPartitionRepository.partitions(session):
+                size = await AnswerPartitionRepository.relation_size(row.name, session)
+                print(f"{row.name}\t{row.bound}\t{size} байт")
+            if explain is not None:
+                question = await QuestionRepository.get_question_by_id(explain, session)
+                if question is None:
+                    logger.warning(f"Вопрос {explain} не найден")
+                    return
+                query = AnswerRepository.answers_page_query(
+                    explain, 51, created_between=(question.created_at, question.last_answer_at)
+                )
+                print("\n".join(await AnswerPartitionRepository.explain(query, session)))
+    finally:
+        await database.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Создание секций таблицы ответов вперёд")
+    parser.add_argument("--months-ahead", type=int, default=settings.ANSWER_PARTITIONS_AHEAD)
+    parser.add_argument("--explain", type=int, metavar="QUESTION_ID", help="напечатать план запроса ответов вопроса")
+    args = parser.parse_args()
+    asyncio.run(main(args.months_ahead, args.explain))
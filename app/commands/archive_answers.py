@@ -0,0 +1,150 @@
+"""Архивация старых месячных секций таблицы ответов.
+
+Секции answer_pYYYYMM месяцев раньше границы (по умолчанию —
+ANSWER_ARCHIVE_MONTHS месяцев назад) переписываются в архивные
+answer_archive_pYYYYMM (AnswerPartitionRepository.archive_partition): без
+свободного места и мёртвых строк, в порядке (question_id, created_at, id),
+при необходимости — в другое табличное пространство и на другой метод
+доступа (`--access-method columnar`, если установлено расширение со
+сжатием). Архивная секция остаётся частью таблицы `answer`, поэтому
+GET /questions/{id} и AnswerRepository читают её как раньше, а запросы с
+границами по датам её не трогают.
+
+С `--export-dir` перед перезаписью каждая секция выгружается в
+<каталог>/<секция>.ndjson.gz (строка JSON на ответ, gzip) — копия для
+холодного хранения или загрузки в аналитику. Файл пишется во временный и
+переименовывается, поэтому недописанный файл не выдаёт себя за готовый.
+
+Каждая секция архивируется своей транзакцией и на время перезаписи
+блокируется целиком; запускайте в часы низкой нагрузки.
+
+Запуск:
+    python -m app.commands.archive_answers --before 2025-01 --export-dir /var/backups/answers
+"""
+
+import argparse
+import asyncio
+import gzip
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database.database import database
+from app.database.partitions import add_months, month_start, parse_partition, partition_name
+from app.logs.logger import logger, setup_logging
+from app.repositories.partitions import AnswerPartitionRepository
+from app.schemas.answers import answer_json
+
+
+async def export_partition(session_factory: async_sessionmaker, name: str, directory: Path, yield_per: int) -> int:
+    """
+    Выгружает секцию в <directory>/<name>.ndjson.gz.
+
+    return: Количество выгруженных ответов.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.ndjson.gz"
+    partial = path.with_name(path.name + ".partial")
+    count = 0
+    async with session_factory() as session:
+        rows = await AnswerPartitionRepository.stream_rows(name, session, yield_per)
+        with gzip.open(partial, "wb") as file:
+            async for row in rows:
+                file.write(answer_json.dump_json(row._asdict()) + b"\n")
+                count += 1
+    os.replace(partial, path)
+    return count
+
+
+async def archive(
+    session_factory: async_sessionmaker,
+    before: datetime,
+    export_dir: Optional[Path] = None,
+    tablespace: Optional[str] = None,
+    access_method: Optional[str] = None,
+    yield_per: int = 1000,
+    dry_run: bool = False
+) -> list[str]:
+    """
+    Архивирует секции месяцев раньше `before`.
+
+    session_factory: Фабрика сессий основной базы.
+    before: Начало первого месяца, который остаётся неархивированным.
+    export_dir: Каталог для выгрузки секций в NDJSON (gzip); None — без выгрузки.
+    tablespace: Табличное пространство для архивных секций.
+    access_method: Метод доступа архивных секций (PostgreSQL 15+).
+    yield_per: Сколько строк забирать из курсора за раз при выгрузке.
+    dry_run: Только показать, какие секции будут архивированы.
+    return: Имена архивных секций.
+    """
+    # Текущий месяц не архивируется: в его секцию продолжают писать.
+    before = min(before, month_start(datetime.now(timezone.utc)))
+    async with session_factory() as session:
+        if not await AnswerPartitionRepository.is_partitioned(session):
+            logger.warning("Таблица ответов не секционирована (нужны PostgreSQL и миграция 7d3e5b9c1f60)")
+            return []
+        partitions = [
+            partition
+            for partition in map(parse_partition, (row.name for row in await AnswerPartitionRepository.partitions(session)))
+            if partition is not None and not partition.archived and partition.month < before
+        ]
+    archived = []
+    for partition in sorted(partitions, key=lambda partition: partition.month):
+        archived_name = partition_name(partition.month, archived=True)
+        if dry_run:
+            logger.info(f"Будет архивирована секция {partition.name} -> {archived_name}")
+            continue
+        if export_dir is not None:
+            count = await export_partition(session_factory, partition.name, export_dir, yield_per)
+            logger.info(f"Секция {partition.name} выгружена в {export_dir}: ответов {count}")
+        async with session_factory() as session:
+            size_before = await AnswerPartitionRepository.relation_size(partition.name, session)
+            await AnswerPartitionRepository.lock(session)
+            await AnswerPartitionRepository.archive_partition(
+                partition.name, archived_name, session, tablespace, access_method
+            )
+        async with session_factory() as session:
+            await AnswerPartitionRepository.vacuum(archived_name, session)
+        async with session_factory() as session:
+            size_after = await AnswerPartitionRepository.relation_size(archived_name, session)
+        logger.info(f"Секция {partition.name} архивирована в {archived_name}: {size_before} -> {size_after} байт")
+        archived.append(archived_name)
+    return archived
+
+
+def parse_month(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m").replace(tzinfo=timezone.utc)
+
+
+async def main(args: argparse.Namespace) -> None:
+    setup_logging()
+    before = args.before or add_months(month_start(datetime.now(timezone.utc)), -settings.ANSWER_ARCHIVE_MONTHS)
+    try:
+        archived = await archive(
+            database.session_factory,
+            before,
+            export_dir=args.export_dir,
+            tablespace=args.tablespace,
+            access_method=args.access_method,
+            yield_per=args.yield_per,
+            dry_run=args.dry_run,
+        )
+        logger.info(f"Архивировано секций ответов: {len(archived)}")
+    finally:
+        await database.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Архивация старых секций таблицы ответов")
+    parser.add_argument("--before", type=parse_month, metavar="YYYY-MM",
+                        help=f"архивировать месяцы раньше этого (по умолчанию — {settings.ANSWER_ARCHIVE_MONTHS} мес. назад)")
+    parser.add_argument("--export-dir", type=Path, help="выгрузить секции в NDJSON (gzip) перед архивацией")
+    parser.add_argument("--tablespace", help="табличное пространство для архивных секций")
+    parser.add_argument("--access-method", help="метод доступа архивных секций, например columnar")
+    parser.add_argument("--yield-per", type=int, default=settings.EXPORT_YIELD_PER)
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""Пересчёт статистики вопросов (answer_count, last_answer_at) по таблице ответов.
+
+Нужен один раз после миграции, добавившей эти колонки, и на случай
+рассинхронизации. Вопросы обрабатываются пачками по диапазонам ID, каждая
+пачка — отдельная короткая транзакция, чтобы не держать блокировки на всей
+таблице.
+
+Запуск:
+    python -m app.commands.backfill_question_stats --batch-size 1000
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select, update, func
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.database import database
+from app.database.models import AnswerModels, QuestionModels
+from app.logs.logger import logger, setup_logging
+
+
+async def backfill(session_factory: async_sessionmaker, batch_size: int) -> int:
+    """
+    Пересчитывает статистику всех вопросов.
+
+    session_factory: Фабрика сессий основной базы.
+    batch_size: Ширина диапазона ID вопросов, обрабатываемого за одну транзакцию.
+    return: Количество обновлённых вопросов.
+    """
+    answer_count = (
+        select(func.count(AnswerModels.id))
+        .where(AnswerModels.question_id == QuestionModels.id)
+        .scalar_subquery()
+    )
+    last_answer_at = (
+        select(func.max(AnswerModels.created_at))
+        .where(AnswerModels.question_id == QuestionModels.id)
+        .scalar_subquery()
+    )
+    async with session_factory() as session:
+        max_id = await session.scalar(select(func.max(QuestionModels.id)))
+    if max_id is None:
+        return 0
+
+    updated = 0
+    for start in range(0, max_id + 1, batch_size):
+        async with session_factory() as session:
+            result = await session.execute(
+                update(QuestionModels)
+                .where(QuestionModels.id >= start, QuestionModels.id < start + batch_size)
+                .values(answer_count=answer_count, last_answer_at=last_answer_at)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        updated += result.rowcount
+        logger.info(f"Статистика пересчитана для вопросов с ID {start}..{start + batch_size - 1}")
+    return updated
+
+
+async def main(batch_size: int) -> None:
+    setup_logging()
+    try:
+        updated = await backfill(database.session_factory, batch_size)
+        logger.info(f"Пересчёт статистики завершён, обновлено вопросов: {updated}")
+    finally:
+        await database.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пересчёт answer_count и last_answer_at вопросов")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
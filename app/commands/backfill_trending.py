@@ -0,0 +1,63 @@
+"""Начальное заполнение свёртки рейтинга вопросов (таблица question_activity).
+
+Рейтинг /questions/trending ведут use case'ы записи ответов, поэтому ответы,
+созданные до появления таблицы, в него не попадают. Команда один раз
+читает ответы за последние 7 дней (потоково) и прибавляет их к свёртке по
+интервалам TRENDING_BUCKET_SECONDS. Запускается после миграции и до
+запуска новой версии: повторный запуск посчитает ответы дважды.
+
+Запуск:
+    python -m app.commands.backfill_trending
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database.database import database
+from app.logs.logger import logger, setup_logging
+from app.repositories.trending import TrendingRepository
+from app.trending.leaderboard import LONGEST, WINDOWS, timestamp
+
+
+async def backfill(session_factory: async_sessionmaker, bucket_seconds: int, yield_per: int) -> int:
+    """
+    Считает ответы за самое длинное окно рейтинга и записывает их в свёртку.
+
+    session_factory: Фабрика сессий основной базы.
+    bucket_seconds: Длина интервала свёртки, секунды.
+    yield_per: Сколько строк забирать из курсора за раз.
+    return: Количество учтённых ответов.
+    """
+    since = (int(time.time()) // bucket_seconds + 1) * bucket_seconds - WINDOWS[LONGEST]
+    counts: dict[tuple[int, int], int] = {}
+    answers = 0
+    async with session_factory() as session:
+        rows = await TrendingRepository.stream_answers(datetime.fromtimestamp(since, timezone.utc), session, yield_per)
+        async for row in rows:
+            key = (row.question_id, int(timestamp(row.created_at) // bucket_seconds) * bucket_seconds)
+            counts[key] = counts.get(key, 0) + 1
+            answers += 1
+    async with session_factory() as session:
+        await TrendingRepository.apply(counts, (), since, session)
+    return answers
+
+
+async def main(yield_per: int) -> None:
+    setup_logging()
+    try:
+        answers = await backfill(database.session_factory, settings.TRENDING_BUCKET_SECONDS, yield_per)
+        logger.info(f"Свёртка рейтинга вопросов заполнена, учтено ответов: {answers}")
+    finally:
+        await database.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Начальное заполнение свёртки рейтинга вопросов")
+    parser.add_argument("--yield-per", type=int, default=settings.EXPORT_YIELD_PER)
+    args = parser.parse_args()
+    asyncio.run(main(args.yield_per))
@@ -0,0 +1,54 @@
+"""Удаление истёкших ключей идемпотентности (таблица idempotency_keys).
+
+Истёкший ключ и так не мешает: при повторном использовании его строка
+удаляется (IdempotencyRepository.claim). Команда нужна, чтобы таблица не росла
+бесконечно; запускается по расписанию (cron). Удаление идёт пачками по
+индексу expires_at, каждая пачка — отдельная короткая транзакция.
+
+Запуск:
+    python -m app.commands.purge_idempotency_keys --batch-size 10000
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.database import database
+from app.logs.logger import logger, setup_logging
+from app.repositories.idempotency import IdempotencyRepository
+
+
+async def purge(session_factory: async_sessionmaker, batch_size: int) -> int:
+    """
+    Удаляет все ключи, истёкшие к моменту запуска.
+
+    session_factory: Фабрика сессий основной базы.
+    batch_size: Сколько ключей удалять за одну транзакцию.
+    return: Количество удалённых ключей.
+    """
+    now = datetime.now(timezone.utc)
+    deleted = 0
+    while True:
+        async with session_factory() as session:
+            count = await IdempotencyRepository.delete_expired(now, session, batch_size)
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+async def main(batch_size: int) -> None:
+    setup_logging()
+    try:
+        deleted = await purge(database.session_factory, batch_size)
+        logger.info(f"Удалено истёкших ключей идемпотентности: {deleted}")
+    finally:
+        await database.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Удаление истёкших ключей идемпотентности")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,332 @@
+"""Запуск API несколькими воркерами (prefork).
+
+Мастер-процесс один раз импортирует приложение (create_app), открывает
+слушающий сокет и порождает fork'ом воркеров — WEB_CONCURRENCY или, если он
+не задан, по числу доступных процессу ядер (но один воркер, если кэш, шина
+событий, идемпотентность, лимиты частоты или поиск работают в памяти процесса).
+Несколько воркеров с такими бэкендами мастер запускает, только если это явно
+разрешено (WEB_ALLOW_LOCAL_STATE=true или --allow-local-state): иначе воркеры
+отдают устаревший кэш, теряют события друг друга и повторно выполняют запросы
+с тем же Idempotency-Key. Импорт FastAPI, SQLAlchemy
+и маршрутов (основная часть холодного старта) выполняется один раз, а его
+память разделяется воркерами (copy-on-write). Пул соединений, вывод логов
+и фоновые задачи каждый воркер создаёт сам после fork (lifespan), поэтому
+соединения с базой между процессами не делятся.
+
+Сигналы мастеру:
+- SIGTERM, SIGINT — плавная остановка: воркеры дообслуживают начатые запросы
+  (не дольше WEB_GRACEFUL_TIMEOUT) и завершаются;
+- SIGHUP — плавный перезапуск: запускаются новые воркеры, старые получают
+  SIGTERM, как только новые готовы принимать запросы;
+- упавший воркер перезапускается; если воркеры MAX_BOOT_FAILURES раз подряд
+  падают, не успев стартовать, мастер останавливается с кодом 1.
+
+В лог пишется время импорта приложения и время старта каждого воркера
+(от fork до готовности принимать запросы).
+
+Запуск:
+    python -m app.commands.serve --host 0.0.0.0 --port 8000 --workers 4
+"""
+
+import argparse
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Optional
+
+import uvicorn
+from fastapi import FastAPI
+
+from app.config import settings
+
+MAX_BOOT_FAILURES = 5
+POLL_INTERVAL = 0.1
+# Запас сверх WEB_GRACEFUL_TIMEOUT на остановку lifespan, после которого воркер убивается.
+KILL_GRACE = 5.0
+
+launcher_logger = logging.getLogger("app_launcher")
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY; иначе число ядер, доступных процессу, или 1, если есть бэкенды в памяти."""
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    if shared_state_warnings():
+        return 1
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Открывает слушающий сокет, который наследуют воркеры."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def shared_state_warnings() -> list[str]:
+    """Бэкенды, которые при нескольких воркерах работают в каждом процессе отдельно."""
+    warnings = []
+    if settings.CACHE_BACKEND == "memory":
+        warnings.append("CACHE_BACKEND=memory: инвалидация кэша не видна другим воркерам (до CACHE_TTL)")
+    if settings.EVENTS_BACKEND == "memory":
+        warnings.append("EVENTS_BACKEND=memory: подписчики получают события только своего воркера")
+    if settings.IDEMPOTENCY_BACKEND == "memory":
+        warnings.append("IDEMPOTENCY_BACKEND=memory: повтор запроса на другой воркер выполнится заново")
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        warnings.append("RATE_LIMIT_BACKEND=memory: лимит частоты действует в каждом воркере отдельно")
+    from app.search.index import resolve_backend
+    if resolve_backend(settings.SEARCH_BACKEND, settings.url) == "memory":
+        warnings.append("поиск в памяти: изменения видны только в индексе воркера, который их сделал")
+    return warnings
+
+
+def _exit_gracefully(signum, frame) -> None:
+    raise SystemExit(0)
+
+
+class WorkerServer(uvicorn.Server):
+    """Сервер uvicorn в воркере: после старта сообщает мастеру о готовности."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int, forked_at: float):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+        self.forked_at = forked_at
+
+    async def startup(self, sockets: Optional[list[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit:
+            elapsed = time.perf_counter() - self.forked_at
+            os.write(self.ready_fd, f"{os.getpid()} {elapsed:.6f}\n".encode())
+
+
+class Launcher:
+    """
+    Мастер-процесс: порождает воркеров, следит за ними и передаёт им сигналы.
+
+    app: Готовое приложение (создаётся до fork).
+    sock: Слушающий сокет.
+    workers: Сколько воркеров держать запущенными.
+    graceful_timeout: Сколько воркер дообслуживает запросы при остановке, секунды.
+    access_log: Писать access-лог uvicorn.
+    """
+
+    def __init__(self, app: FastAPI, sock: socket.socket, workers: int, graceful_timeout: float, access_log: bool):
+        self.app = app
+        self.sock = sock
+        self.count = workers
+        self.graceful_timeout = graceful_timeout
+        self.access_log = access_log
+        self.workers: set[int] = set()
+        self.ready: set[int] = set()
+        # pid -> время отправки SIGTERM (None — ждёт готовности замены).
+        self.retiring: dict[int, Optional[float]] = {}
+        self.restart_deadline = 0.0
+        self.boot_failures = 0
+        self.started = time.perf_counter()
+        self.all_ready_reported = False
+        self._signals: list[int] = []
+        self._ready_r, self._ready_w = os.pipe()
+        os.set_blocking(self._ready_r, False)
+
+    def run(self) -> int:
+        """Запускает воркеров и обслуживает их до остановки; возвращает код выхода."""
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, self._on_signal)
+        launcher_logger.info(f"Мастер {os.getpid()}: запуск воркеров: {self.count}")
+        while True:
+            self._spawn_missing()
+            readable, _, _ = select.select([self._ready_r], [], [], POLL_INTERVAL)
+            if readable:
+                self._read_ready()
+            signals, self._signals = self._signals, []
+            if signal.SIGTERM in signals or signal.SIGINT in signals:
+                return self._stop(0)
+            if signal.SIGHUP in signals:
+                self._restart()
+            self._reap(stopping=False)
+            self._retire_replaced()
+            if self.boot_failures >= MAX_BOOT_FAILURES:
+                launcher_logger.error(f"Воркеры {self.boot_failures} раз подряд упали при старте, остановка")
+                return self._stop(1)
+
+    def _on_signal(self, signum, frame) -> None:
+        self._signals.append(signum)
+
+    def _active(self) -> set[int]:
+        return self.workers - self.retiring.keys()
+
+    def _spawn_missing(self) -> None:
+        while len(self._active()) < self.count:
+            self._spawn()
+
+    def _spawn(self) -> None:
+        forked_at = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(forked_at)
+        self.workers.add(pid)
+
+    def _run_worker(self, forked_at: float) -> None:
+        code = 0
+        try:
+            os.close(self._ready_r)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, _exit_gracefully)
+            signal.signal(signal.SIGINT, _exit_gracefully)
+            config = uvicorn.Config(
+                self.app,
+                lifespan="on",
+                access_log=self.access_log,
+                timeout_graceful_shutdown=self.graceful_timeout,
+            )
+            WorkerServer(config, self._ready_w, forked_at).run(sockets=[self.sock])
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else 0
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            # os._exit не вызывает atexit: дописываем очередь логов сами.
+            from app.logs import logger as app_logging
+            if app_logging.listener is not None:
+                app_logging.listener.stop()
+            os._exit(code)
+
+    def _read_ready(self) -> None:
+        try:
+            data = os.read(self._ready_r, 65536).decode()
+        except BlockingIOError:
+            return
+        for line in data.splitlines():
+            pid, elapsed = line.split()
+            self.ready.add(int(pid))
+            self.boot_failures = 0
+            launcher_logger.info(f"Воркер {pid} готов за {float(elapsed) * 1000:.0f} мс после fork")
+        if not self.all_ready_reported and len(self.ready & self._active()) >= self.count:
+            self.all_ready_reported = True
+            elapsed = time.perf_counter() - self.started
+            launcher_logger.info(f"Все воркеры готовы через {elapsed * 1000:.0f} мс после запуска")
+
+    def _reap(self, stopping: bool) -> None:
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            if pid not in self.workers:
+                continue
+            self.workers.discard(pid)
+            was_ready = pid in self.ready
+            self.ready.discard(pid)
+            code = os.waitstatus_to_exitcode(status)
+            if self.retiring.pop(pid, None) is not None or stopping:
+                launcher_logger.info(f"Воркер {pid} остановлен (код {code})")
+                continue
+            launcher_logger.warning(f"Воркер {pid} неожиданно завершился (код {code}), перезапуск")
+            if not was_ready:
+                self.boot_failures += 1
+
+    def _restart(self) -> None:
+        launcher_logger.info("Плавный перезапуск воркеров")
+        for pid in self._active():
+            self.retiring[pid] = None
+        self.restart_deadline = time.monotonic() + self.graceful_timeout
+        self.started = time.perf_counter()
+        self.all_ready_reported = False
+
+    def _retire_replaced(self) -> None:
+        now = time.monotonic()
+        waiting = [pid for pid, sent_at in self.retiring.items() if sent_at is None]
+        if waiting and (len(self.ready & self._active()) >= self.count or now >= self.restart_deadline):
+            for pid in waiting:
+                self._kill(pid, signal.SIGTERM)
+                self.retiring[pid] = now
+        for pid, sent_at in self.retiring.items():
+            if sent_at is not None and now - sent_at > self.graceful_timeout + KILL_GRACE:
+                self._kill(pid, signal.SIGKILL)
+
+    @staticmethod
+    def _kill(pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def _stop(self, code: int) -> int:
+        launcher_logger.info("Остановка воркеров")
+        for pid in self.workers:
+            self._kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout + KILL_GRACE
+        while self.workers and time.monotonic() < deadline:
+            self._reap(stopping=True)
+            time.sleep(POLL_INTERVAL)
+        for pid in self.workers:
+            launcher_logger.warning(f"Воркер {pid} не остановился за {self.graceful_timeout} с, SIGKILL")
+            self._kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.sock.close()
+        launcher_logger.info("Мастер остановлен")
+        return code
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Запуск API несколькими воркерами (prefork)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=default_workers(),
+        help="по умолчанию — по числу ядер (1, если есть бэкенды в памяти)"
+    )
+    parser.add_argument("--graceful-timeout", type=float, default=settings.WEB_GRACEFUL_TIMEOUT)
+    parser.add_argument("--access-log", action="store_true")
+    parser.add_argument(
+        "--allow-local-state", action="store_true", default=settings.WEB_ALLOW_LOCAL_STATE,
+        help="разрешить несколько воркеров с бэкендами в памяти процесса"
+    )
+    args = parser.parse_args()
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    launcher_logger.addHandler(handler)
+    launcher_logger.setLevel(logging.INFO)
+
+    started = time.perf_counter()
+    from app.main import create_app
+    imported = time.perf_counter()
+    app = create_app(settings)
+    created = time.perf_counter()
+    launcher_logger.info(
+        f"Приложение импортировано за {(imported - started) * 1000:.0f} мс, "
+        f"создано за {(created - imported) * 1000:.0f} мс"
+    )
+    warnings = shared_state_warnings() if args.workers > 1 else []
+    for warning in warnings:
+        launcher_logger.warning(warning)
+    if warnings and not args.allow_local_state:
+        launcher_logger.error(
+            f"Воркеров {args.workers}, но состояние хранится в памяти процесса: настройте общие бэкенды, "
+            "запустите один воркер или разрешите явно (WEB_ALLOW_LOCAL_STATE=true, --allow-local-state)"
+        )
+        return 1
+
+    sock = bind_socket(args.host, args.port)
+    launcher = Launcher(app, sock, args.workers, args.graceful_timeout, args.access_log)
+    return launcher.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
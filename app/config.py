@@ -1,24 +1,119 @@
 import os
 from pathlib import Path
-from typing import ClassVar
+from typing import ClassVar, Optional
 
-from dotenv import load_dotenv
+from dotenv import dotenv_values
 from pydantic import BaseModel
 
-load_dotenv()
+# Значения из .env (если файл есть) дополняют переменные окружения, которые
+# важнее; os.environ при этом не меняется.
+_env = {**{key: value for key, value in dotenv_values().items() if value is not None}, **os.environ}
 
 
 class Settings(BaseModel):
-    HOST: str = os.getenv("HOST")
-    USER: str = os.getenv("USER")
-    PASSWORD: str = os.getenv("PASSWORD")
-    DB_NAME: str = os.getenv("DB_NAME")
-    PORT: str = os.getenv("PORT")
-    PG_URL: str = os.getenv("PG_URL")
+    HOST: str = _env.get("HOST")
+    USER: str = _env.get("USER")
+    PASSWORD: str = _env.get("PASSWORD")
+    DB_NAME: str = _env.get("DB_NAME")
+    PORT: str = _env.get("PORT")
+    PG_URL: str = _env.get("PG_URL")
     BASE_DIR: ClassVar[Path] = Path(__file__).parent
 
     url: str = PG_URL
-    echo: bool = False
+    echo: bool = _env.get("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+    WEB_CONCURRENCY: int = int(_env.get("WEB_CONCURRENCY", 0))
+    WEB_GRACEFUL_TIMEOUT: float = float(_env.get("WEB_GRACEFUL_TIMEOUT", 30))
+    WEB_ALLOW_LOCAL_STATE: bool = _env.get("WEB_ALLOW_LOCAL_STATE", "false").lower() in ("1", "true", "yes")
+
+    DB_POOL_SIZE: int = int(_env.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(_env.get("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(_env.get("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(_env.get("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = _env.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_POOL_WARMUP: int = int(_env.get("DB_POOL_WARMUP", 0))
+    DB_QUERY_CACHE_SIZE: int = int(_env.get("DB_QUERY_CACHE_SIZE", 500))
+    DB_STATEMENT_CACHE_SIZE: int = int(_env.get("DB_STATEMENT_CACHE_SIZE", 100))
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = int(_env.get("DB_PREPARED_STATEMENT_CACHE_SIZE", 100))
+
+    PG_REPLICA_URLS: list[str] = [url for url in _env.get("PG_REPLICA_URLS", "").split(",") if url]
+    DB_REPLICA_STRATEGY: str = _env.get("DB_REPLICA_STRATEGY", "round_robin")
+    DB_READ_YOUR_WRITES_MS: int = int(_env.get("DB_READ_YOUR_WRITES_MS", 0))
+
+    EXPORT_CHUNK_SIZE: int = int(_env.get("EXPORT_CHUNK_SIZE", 64 * 1024))
+    EXPORT_YIELD_PER: int = int(_env.get("EXPORT_YIELD_PER", 1000))
+
+    ANSWER_PARTITIONS_AHEAD: int = int(_env.get("ANSWER_PARTITIONS_AHEAD", 3))
+    ANSWER_ARCHIVE_MONTHS: int = int(_env.get("ANSWER_ARCHIVE_MONTHS", 12))
+
+    BULK_CHUNK_SIZE: int = int(_env.get("BULK_CHUNK_SIZE", 1000))
+    BULK_MAX_ITEMS: int = int(_env.get("BULK_MAX_ITEMS", 10000))
+    MULTI_GET_MAX_IDS: int = int(_env.get("MULTI_GET_MAX_IDS", 100))
+
+    USER_DELETE_CHUNK_SIZE: int = int(_env.get("USER_DELETE_CHUNK_SIZE", 1000))
+
+    ANSWER_BATCH_ENABLED: bool = _env.get("ANSWER_BATCH_ENABLED", "false").lower() in ("1", "true", "yes")
+    ANSWER_BATCH_MAX_ITEMS: int = int(_env.get("ANSWER_BATCH_MAX_ITEMS", 200))
+    ANSWER_BATCH_MAX_DELAY_MS: float = float(_env.get("ANSWER_BATCH_MAX_DELAY_MS", 5))
+
+    RATE_LIMIT_BACKEND: str = _env.get("RATE_LIMIT_BACKEND", "none")
+    RATE_LIMIT_KEY: str = _env.get("RATE_LIMIT_KEY", "ip")
+    RATE_LIMIT_RATE: float = float(_env.get("RATE_LIMIT_RATE", 20))
+    RATE_LIMIT_BURST: int = int(_env.get("RATE_LIMIT_BURST", 40))
+    RATE_LIMIT_MAX_KEYS: int = int(_env.get("RATE_LIMIT_MAX_KEYS", 100_000))
+    SHED_MAX_INFLIGHT: int = int(_env.get("SHED_MAX_INFLIGHT", 200))
+    SHED_POOL_WAIT_MS: float = float(_env.get("SHED_POOL_WAIT_MS", 500))
+
+    IDEMPOTENCY_BACKEND: str = _env.get("IDEMPOTENCY_BACKEND", "database")
+    IDEMPOTENCY_TTL: int = int(_env.get("IDEMPOTENCY_TTL", 24 * 60 * 60))
+    IDEMPOTENCY_LRU_SIZE: int = int(_env.get("IDEMPOTENCY_LRU_SIZE", 10000))
+    IDEMPOTENCY_WAIT_TIMEOUT: float = float(_env.get("IDEMPOTENCY_WAIT_TIMEOUT", 10))
+    IDEMPOTENCY_LEASE: float = float(_env.get("IDEMPOTENCY_LEASE", 30))
+    IDEMPOTENCY_SCOPE: str = _env.get("IDEMPOTENCY_SCOPE", "ip")
+
+    CACHE_BACKEND: str = _env.get("CACHE_BACKEND", "memory")
+    CACHE_TTL: int = int(_env.get("CACHE_TTL", 60))
+    CACHE_MAX_SIZE: int = int(_env.get("CACHE_MAX_SIZE", 10000))
+    REDIS_URL: Optional[str] = _env.get("REDIS_URL")
+
+    EVENTS_BACKEND: str = _env.get("EVENTS_BACKEND", "memory")
+    EVENTS_QUEUE_SIZE: int = int(_env.get("EVENTS_QUEUE_SIZE", 100))
+    EVENTS_MAX_SUBSCRIBERS: int = int(_env.get("EVENTS_MAX_SUBSCRIBERS", 1000))
+    EVENTS_HEARTBEAT: float = float(_env.get("EVENTS_HEARTBEAT", 15))
+
+    SEARCH_BACKEND: str = _env.get("SEARCH_BACKEND", "auto")
+    SEARCH_MAX_OFFSET: int = int(_env.get("SEARCH_MAX_OFFSET", 1000))
+
+    TRENDING_BUCKET_SECONDS: int = int(_env.get("TRENDING_BUCKET_SECONDS", 300))
+    TRENDING_TOP_K: int = int(_env.get("TRENDING_TOP_K", 100))
+    TRENDING_REFRESH_SECONDS: float = float(_env.get("TRENDING_REFRESH_SECONDS", 1))
+    TRENDING_SYNC_SECONDS: float = float(_env.get("TRENDING_SYNC_SECONDS", 10))
+
+    HTTP_QUESTIONS_MAX_AGE: int = int(_env.get("HTTP_QUESTIONS_MAX_AGE", 5))
+    HTTP_ANSWER_MAX_AGE: int = int(_env.get("HTTP_ANSWER_MAX_AGE", 60))
+
+    LOG_FILE_ENABLED: bool = _env.get("LOG_FILE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LOG_JSON: bool = _env.get("LOG_JSON", "false").lower() in ("1", "true", "yes")
+    LOG_QUEUE_SIZE: int = int(_env.get("LOG_QUEUE_SIZE", 10000))
+    LOG_ROTATION: str = _env.get("LOG_ROTATION", "size")
+    LOG_MAX_BYTES: int = int(_env.get("LOG_MAX_BYTES", 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT: int = int(_env.get("LOG_BACKUP_COUNT", 5))
+    LOG_ROTATE_WHEN: str = _env.get("LOG_ROTATE_WHEN", "midnight")
 
 
 settings = Settings()
+
+
+def use_settings(new: Settings) -> None:
+    """
+    Делает `new` действующими настройками процесса.
+
+    Поля копируются в общий объект settings: use case'ы, маршруты и
+    middleware читают его при каждом запросе, поэтому все модули, импортировавшие
+    его по имени, видят новые значения. Компоненты, созданные из настроек
+    (кэш, шина событий...), пересоздаёт create_app.
+    """
+    if new is settings:
+        return
+    for name in Settings.model_fields:
+        setattr(settings, name, getattr(new, name))
@@ -1,28 +1,193 @@
+import asyncio
+import itertools
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Sequence
+
+from fastapi import Request
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     create_async_engine,
     async_sessionmaker,
 )
-from app.config import settings
-from app.main import logger
+from app.config import Settings, settings
+from app.database.pool import InstrumentedAsyncQueuePool, PoolMetrics
+from app.logs.logger import logger
+from app.monitoring.sql import instrument_engine
+from app.utils.client import get_client_id
+
+REPLICA_STRATEGIES = ("round_robin", "least_connections")
 
 
 class Database:
-    """Класс для управления подключением и сессиями базы данных."""
-    def __init__(self, url: str, echo: bool = False):
-        self.engine = create_async_engine(
+    """
+    Класс для управления подключением и сессиями базы данных.
+
+    Владеет основным движком (primary) и, при необходимости, движками реплик.
+    Запись всегда идёт в primary (get_session), чтение — в реплики
+    (get_read_session). Если задан read_your_writes_ms, клиент, недавно
+    выполнивший запись, читает из primary, чтобы увидеть свои изменения
+    несмотря на отставание реплик.
+    """
+    def __init__(self, url: str, **options):
+        self._options: Optional[dict] = None
+        self._engine: Optional[AsyncEngine] = None
+        self._pid: Optional[int] = None
+        self._last_write: OrderedDict[str, float] = OrderedDict()
+        self.configure(url, **options)
+
+    def configure(
+        self,
+        url: str,
+        echo: bool = False,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        query_cache_size: int = 500,
+        statement_cache_size: int = 100,
+        prepared_statement_cache_size: int = 100,
+        replica_urls: Sequence[str] = (),
+        replica_strategy: str = "round_robin",
+        read_your_writes_ms: int = 0,
+        max_tracked_clients: int = 100_000,
+    ) -> None:
+        """
+        Задаёт параметры подключения.
+
+        Движки создаются лениво — при первом обращении к engine или
+        session_factory, — поэтому импорт модуля и create_app() не открывают
+        пул, а воркеры, порождённые fork, создают свои движки сами. После
+        создания движков параметры менять нельзя (кроме повторной передачи тех же).
+        """
+        options = dict(locals())
+        del options["self"]
+        if options == self._options:
+            return
+        if self._engine is not None:
+            raise RuntimeError("Движки базы данных уже созданы, параметры подключения менять нельзя")
+        if replica_strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия выбора реплики: {replica_strategy}")
+        self._options = options
+        self.url = url
+        self.replica_urls = list(replica_urls)
+        self._engine_options = dict(
+            echo=echo,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            query_cache_size=query_cache_size,
+        )
+        self._statement_cache_size = statement_cache_size
+        self._prepared_statement_cache_size = prepared_statement_cache_size
+
+        self.pool_metrics = PoolMetrics()
+        self.replica_metrics = [PoolMetrics() for _ in self.replica_urls]
+        self.replica_strategy = replica_strategy
+        self._round_robin = itertools.cycle(range(len(self.replica_urls)))
+
+        self.read_your_writes_ms = read_your_writes_ms
+        self.max_tracked_clients = max_tracked_clients
+
+    def _ensure_engines(self) -> None:
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        if self._engine is not None:
+            # Движки унаследованы через fork: соединения родителя не закрываем
+            # (они ему и принадлежат), а только забываем и открываем свои.
+            for engine in (self._engine, *self._replica_engines):
+                engine.sync_engine.dispose(close=False)
+        else:
+            self._engine = self._create_engine(self.url, self.pool_metrics)
+            self._session_factory = self._create_session_factory(self._engine)
+            self._replica_engines = [
+                self._create_engine(replica_url, metrics)
+                for replica_url, metrics in zip(self.replica_urls, self.replica_metrics)
+            ]
+            self._replica_session_factories = [
+                self._create_session_factory(engine) for engine in self._replica_engines
+            ]
+        self._pid = pid
+
+    @property
+    def engine(self) -> AsyncEngine:
+        """Движок основной базы (создаётся при первом обращении)."""
+        self._ensure_engines()
+        return self._engine
+
+    @property
+    def session_factory(self) -> async_sessionmaker:
+        self._ensure_engines()
+        return self._session_factory
+
+    @session_factory.setter
+    def session_factory(self, session_factory: async_sessionmaker) -> None:
+        self._ensure_engines()
+        self._session_factory = session_factory
+
+    @property
+    def replica_engines(self) -> list[AsyncEngine]:
+        self._ensure_engines()
+        return self._replica_engines
+
+    @property
+    def replica_session_factories(self) -> list[async_sessionmaker]:
+        self._ensure_engines()
+        return self._replica_session_factories
+
+    @replica_session_factories.setter
+    def replica_session_factories(self, session_factories: list[async_sessionmaker]) -> None:
+        self._ensure_engines()
+        self._replica_session_factories = session_factories
+
+    def _create_engine(self, url: str, metrics: PoolMetrics) -> AsyncEngine:
+        connect_args = {}
+        if make_url(url).get_driver_name() == "asyncpg":
+            connect_args = {
+                "statement_cache_size": self._statement_cache_size,
+                "prepared_statement_cache_size": self._prepared_statement_cache_size,
+            }
+        engine = create_async_engine(
             url=url,
-            echo=echo
+            poolclass=InstrumentedAsyncQueuePool,
+            metrics=metrics,
+            connect_args=connect_args,
+            **self._engine_options,
         )
-        self.session_factory = async_sessionmaker(
-            bind=self.engine,
+        instrument_engine(engine.sync_engine)
+        return engine
+
+    @staticmethod
+    def _create_session_factory(engine: AsyncEngine) -> async_sessionmaker:
+        return async_sessionmaker(
+            bind=engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
 
-    async def get_session(self) -> AsyncSession:
-        """Возвращает асинхронную сессию базы данных."""
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        """Основной движок и движки реплик."""
+        return [self.engine, *self.replica_engines]
+
+    async def get_session(self, request: Request) -> AsyncSession:
+        """
+        Возвращает асинхронную сессию основной базы (для записи).
+
+        Клиент запоминается как недавно писавший (для read-your-writes) до выдачи
+        сессии — код после yield выполняется уже после отправки ответа, — и ещё
+        раз после успешного завершения запроса.
+        """
+        client_id = get_client_id(request)
+        self._remember_write(client_id)
         try:
             async with self.session_factory() as session:
                 logger.debug("Создана новая асинхронная сессия базы данных.")
@@ -30,9 +195,134 @@ class Database:
         except Exception as e:
             logger.exception(f"Ошибка при создании сессии: {e}")
             raise
+        self._remember_write(client_id)
 
+    async def get_read_session(self, request: Request) -> AsyncSession:
+        """Возвращает асинхронную сессию для чтения (реплика или primary)."""
+        session_factory = self.read_session_factory(get_client_id(request))
+        try:
+            async with session_factory() as session:
+                logger.debug("Создана новая асинхронная сессия базы данных для чтения.")
+                yield session
+        except Exception as e:
+            logger.exception(f"Ошибка при создании сессии: {e}")
+            raise
 
-database = Database(
-    url=settings.PG_URL,
-    echo=settings.echo,
-)
+    def read_session_factory(self, client_id: Optional[str] = None) -> async_sessionmaker:
+        """
+        Выбирает фабрику сессий для чтения.
+
+        client_id: Идентификатор клиента для правила read-your-writes.
+        return: Фабрика сессий реплики или primary.
+        """
+        if not self.replica_session_factories or self._wrote_recently(client_id):
+            return self.session_factory
+        if self.replica_strategy == "least_connections":
+            index = min(
+                range(len(self.replica_engines)),
+                key=lambda i: self.replica_engines[i].pool.checkedout(),
+            )
+        else:
+            index = next(self._round_robin)
+        return self.replica_session_factories[index]
+
+    def _remember_write(self, client_id: str) -> None:
+        if not self.read_your_writes_ms or not self.replica_engines:
+            return
+        self._last_write[client_id] = time.monotonic()
+        self._last_write.move_to_end(client_id)
+        horizon = time.monotonic() - self.read_your_writes_ms / 1000
+        while self._last_write:
+            oldest_client, written_at = next(iter(self._last_write.items()))
+            if written_at >= horizon and len(self._last_write) <= self.max_tracked_clients:
+                break
+            del self._last_write[oldest_client]
+
+    def _wrote_recently(self, client_id: Optional[str]) -> bool:
+        if not self.read_your_writes_ms or client_id is None:
+            return False
+        written_at = self._last_write.get(client_id)
+        return written_at is not None and time.monotonic() - written_at < self.read_your_writes_ms / 1000
+
+    async def warmup(self, connections: int) -> None:
+        """
+        Заранее открывает соединения, чтобы первые запросы не ждали их создания.
+
+        connections: Сколько соединений открыть в каждом движке
+                     (не больше pool_size останется в пуле).
+        """
+        if connections <= 0:
+            return
+        for engine in self.engines:
+            opened = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+            for connection in opened:
+                await connection.close()
+        logger.info(f"Пул соединений прогрет: {connections} на движок, движков: {len(self.engines)}")
+
+    async def dispose(self) -> None:
+        """Закрывает все соединения всех движков (если они были созданы)."""
+        if self._engine is None:
+            return
+        for engine in self.engines:
+            await engine.dispose()
+        logger.info("Соединения с базой данных закрыты")
+
+    def pools(self) -> list[tuple[str, AsyncEngine, PoolMetrics]]:
+        """
+        Пулы движков, уже созданных в этом процессе: (имя, движок, метрики).
+
+        Движки не создаются (метрики не должны открывать пул или падать без
+        PG_URL); унаследованные через fork движки не считаются — у воркера они
+        будут пересозданы при первом обращении.
+        """
+        if self._engine is None or self._pid != os.getpid():
+            return []
+        return [
+            ("primary", self._engine, self.pool_metrics),
+            *((f"replica{index}", engine, metrics)
+              for index, (engine, metrics) in enumerate(zip(self._replica_engines, self.replica_metrics))),
+        ]
+
+    def pool_stats(self) -> dict:
+        """Текущее состояние пулов и метрики ожидания соединения (пусто, пока движки не созданы)."""
+        pools = self.pools()
+        if not pools:
+            return {}
+        (_, engine, metrics), replicas = pools[0], pools[1:]
+        stats = self._engine_pool_stats(engine, metrics)
+        if replicas:
+            stats["replicas"] = [self._engine_pool_stats(engine, metrics) for _, engine, metrics in replicas]
+        return stats
+
+    @staticmethod
+    def _engine_pool_stats(engine: AsyncEngine, metrics: PoolMetrics) -> dict:
+        pool = engine.pool
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            **metrics.stats(),
+        }
+
+
+def database_options(settings: Settings) -> dict:
+    """Параметры Database из настроек приложения."""
+    return dict(
+        url=settings.PG_URL,
+        echo=settings.echo,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        prepared_statement_cache_size=settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        replica_urls=settings.PG_REPLICA_URLS,
+        replica_strategy=settings.DB_REPLICA_STRATEGY,
+        read_your_writes_ms=settings.DB_READ_YOUR_WRITES_MS,
+    )
+
+
+database = Database(**database_options(settings))
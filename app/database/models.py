@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Optional
 
-from sqlalchemy import String, DateTime, func, ForeignKey
+from sqlalchemy import BigInteger, String, DateTime, func, ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -18,13 +19,26 @@ class QuestionModels(Base):
         id: Уникальный ID вопроса.
         text: Текст вопроса.
         created_at: Дата создания.
+        answer_count: Количество ответов (поддерживается AnswerRepository).
+        last_answer_at: Дата последнего ответа (поддерживается AnswerRepository).
+        version: Версия вопроса, растёт при каждом добавлении и удалении ответов
+            (поддерживается AnswerRepository, из неё строится ETag).
+        updated_at: Дата последнего изменения вопроса или его ответов (Last-Modified).
         answers: Связанные ответы.
     """
     __tablename__ = 'questions'
+    __table_args__ = (
+        Index('ix_questions_created_at_id', 'created_at', 'id'),
+        Index('ix_questions_answer_count_id', 'answer_count', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     text: Mapped[str] = mapped_column(String(255))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    answer_count: Mapped[int] = mapped_column(server_default="0", default=0)
+    last_answer_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    version: Mapped[int] = mapped_column(server_default="0", default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     answers: Mapped[list["AnswerModels"]] = relationship("AnswerModels",
                                                          back_populates='question',
@@ -43,8 +57,16 @@ class AnswerModels(Base):
         text: Текст ответа.
         created_at: Дата создания.
         question: Связанные ответы.
+
+    В PostgreSQL таблица секционирована по месяцам created_at (миграция
+    7d3e5b9c1f60, app.database.partitions) и её первичный ключ — (id, created_at);
+    ID по-прежнему уникален (последовательность), поэтому в модели ключ — id.
         """
     __tablename__ = "answer"
+    __table_args__ = (
+        Index('ix_answer_question_id_created_at_id', 'question_id', 'created_at', 'id'),
+        Index('ix_answer_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     question_id: Mapped[int] = mapped_column(ForeignKey('questions.id', ondelete="CASCADE"), nullable=False)
@@ -57,3 +79,67 @@ class AnswerModels(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     question: Mapped["QuestionModels"] = relationship("QuestionModels", back_populates="answers")
+
+
+class IdempotencyKeyModels(Base):
+    """
+    Сохранённый результат POST-запроса с заголовком Idempotency-Key.
+
+    Attributes:
+        client: Клиент запроса (app.utils.client.get_client_id): ключи разных
+            клиентов не пересекаются.
+        key: Значение Idempotency-Key.
+        fingerprint: SHA-256 метода, пути и тела запроса (тот же ключ с другим запросом — ошибка).
+        status_code: Код ответа; NULL, пока первый запрос ещё выполняется.
+        body: Тело ответа.
+        created_at: Дата первого запроса.
+        locked_until: Конец аренды ключа выполняющимся запросом; после неё
+            незавершённую запись (процесс упал) может захватить повтор.
+        expires_at: После этой даты ключ можно использовать заново (до
+            сохранения ответа — конец аренды).
+    """
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
+
+    client: Mapped[str] = mapped_column(String(255), primary_key=True)
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64))
+    status_code: Mapped[Optional[int]]
+    body: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class QuestionActivityModels(Base):
+    """
+    Свёртка активности вопросов для рейтинга /questions/trending.
+
+    Одна строка — число ответов вопроса, созданных в одном интервале времени
+    (TRENDING_BUCKET_SECONDS). Воркеры периодически прибавляют сюда свои
+    изменения и перечитывают таблицу, поэтому рейтинг у всех воркеров общий,
+    а таблица `answer` для него не сканируется. Строки старше самого длинного
+    окна (7 дней) удаляются.
+
+    Attributes:
+        question_id: ID вопроса (без внешнего ключа: строки удалённого вопроса удаляет рейтинг).
+        bucket_start: Начало интервала, секунды Unix time.
+        answers: Ответов, созданных в интервале (с учётом удалённых).
+    """
+    __tablename__ = "question_activity"
+    __table_args__ = (
+        Index('ix_question_activity_bucket_start', 'bucket_start'),
+    )
+
+    question_id: Mapped[int] = mapped_column(primary_key=True)
+    bucket_start: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    answers: Mapped[int] = mapped_column(default=0)
+
+
+Index(
+    'ix_questions_last_activity_id',
+    func.coalesce(QuestionModels.last_answer_at, QuestionModels.created_at),
+    QuestionModels.id,
+)
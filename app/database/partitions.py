@@ -0,0 +1,85 @@
+import re
+from datetime import datetime, timezone
+from typing import NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.logs.logger import logger
+from app.repositories.partitions import AnswerPartitionRepository
+
+# answer_p202501 — текущие данные, answer_archive_p202501 — архивная секция того же месяца.
+_PARTITION_NAME = re.compile(r"^answer_(archive_)?p(\d{4})(\d{2})$")
+
+
+class Partition(NamedTuple):
+    """Месячная секция таблицы ответов."""
+    name: str
+    month: datetime
+    archived: bool
+
+
+def month_start(at: datetime) -> datetime:
+    """Начало месяца (UTC), в который попадает дата."""
+    return at.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime, archived: bool = False) -> str:
+    return f"answer_{'archive_' if archived else ''}p{month:%Y%m}"
+
+
+def parse_partition(name: str) -> Optional[Partition]:
+    """Секция по имени; None для секции по умолчанию и посторонних таблиц."""
+    match = _PARTITION_NAME.match(name)
+    if match is None:
+        return None
+    month = datetime(int(match[2]), int(match[3]), 1, tzinfo=timezone.utc)
+    return Partition(name, month, match[1] is not None)
+
+
+async def ensure_answer_partitions(
+    session_factory: async_sessionmaker,
+    months_ahead: int,
+    now: Optional[datetime] = None
+) -> list[str]:
+    """
+    Создаёт недостающие месячные секции ответов с текущего месяца на `months_ahead` вперёд.
+
+    Ничего не делает, если таблица ответов не секционирована (SQLite, миграция
+    не применена). Вызывается при старте приложения и командой
+    app.commands.answer_partitions (по cron), чтобы новые ответы не попадали
+    в секцию по умолчанию.
+
+    session_factory: Фабрика сессий основной базы.
+    months_ahead: На сколько месяцев вперёд создавать секции.
+    now: Текущее время (для тестов и пересоздания прошедших месяцев).
+    return: Имена созданных секций.
+    """
+    created = []
+    async with session_factory() as session:
+        if not await AnswerPartitionRepository.is_partitioned(session):
+            return created
+        await AnswerPartitionRepository.lock(session)
+        existing = {
+            partition.month
+            for partition in map(parse_partition, (row.name for row in await AnswerPartitionRepository.partitions(session)))
+            if partition is not None
+        }
+        current = month_start(now or datetime.now(timezone.utc))
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month in existing:
+                continue
+            name = partition_name(month)
+            moved = await AnswerPartitionRepository.create_partition(name, month, add_months(month, 1), session)
+            if moved:
+                logger.warning(f"В секцию {name} перенесено ответов из секции по умолчанию: {moved}")
+            created.append(name)
+        await session.commit()
+    if created:
+        logger.info(f"Созданы секции ответов: {', '.join(created)}")
+    return created
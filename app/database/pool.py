@@ -0,0 +1,99 @@
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.monitoring.metrics import current_request_stats
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class PoolMetrics:
+    """
+    Метрики ожидания соединения из пула.
+
+    Время ожидания — это время от запроса соединения до его выдачи
+    (включая создание нового соединения, если пул ещё не заполнен).
+    Распределение хранится в виде гистограммы с границами WAIT_BUCKETS.
+
+    recent_wait() — скользящее среднее ожидания, затухающее со временем
+    (период полураспада RECENT_HALF_LIFE секунд): по нему admission-контроль
+    понимает, что пул перегружен, а когда выдачи прекращаются — что нагрузка спала.
+    """
+
+    RECENT_HALF_LIFE = 1.0
+    RECENT_WEIGHT = 0.2
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.buckets = [0] * len(WAIT_BUCKETS)
+        self.waiting = 0
+        self._recent_wait = 0.0
+        self._recent_at = time.monotonic()
+
+    def recent_wait(self) -> float:
+        """Недавнее типичное ожидание соединения, секунды."""
+        elapsed = time.monotonic() - self._recent_at
+        return self._recent_wait * 0.5 ** (elapsed / self.RECENT_HALF_LIFE)
+
+    def observe(self, seconds: float) -> None:
+        self._recent_wait = self.recent_wait() * (1 - self.RECENT_WEIGHT) + seconds * self.RECENT_WEIGHT
+        self._recent_at = time.monotonic()
+        self.checkouts += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+        for index, bound in enumerate(WAIT_BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+
+    def stats(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_total_seconds": round(self.wait_total, 6),
+            "wait_max_seconds": round(self.wait_max, 6),
+            "wait_avg_seconds": round(self.wait_total / self.checkouts, 6) if self.checkouts else 0.0,
+            "wait_recent_seconds": round(self.recent_wait(), 6),
+            "waiting": self.waiting,
+            "wait_histogram": {str(bound): count for bound, count in zip(WAIT_BUCKETS, self.buckets)},
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Асинхронный QueuePool, который замеряет ожидание выдачи соединения.
+
+    Объект метрик передаётся через create_async_engine(..., metrics=PoolMetrics())
+    и сохраняется при пересоздании пула (engine.dispose()). Ожидание также
+    добавляется к статистике текущего HTTP-запроса (Server-Timing).
+    """
+
+    def __init__(self, creator, metrics: Optional[PoolMetrics] = None, **kw):
+        super().__init__(creator, **kw)
+        self.metrics = metrics or PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        self.metrics.waiting += 1
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.waiting -= 1
+            wait = time.perf_counter() - start
+            self.metrics.observe(wait)
+            request_stats = current_request_stats()
+            if request_stats is not None:
+                request_stats.pool_wait += wait
+
+    def recreate(self) -> "InstrumentedAsyncQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
@@ -0,0 +1,307 @@
+import asyncio
+import contextlib
+import json
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Optional
+
+from app.logs.logger import logger
+
+
+class TooManySubscribers(Exception):
+    """Достигнут лимит одновременных подписок шины."""
+
+
+class BusUnavailable(Exception):
+    """Шина не связана с транспортом: подписка не получила бы событий."""
+
+
+class Subscription:
+    """
+    Подписка одного клиента на канал шины событий.
+
+    События складываются в ограниченную очередь. Если клиент читает медленнее,
+    чем публикуются события, и очередь переполнилась, подписка закрывается с
+    признаком overflowed: пропускать события молча нельзя, поэтому клиент должен
+    перечитать состояние (GET) и подписаться заново. Так медленный потребитель
+    не копит память и не тормозит публикацию для остальных. Так же (resync)
+    закрываются подписки, когда шина теряет связь с транспортом.
+    """
+
+    def __init__(self, channel: str, queue_size: int):
+        self.channel = channel
+        self.overflowed = False
+        self.resync = False
+        self.closed = False
+        self._queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=queue_size + 1)
+        self._queue_size = queue_size
+
+    def put(self, message: bytes) -> bool:
+        """
+        Кладёт событие в очередь без ожидания.
+
+        return: False, если очередь переполнена и подписка закрыта.
+        """
+        if self.closed:
+            return False
+        if self._queue.qsize() >= self._queue_size:
+            self.overflowed = True
+            self.close(resync=True)
+            return False
+        self._queue.put_nowait(message)
+        return True
+
+    def close(self, resync: bool = False) -> None:
+        """
+        Закрывает подписку: get() вернёт None после уже полученных событий.
+
+        resync: События могли быть потеряны — клиент должен перечитать состояние.
+        """
+        if not self.closed:
+            self.closed = True
+            self.resync = resync
+            # В очереди всегда оставлено место под маркер закрытия.
+            self._queue.put_nowait(None)
+
+    async def get(self) -> Optional[bytes]:
+        """Ждёт следующее событие; None — подписка закрыта."""
+        return await self._queue.get()
+
+
+class EventBus(ABC):
+    """
+    Интерфейс шины событий (pub/sub) внутри процесса.
+
+    Подписчики получают события через Subscription. Доставка подписчикам
+    процесса общая для всех бэкендов (_deliver), бэкенды отличаются тем, как
+    событие попадает во все процессы: сразу (MemoryBus) или через базу
+    (PostgresBus). Количество одновременных подписок ограничено max_subscribers.
+    """
+
+    def __init__(self, queue_size: int, max_subscribers: int):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscriptions: defaultdict[str, set[Subscription]] = defaultdict(set)
+        self.subscribers = 0
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    def subscribe(self, channel: str) -> Subscription:
+        """
+        Создаёт подписку на канал.
+
+        raises TooManySubscribers: Если достигнут лимит подписок.
+        """
+        if self.subscribers >= self.max_subscribers:
+            raise TooManySubscribers(f"Достигнут лимит подписок: {self.max_subscribers}")
+        subscription = Subscription(channel, self.queue_size)
+        self._subscriptions[channel].add(subscription)
+        self.subscribers += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription, resync: bool = False) -> None:
+        """Удаляет подписку (повторный вызов ничего не делает); resync — см. Subscription.close."""
+        subscriptions = self._subscriptions.get(subscription.channel)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.channel]
+        self.subscribers -= 1
+        subscription.close(resync)
+
+    def _deliver(self, channel: str, message: bytes) -> None:
+        """Раздаёт событие подписчикам канала в этом процессе."""
+        for subscription in list(self._subscriptions.get(channel, ())):
+            if subscription.put(message):
+                self.delivered += 1
+            else:
+                self.overflows += 1
+                logger.warning(f"Подписчик канала {channel} не успевает читать события, подписка закрыта")
+                self.unsubscribe(subscription, resync=True)
+
+    def _close_all(self, resync: bool = False) -> None:
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in list(subscriptions):
+                self.unsubscribe(subscription, resync)
+
+    @abstractmethod
+    async def publish(self, channel: str, message: bytes) -> None:
+        """Публикует событие в канал."""
+
+    async def start(self) -> None:
+        """Подключается к внешнему транспорту (если он есть)."""
+
+    async def stop(self) -> None:
+        """Закрывает все подписки и отключается от транспорта."""
+        self._close_all()
+
+    def stats(self) -> dict:
+        """Счётчики работы шины."""
+        return {
+            "backend": type(self).__name__,
+            "subscribers": self.subscribers,
+            "max_subscribers": self.max_subscribers,
+            "channels": len(self._subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+class MemoryBus(EventBus):
+    """
+    Шина в памяти процесса.
+
+    Подходит для одного воркера и для тестов; при нескольких воркерах каждый
+    видит только свои события — для этого есть PostgresBus.
+    """
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        self.published += 1
+        self._deliver(channel, message)
+
+
+class PostgresBus(EventBus):
+    """
+    Шина поверх LISTEN/NOTIFY PostgreSQL для нескольких воркеров и хостов.
+
+    Все события идут через один канал Postgres (pg_channel), имя канала шины
+    передаётся внутри полезной нагрузки: так каждому процессу достаточно одного
+    LISTEN, сколько бы вопросов ни отслеживалось. Событие доставляется своим
+    подписчикам только из уведомления, поэтому порядок одинаков во всех процессах.
+
+    Используются два соединения asyncpg: одно слушает, второе публикует
+    (соединение asyncpg не допускает параллельных запросов). Размер полезной
+    нагрузки NOTIFY ограничен 8000 байт.
+
+    Если соединение обрывается (или не открылось при старте), шина
+    переподключается в фоне с экспоненциальной задержкой (от RECONNECT_DELAY
+    до RECONNECT_MAX_DELAY) и заново выполняет LISTEN. Уведомления, пришедшие
+    без соединения, потеряны, поэтому при обрыве все подписки закрываются с
+    resync, а новые до восстановления связи отклоняются (BusUnavailable).
+    """
+
+    RECONNECT_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 30.0
+
+    def __init__(
+        self,
+        dsn: str,
+        queue_size: int,
+        max_subscribers: int,
+        pg_channel: str = "qa_events",
+        connect: Optional[Callable[[str], Awaitable[Any]]] = None,
+    ):
+        super().__init__(queue_size, max_subscribers)
+        self.dsn = dsn
+        self.pg_channel = pg_channel
+        self._connect = connect
+        self._listen_connection: Any = None
+        self._publish_connection: Any = None
+        self._publish_lock = asyncio.Lock()
+        self._running = False
+        self._reconnecting: Optional[asyncio.Task] = None
+        self.reconnects = 0
+
+    async def start(self) -> None:
+        self._running = True
+        try:
+            await self._open()
+        except Exception:
+            self._schedule_reconnect()
+            raise
+        logger.info(f"Шина событий слушает канал Postgres {self.pg_channel}")
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._reconnecting is not None:
+            self._reconnecting.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reconnecting
+        await super().stop()
+        for connection in (self._listen_connection, self._publish_connection):
+            if connection is not None:
+                connection.remove_termination_listener(self._on_terminated)
+                await connection.close()
+        self._listen_connection = self._publish_connection = None
+
+    def subscribe(self, channel: str) -> Subscription:
+        """
+        Создаёт подписку на канал.
+
+        raises BusUnavailable: Если нет соединения с Postgres.
+        raises TooManySubscribers: Если достигнут лимит подписок.
+        """
+        if self._listen_connection is None:
+            raise BusUnavailable("Нет соединения шины событий с Postgres")
+        return super().subscribe(channel)
+
+    async def _open(self) -> None:
+        connect = self._connect
+        if connect is None:
+            import asyncpg
+            connect = asyncpg.connect
+        listen_connection = await connect(self.dsn)
+        try:
+            publish_connection = await connect(self.dsn)
+            await listen_connection.add_listener(self.pg_channel, self._on_notify)
+        except BaseException:
+            listen_connection.terminate()
+            raise
+        for connection in (listen_connection, publish_connection):
+            connection.add_termination_listener(self._on_terminated)
+        self._listen_connection, self._publish_connection = listen_connection, publish_connection
+
+    def _on_terminated(self, connection: Any) -> None:
+        if connection not in (self._listen_connection, self._publish_connection):
+            return
+        logger.warning("Соединение шины событий с Postgres потеряно, переподключение")
+        for other in (self._listen_connection, self._publish_connection):
+            other.remove_termination_listener(self._on_terminated)
+            if other is not connection:
+                other.terminate()
+        self._listen_connection = self._publish_connection = None
+        # Уведомления до переподключения будут потеряны: подписчики перечитают состояние.
+        self._close_all(resync=True)
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        if self._running and self._reconnecting is None:
+            self._reconnecting = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self.RECONNECT_DELAY
+        try:
+            while self._running:
+                await asyncio.sleep(delay)
+                try:
+                    await self._open()
+                except Exception as e:
+                    delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+                    logger.warning(f"Не удалось переподключить шину событий ({e}), следующая попытка через {delay} с")
+                    continue
+                self.reconnects += 1
+                logger.info(f"Шина событий переподключена, слушает канал Postgres {self.pg_channel}")
+                return
+        finally:
+            self._reconnecting = None
+
+    def stats(self) -> dict:
+        return {**super().stats(), "connected": self._listen_connection is not None, "reconnects": self.reconnects}
+
+    def _on_notify(self, connection: Any, pid: int, pg_channel: str, payload: str) -> None:
+        try:
+            envelope = json.loads(payload)
+            self._deliver(envelope["channel"], envelope["message"].encode())
+        except (ValueError, KeyError, AttributeError) as e:
+            logger.warning(f"Некорректное уведомление в канале {pg_channel}: {e}")
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        if self._publish_connection is None:
+            raise BusUnavailable("Нет соединения шины событий с Postgres")
+        payload = json.dumps({"channel": channel, "message": message.decode()}, ensure_ascii=False)
+        async with self._publish_lock:
+            await self._publish_connection.execute("SELECT pg_notify($1, $2)", self.pg_channel, payload)
+        self.published += 1
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+
+from app.config import Settings
+from app.events.backends import EventBus, MemoryBus, PostgresBus
+from app.logs.logger import logger
+from app.utils.component import Component
+
+
+def question_channel(question_id: int) -> str:
+    """Канал событий об ответах вопроса (новые и удалённые ответы, удаление вопроса)."""
+    return f"question:{question_id}"
+
+
+def create_bus(backend: str, queue_size: int, max_subscribers: int, url: Optional[str] = None) -> EventBus:
+    """
+    Создаёт шину событий по имени из настроек.
+
+    backend: "memory" или "postgres".
+    queue_size: Сколько событий может ждать чтения одним подписчиком.
+    max_subscribers: Лимит одновременных подписок в процессе.
+    url: URL базы SQLAlchemy (для "postgres", драйвер asyncpg).
+    """
+    if backend == "memory":
+        return MemoryBus(queue_size=queue_size, max_subscribers=max_subscribers)
+    if backend == "postgres":
+        dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresBus(dsn, queue_size=queue_size, max_subscribers=max_subscribers)
+    raise ValueError(f"Неизвестный бэкенд шины событий: {backend}")
+
+
+async def publish(channel: str, message: bytes) -> None:
+    """
+    Публикует событие после успешной записи.
+
+    Ошибка доставки не должна превращать уже сохранённую запись в ошибку
+    запроса: она логируется, а подписчики догонят состояние обычным GET.
+    """
+    try:
+        await bus.publish(channel, message)
+    except Exception as e:
+        logger.warning(f"Не удалось опубликовать событие в канал {channel}: {e}")
+
+
+def bus_from_settings(settings: Settings) -> EventBus:
+    return create_bus(
+        backend=settings.EVENTS_BACKEND,
+        queue_size=settings.EVENTS_QUEUE_SIZE,
+        max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+        url=settings.url,
+    )
+
+
+bus: Component[EventBus] = Component(bus_from_settings)
@@ -0,0 +1,171 @@
+import hashlib
+import re
+from typing import Optional
+
+from starlette.requests import HTTPConnection
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.idempotency.store import (
+    IdempotencyConflict,
+    IdempotencyMismatch,
+    IdempotencyStore,
+    StoredResponse,
+    idempotency_store,
+)
+from app.utils.client import get_client_id
+
+IDEMPOTENT_PATHS = (
+    re.compile(r"^/questions/(bulk)?$"),
+    re.compile(r"^/questions/\d+/answers/(bulk)?$"),
+)
+MAX_KEY_LENGTH = 255
+IDEMPOTENCY_SCOPES = ("ip", "client")
+
+
+def fingerprint(scope: Scope, body: bytes) -> str:
+    """SHA-256 метода, пути, строки запроса и тела."""
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def idempotency_scope(scope: Scope, scope_by: str) -> str:
+    """
+    Владелец ключей Idempotency-Key: сохранённый ответ повторяется только ему.
+
+    scope_by: "ip" — IP-адрес клиента, "client" — X-Client-Id (или IP без него).
+
+    X-Client-Id задаёт сам вызывающий: зная чужой идентификатор и ключ, он
+    получил бы чужой сохранённый ответ. Поэтому "client" годится только за
+    прокси (BFF, шлюзом), который аутентифицирует клиента и сам проставляет
+    заголовок; иначе используйте "ip".
+    """
+    connection = HTTPConnection(scope)
+    if scope_by == "client":
+        owner = f"client:{get_client_id(connection)}"
+    else:
+        owner = f"ip:{connection.client.host if connection.client else 'anonymous'}"
+    return owner[:MAX_KEY_LENGTH]
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware, делающее POST-запросы создания с заголовком Idempotency-Key
+    безопасными для повтора.
+
+    Первый запрос с ключом выполняется как обычно, его ответ (код и тело)
+    сохраняется в IdempotencyStore. Повтор с тем же ключом, методом, путём
+    и телом получает сохранённый ответ с заголовком Idempotent-Replayed: true,
+    не доходя до маршрута (и до базы, если ответ есть в LRU). Одновременный
+    дубликат ждёт завершения первого запроса. Тот же ключ с другим запросом —
+    422, первый запрос выполняется дольше таймаута ожидания — 409. Ключи
+    действуют в пределах владельца (idempotency_scope, по умолчанию IP-адрес):
+    одинаковый ключ другого владельца — это другой запрос.
+
+    Запросы без заголовка и другие маршруты проходят без изменений.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore = idempotency_store, scope_by: Optional[str] = None):
+        scope_by = scope_by or settings.IDEMPOTENCY_SCOPE
+        if scope_by not in IDEMPOTENCY_SCOPES:
+            raise ValueError(f"Неизвестная область ключей идемпотентности: {scope_by}")
+        self.app = app
+        self.store = store
+        self.scope_by = scope_by
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not any(pattern.match(scope["path"]) for pattern in IDEMPOTENT_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+        key = next((value.decode("latin-1") for name, value in scope["headers"] if name == b"idempotency-key"), None)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key должен быть от 1 до {MAX_KEY_LENGTH} символов"}, status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        request_fingerprint = fingerprint(scope, body)
+        client = idempotency_scope(scope, self.scope_by)
+
+        try:
+            stored = await self.store.begin(client, key, request_fingerprint)
+        except IdempotencyMismatch:
+            response = JSONResponse(
+                {"detail": "Idempotency-Key уже использован с другим запросом"}, status_code=422
+            )
+            await response(scope, receive, send)
+            return
+        except IdempotencyConflict:
+            response = JSONResponse(
+                {"detail": "Запрос с этим Idempotency-Key ещё выполняется"},
+                status_code=409,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        if stored is not None:
+            await self._replay(stored, send)
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        response_chunks = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            await self.store.abort(client, key)
+            raise
+        await self.store.finish(
+            client, key, request_fingerprint, StoredResponse(status_code, b"".join(response_chunks))
+        )
+
+    @staticmethod
+    async def _replay(stored: StoredResponse, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": stored.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(stored.body)).encode()),
+                (b"idempotent-replayed", b"true"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": stored.body})
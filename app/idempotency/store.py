@@ -0,0 +1,224 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache.backends import MemoryCache
+from app.config import Settings
+from app.database.database import database
+from app.logs.logger import logger
+from app.repositories.idempotency import IdempotencyRepository
+from app.utils.component import Component
+
+POLL_INTERVAL = 0.05
+
+
+class StoredResponse(NamedTuple):
+    """Сохранённый ответ на запрос с Idempotency-Key."""
+    status_code: int
+    body: bytes
+
+
+class IdempotencyConflict(Exception):
+    """Запрос с тем же ключом всё ещё выполняется (дольше wait_timeout)."""
+
+
+class IdempotencyMismatch(Exception):
+    """Ключ уже использован запросом с другим методом, путём или телом."""
+
+
+class IdempotencyStore:
+    """
+    Хранилище ответов на POST-запросы с заголовком Idempotency-Key.
+
+    Перед таблицей idempotency_keys стоит LRU в памяти процесса (MemoryCache
+    с тем же TTL): повтор недавнего запроса отвечает без обращения к базе.
+    Одновременные дубликаты в одном процессе ждут future первого запроса,
+    а дубликат из другого процесса видит в таблице строку без status_code
+    и опрашивает её, пока первый запрос не сохранит ответ. Ждать дольше
+    wait_timeout секунд нельзя — тогда IdempotencyConflict (409).
+
+    Ключ захватывается в таблице на `lease` секунд. Если процесс, захвативший
+    ключ, упал или перезапустился, не сохранив ответ, строка так и остаётся
+    без status_code; по истечении аренды её захватывает следующий повтор
+    (или ждущий дубликат) и выполняет запрос сам.
+
+    Сохраняются только ответы с кодом меньше 500: после ошибки сервера
+    ключ освобождается, и повтор выполнит запрос заново.
+
+    backend: "database" (таблица + LRU) или "memory" (только LRU, для
+    одного процесса и тестов).
+    """
+
+    def __init__(self, backend: str, ttl: int, lru_size: int, wait_timeout: float, lease: float):
+        if backend not in ("database", "memory"):
+            raise ValueError(f"Неизвестный бэкенд идемпотентности: {backend}")
+        self.backend = backend
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.lease = lease
+        self.session_factory: Optional[async_sessionmaker] = None
+        self._lru = MemoryCache(ttl=ttl, max_size=lru_size)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.replays = 0
+        self.conflicts = 0
+        self.mismatches = 0
+
+    @staticmethod
+    def _pack(fingerprint: str, response: StoredResponse) -> bytes:
+        return f"{fingerprint}\n{response.status_code}\n".encode() + response.body
+
+    @staticmethod
+    def _unpack(value: bytes) -> tuple[str, StoredResponse]:
+        fingerprint, status_code, body = value.split(b"\n", 2)
+        return fingerprint.decode(), StoredResponse(int(status_code), body)
+
+    def _sessions(self) -> async_sessionmaker:
+        return self.session_factory or database.session_factory
+
+    async def begin(self, client: str, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Начинает обработку запроса с ключом.
+
+        client: Идентификатор клиента: ключи разных клиентов не пересекаются.
+        key: Значение Idempotency-Key.
+        fingerprint: Отпечаток запроса (метод, путь, тело).
+        return: Сохранённый ответ для повтора или None — ключ захвачен,
+            запрос нужно выполнить и вызвать finish() или abort().
+        raises: IdempotencyMismatch, IdempotencyConflict.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        local = self._local_key(client, key)
+        while True:
+            cached = await self._lru.get(local)
+            if cached is not None:
+                return self._replay(key, fingerprint, *self._unpack(cached))
+            inflight = self._inflight.get(local)
+            if inflight is None:
+                break
+            try:
+                await asyncio.wait_for(asyncio.shield(inflight), deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                self.conflicts += 1
+                raise IdempotencyConflict(key)
+
+        self._inflight[local] = asyncio.get_running_loop().create_future()
+        if self.backend == "memory":
+            return None
+        try:
+            async with self._sessions()() as session:
+                row = await self._claim(client, key, fingerprint, session)
+                while row is not None and row.status_code is None:
+                    if time.monotonic() >= deadline:
+                        self.conflicts += 1
+                        raise IdempotencyConflict(key)
+                    await asyncio.sleep(POLL_INTERVAL)
+                    row = await IdempotencyRepository.get(client, key, session)
+                    await session.commit()
+                    if row is None or (row.status_code is None and self._lease_expired(row.locked_until)):
+                        # Первый запрос упал: освободил ключ или бросил его, не сохранив
+                        # ответ (процесс завершился), — пробуем захватить ключ сами.
+                        row = await self._claim(client, key, fingerprint, session)
+        except BaseException:
+            self._done(local)
+            raise
+        if row is None:
+            return None
+        self._done(local)
+        response = StoredResponse(row.status_code, row.body or b"")
+        await self._lru.set(local, self._pack(row.fingerprint, response))
+        return self._replay(key, fingerprint, row.fingerprint, response)
+
+    @staticmethod
+    def _local_key(client: str, key: str) -> str:
+        # Перевод строки не может встретиться в заголовках, поэтому пары не склеиваются.
+        return f"{client}\n{key}"
+
+    async def _claim(self, client: str, key: str, fingerprint: str, session: AsyncSession) -> Optional[Row]:
+        now = datetime.now(timezone.utc)
+        return await IdempotencyRepository.claim(
+            client, key, fingerprint, now + timedelta(seconds=self.lease), now, session
+        )
+
+    @staticmethod
+    def _lease_expired(locked_until: Optional[datetime]) -> bool:
+        if locked_until is None:
+            return True
+        if locked_until.tzinfo is None:
+            # SQLite возвращает даты без часового пояса; в таблицу пишется UTC.
+            locked_until = locked_until.replace(tzinfo=timezone.utc)
+        return locked_until <= datetime.now(timezone.utc)
+
+    def _replay(self, key: str, fingerprint: str, stored_fingerprint: str, response: StoredResponse) -> StoredResponse:
+        if stored_fingerprint != fingerprint:
+            self.mismatches += 1
+            raise IdempotencyMismatch(key)
+        self.replays += 1
+        return response
+
+    async def finish(self, client: str, key: str, fingerprint: str, response: StoredResponse) -> None:
+        """
+        Сохраняет ответ захватившего ключ запроса и будит ждущие дубликаты.
+
+        Ответ с кодом 5xx не сохраняется: ключ освобождается (abort).
+        """
+        if response.status_code >= 500:
+            await self.abort(client, key)
+            return
+        try:
+            await self._lru.set(self._local_key(client, key), self._pack(fingerprint, response))
+            if self.backend == "database":
+                async with self._sessions()() as session:
+                    expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+                    await IdempotencyRepository.complete(
+                        client, key, response.status_code, response.body, expires_at, session
+                    )
+        finally:
+            self._done(self._local_key(client, key))
+
+    async def abort(self, client: str, key: str) -> None:
+        """Освобождает ключ после ошибки: повтор выполнит запрос заново."""
+        try:
+            if self.backend == "database":
+                async with self._sessions()() as session:
+                    await IdempotencyRepository.release(client, key, session)
+        except Exception as e:
+            logger.warning(f"Не удалось освободить ключ идемпотентности {key}: {e}")
+        finally:
+            self._done(self._local_key(client, key))
+
+    def _done(self, local: str) -> None:
+        future = self._inflight.pop(local, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    async def clear(self) -> None:
+        """Очищает LRU в памяти (таблица не трогается)."""
+        await self._lru.clear()
+
+    def stats(self) -> dict:
+        """Счётчики повторов и конфликтов."""
+        return {
+            "backend": self.backend,
+            "replays": self.replays,
+            "conflicts": self.conflicts,
+            "mismatches": self.mismatches,
+            "inflight": len(self._inflight),
+            "lru": self._lru.stats(),
+        }
+
+
+def idempotency_store_from_settings(settings: Settings) -> IdempotencyStore:
+    return IdempotencyStore(
+        backend=settings.IDEMPOTENCY_BACKEND,
+        ttl=settings.IDEMPOTENCY_TTL,
+        lru_size=settings.IDEMPOTENCY_LRU_SIZE,
+        wait_timeout=settings.IDEMPOTENCY_WAIT_TIMEOUT,
+        lease=settings.IDEMPOTENCY_LEASE,
+    )
+
+
+idempotency_store: Component[IdempotencyStore] = Component(idempotency_store_from_settings)
@@ -1,35 +1,173 @@
+import atexit
+import json
 import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
+from typing import Optional
+
+from app.config import Settings, settings
 
 """Модуль логгирования приложения.
 
 Создает логгер `app_logger`, который:
 - выводит сообщения уровня INFO и выше в консоль,
-- записывает сообщения уровня DEBUG и выше в файл logs/app.log."""
+- записывает сообщения уровня DEBUG и выше в файл logs/app.log (с ротацией).
+
+Сам логгер ничего не пишет: записи кладутся в ограниченную очередь
+(DroppingQueueHandler), а в консоль и файл их выводит отдельный поток
+QueueListener. Поэтому вызов логгера не блокирует цикл событий на диске;
+если поток вывода не успевает и очередь заполнена, запись отбрасывается
+и учитывается в счётчике dropped.
+
+Импорт модуля ничего не создаёт на диске и не запускает потоков: вывод
+включает setup_logging() (при старте приложения, в каждом воркере после
+fork). До этого записи копятся в очереди."""
 
 LOG_DIR = Path(__file__).parent.parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
 
 LOG_FILE = LOG_DIR / "app.log"
 
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler, который не ждёт места в очереди.
+
+    Если очередь заполнена, запись отбрасывается, а счётчик dropped растёт.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        self.enqueued += 1
+
+    def stats(self) -> dict:
+        """Счётчики очереди логов."""
+        return {
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "queued": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+        }
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует запись одной JSON-строкой (для сборщиков логов)."""
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }, ensure_ascii=False)
+
+
+def create_formatter(settings: Settings = settings) -> logging.Formatter:
+    """Создаёт форматтер записей: JSON при LOG_JSON, иначе текстовый."""
+    if settings.LOG_JSON:
+        return JsonFormatter()
+    return logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+
+def create_file_handler(
+    path: Path,
+    rotation: str = "size",
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    when: str = "midnight",
+) -> logging.FileHandler:
+    """
+    Создаёт файловый обработчик с ротацией.
+
+    path: Путь к файлу лога.
+    rotation: "size" — по размеру, "time" — по времени, "none" — без ротации.
+    max_bytes: Размер файла, после которого он ротируется (для "size").
+    backup_count: Сколько старых файлов хранить.
+    when: Интервал ротации TimedRotatingFileHandler (для "time").
+    """
+    if rotation == "size":
+        return RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    if rotation == "time":
+        return TimedRotatingFileHandler(path, when=when, backupCount=backup_count, encoding="utf-8")
+    if rotation == "none":
+        return logging.FileHandler(path, encoding="utf-8")
+    raise ValueError(f"Неизвестный режим ротации логов: {rotation}")
+
+
+def create_queue_pipeline(
+    handlers: list[logging.Handler],
+    queue_size: int,
+) -> tuple[DroppingQueueHandler, QueueListener]:
+    """
+    Создаёт обработчик-очередь и поток, передающий записи в `handlers`.
+
+    handlers: Обработчики, выполняющие вывод (консоль, файл).
+    queue_size: Вместимость очереди.
+    return: (обработчик для логгера, незапущенный QueueListener).
+    """
+    handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    handler.setLevel(min((h.level for h in handlers), default=logging.NOTSET))
+    listener = QueueListener(handler.queue, *handlers, respect_handler_level=True)
+    return handler, listener
+
+
 logger = logging.getLogger("app_logger")
 logger.setLevel(logging.DEBUG)
 
-formatter = logging.Formatter(
-    "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-)
+queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+if not logger.hasHandlers():
+    logger.addHandler(queue_handler)
 
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-console_handler.setFormatter(formatter)
+listener: Optional[QueueListener] = None
+_queue_pid = os.getpid()
 
-file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
-file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(formatter)
 
-if not logger.hasHandlers():
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+def setup_logging(settings: Settings = settings) -> None:
+    """
+    Запускает вывод логов в консоль и файл в текущем процессе.
+
+    Повторный вызов в том же процессе ничего не делает. В процессе,
+    порождённом fork, очередь заменяется новой: записи родителя не
+    выводятся повторно, а блокировки очереди не наследуются от его потоков.
+
+    settings: Настройки приложения (LOG_*).
+    """
+    global listener, _queue_pid
+    if listener is not None and _queue_pid == os.getpid():
+        return
+    if _queue_pid != os.getpid():
+        queue_handler.queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        _queue_pid = os.getpid()
+
+    formatter = create_formatter(settings)
 
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
 
+    output_handlers: list[logging.Handler] = [console_handler]
+    if settings.LOG_FILE_ENABLED:
+        LOG_DIR.mkdir(exist_ok=True)
+        file_handler = create_file_handler(
+            LOG_FILE,
+            rotation=settings.LOG_ROTATION,
+            max_bytes=settings.LOG_MAX_BYTES,
+            backup_count=settings.LOG_BACKUP_COUNT,
+            when=settings.LOG_ROTATE_WHEN,
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+        output_handlers.append(file_handler)
 
+    queue_handler.setLevel(min(handler.level for handler in output_handlers))
+    listener = QueueListener(queue_handler.queue, *output_handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
@@ -1,19 +1,109 @@
 from contextlib import asynccontextmanager
-from app.logs.logger import logger
+from app.admission.limits import load_shedder, rate_limiter
+from app.admission.middleware import AdmissionMiddleware
+from app.batching.answers import answer_batcher
+from app.cache.cache import cache
+from app.config import Settings, settings as default_settings, use_settings
+from app.logs.logger import logger, setup_logging
 from fastapi import FastAPI
+from app.database.database import database, database_options
+from app.database.partitions import ensure_answer_partitions
+from app.events.bus import bus
+from app.idempotency.middleware import IdempotencyMiddleware
+from app.idempotency.store import idempotency_store
+from app.monitoring.middleware import MetricsMiddleware
 from app.routers.questions import router as router_questions
 from app.routers.answers import router as router_answer
+from app.routers.export import router as router_export
+from app.routers.metrics import router as router_metrics
+from app.routers.search import router as router_search
+from app.routers.users import router as router_users
+from app.search.index import resolve_backend, search_index
+from app.trending.leaderboard import trending
+
+# Компоненты, которые create_app создаёт из переданных настроек.
+COMPONENTS = (cache, bus, rate_limiter, load_shedder, idempotency_store, answer_batcher, trending)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    settings: Settings = app.state.settings
+    # Логи и пул соединений создаются здесь, а не при импорте: при запуске
+    # несколькими воркерами (app.commands.serve) — уже в каждом воркере после fork.
+    setup_logging(settings)
+    logger.info("Запуск сервера")
+    try:
+        await database.warmup(settings.DB_POOL_WARMUP)
+    except OSError as e:
+        logger.warning(f"Не удалось подключиться к БД: {e}")
+    try:
+        await ensure_answer_partitions(database.session_factory, settings.ANSWER_PARTITIONS_AHEAD)
+    except OSError as e:
+        logger.warning(f"Не удалось проверить секции таблицы ответов: {e}")
+    if resolve_backend(settings.SEARCH_BACKEND, settings.url) == "memory":
+        try:
+            await search_index.rebuild(database.session_factory, settings.EXPORT_YIELD_PER)
+        except OSError as e:
+            logger.warning(f"Не удалось построить поисковый индекс: {e}")
+    try:
+        await bus.start()
+    except OSError as e:
+        logger.warning(f"Не удалось запустить шину событий: {e}")
+    try:
+        await trending.start(database.session_factory)
+    except OSError as e:
+        logger.warning(f"Не удалось загрузить рейтинг вопросов: {e}")
     try:
-        logger.info("Запуск сервера")
         yield
+    finally:
         logger.info("Выключение")
-    except ConnectionRefusedError as e:
-        logger.warning(f"Не удалось подключиться к БД: {e}")
+        await bus.stop()
+        await trending.stop(database.session_factory)
+        await database.dispose()
+
+
+def create_app(settings: Settings = default_settings) -> FastAPI:
+    """
+    Создаёт ASGI-приложение.
+
+    Ничего не открывает и не запускает: движки базы создаются при первом
+    обращении, вывод логов — при старте (lifespan).
+
+    Все компоненты приложения настраиваются из `settings`: они становятся
+    действующими настройками процесса (use_settings — их читают use case'ы
+    и маршруты), из них задаются подключение к базе и пул, создаются кэш,
+    шина событий, ограничитель частоты, сброс нагрузки, хранилище ключей
+    идемпотентности, групповая запись ответов и рейтинг; поиск и логи
+    выбираются по ним при старте. Компоненты — модульные объекты, поэтому
+    в процессе действует одна конфигурация: вызывайте create_app до старта
+    приложения.
+
+    settings: Настройки приложения.
+    raises RuntimeError: Если движки базы уже созданы с другими параметрами.
+    """
+    database.configure(**database_options(settings))
+    use_settings(settings)
+    for component in COMPONENTS:
+        component.configure(settings)
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+    # Порядок: последний добавленный — внешний. Метрики учитывают и отказы
+    # admission-контроля, и повторы по Idempotency-Key; отказ не доходит до хранилища ключей.
+    app.add_middleware(IdempotencyMiddleware, scope_by=settings.IDEMPOTENCY_SCOPE)
+    app.add_middleware(AdmissionMiddleware, key_by=settings.RATE_LIMIT_KEY)
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router_questions)
+    app.include_router(router_answer)
+    app.include_router(router_export)
+    app.include_router(router_metrics)
+    app.include_router(router_search)
+    app.include_router(router_users)
+    return app
+
 
-app = FastAPI(lifespan=lifespan)
-app.include_router(router_questions)
-app.include_router(router_answer)
+def __getattr__(name: str):
+    # `app.main:app` (uvicorn, тесты) создаёт приложение при первом обращении.
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
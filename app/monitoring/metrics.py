@@ -0,0 +1,203 @@
+"""Метрики приложения в формате Prometheus.
+
+Реестр хранит счётчики и гистограммы в памяти процесса и отдаёт их
+текстом (text exposition format 0.0.4). Статистика текущего запроса
+(число SQL-выражений, время в базе, ожидание пула) лежит в contextvar:
+её заполняют хуки SQLAlchemy и пул, а читает middleware."""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Iterable, Optional
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Монотонно растущий счётчик с метками."""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in self._values.items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин и метками."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        labelnames: tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labelnames = labelnames
+        # метки -> [счётчики корзин..., сумма, количество]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            le = 'le="+Inf"'
+            yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {series[-1]}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}"
+
+
+class Collected:
+    """
+    Метрика, значения которой вычисляются функцией при каждом чтении.
+
+    Используется для счётчиков, которые уже ведут другие части приложения
+    (пул, кэш, очередь логов): metric_type — "gauge" или "counter".
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[tuple[tuple, float]]],
+        labelnames: tuple[str, ...] = (),
+        metric_type: str = "gauge",
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.collect = collect
+        self.labelnames = labelnames
+        self.metric_type = metric_type
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.metric_type}"
+        for labels, value in self.collect():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Registry:
+    """Набор метрик, отдаваемых на /metrics."""
+
+    def __init__(self):
+        self.metrics: list = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = [line for metric in self.metrics for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    """Статистика одного HTTP-запроса, накапливаемая по ходу его обработки."""
+
+    __slots__ = ("started", "sql_count", "sql_time", "pool_wait")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.pool_wait = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Статистика текущего запроса или None вне HTTP-запроса."""
+    return _request_stats.get()
+
+
+def start_request() -> tuple[RequestStats, object]:
+    """Начинает сбор статистики запроса; возвращает её и токен для finish_request."""
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def finish_request(token) -> None:
+    _request_stats.reset(token)
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP-запроса до начала ответа.",
+    LATENCY_BUCKETS,
+    ("method", "route", "status"),
+))
+http_response_size = registry.register(Histogram(
+    "http_response_size_bytes",
+    "Размер тела HTTP-ответа.",
+    SIZE_BUCKETS,
+    ("method", "route"),
+))
+db_statements_per_request = registry.register(Histogram(
+    "db_statements_per_request",
+    "Количество SQL-выражений за HTTP-запрос.",
+    COUNT_BUCKETS,
+    ("method", "route"),
+))
+db_time_per_request = registry.register(Histogram(
+    "db_time_per_request_seconds",
+    "Суммарное время выполнения SQL за HTTP-запрос.",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+))
+db_pool_wait_per_request = registry.register(Histogram(
+    "db_pool_wait_per_request_seconds",
+    "Суммарное ожидание соединения из пула за HTTP-запрос.",
+    LATENCY_BUCKETS,
+    ("method", "route"),
+))
+db_statements = registry.register(Counter(
+    "db_statements_total",
+    "Всего выполнено SQL-выражений.",
+))
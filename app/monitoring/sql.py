@@ -0,0 +1,32 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.monitoring.metrics import current_request_stats, db_statements
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    db_statements.inc()
+    stats = current_request_stats()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_time += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Подключает к движку хуки, считающие SQL-выражения и время их выполнения.
+
+    Хуки выполняются в greenlet'е SQLAlchemy, который наследует контекст
+    вызывающей корутины, поэтому статистика попадает в текущий HTTP-запрос.
+
+    engine: Синхронный движок (AsyncEngine.sync_engine).
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
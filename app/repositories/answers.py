@@ -1,11 +1,13 @@
 import uuid
+from typing import Optional
 
 from fastapi import HTTPException
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert, update, bindparam, case, func, tuple_, Row, Select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.models import AnswerModels, QuestionModels
 from app.logs.logger import logger
+from app.repositories.filters import id_in
 from app.repositories.questions import QuestionRepository
 from app.schemas.answers import AnswerSchemas
 
@@ -15,15 +17,108 @@ class AnswerRepository:
     Репозиторий для работы с сущностью Answer в базе данных.
 
     Предоставляет методы для добавления, получения и удаления ответов к вопросам.
+    Вместе с ответами в той же транзакции поддерживает счётчик ответов
+    (answer_count), дату последнего ответа (last_answer_at), а также версию
+    (version) и дату изменения (updated_at) вопроса для ETag/Last-Modified.
 
     Методы:
-        - create_answer(question_id: int, text: str, user_id: uuid.UUID, session: AsyncSession) -> AnswerModels
-        - get_answer_by_id(answer_id, session) -> AnswerModels
-        - delete_answer_by_id(answer_id, session) -> dict
+        - create_answer(question_id: int, text: str, user_id: uuid.UUID, session: AsyncSession) -> AnswerModels | None
+        - create_answers_bulk(question_id: int, items: list[dict], session: AsyncSession, chunk_size: int) -> list[int] | None
+        - create_answers_batch(items: list[dict], session: AsyncSession) -> list[Row | None]
+        - get_answer_by_id(answer_id, session) -> Row | None
+        - answers_by_ids(ids: list[int], session: AsyncSession) -> dict[int, Row]
+        - answers_page_query(question_id: int, limit: int, after: tuple | None, created_between: tuple | None) -> Select
+        - answers_page(question_id: int, session: AsyncSession, limit: int, after: tuple | None,
+            created_between: tuple | None) -> list[Row]
+        - answers_by_user(user_id: uuid.UUID, session: AsyncSession, limit: int, after: tuple | None) -> list[Row]
+        - delete_answers_by_user(user_id: uuid.UUID, session: AsyncSession, chunk_size: int) -> list[Row]
+        - delete_answer_by_id(answer_id, session) -> Row | None
     """
 
     model = AnswerModels
 
+    @classmethod
+    def _columns(cls) -> tuple:
+        """Колонки ответа в порядке полей AnswerResponse (чтение без ORM-объектов)."""
+        return (
+            cls.model.id,
+            cls.model.question_id,
+            cls.model.user_id,
+            cls.model.text,
+            cls.model.created_at,
+        )
+
+    @staticmethod
+    async def _count_added(question_id: int, added: int, session: AsyncSession) -> bool:
+        """
+        Увеличивает счётчик ответов вопроса, обновляет дату последнего ответа
+        и поднимает версию вопроса.
+
+        UPDATE заодно блокирует строку вопроса до конца транзакции, поэтому
+        вопрос не может быть удалён, пока добавляются ответы, а конкурентные
+        добавления не теряют инкременты.
+
+        Args:
+            question_id (int): ID вопроса.
+            added (int): Сколько ответов добавляется.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            bool: False, если вопроса не существует.
+        """
+        question = QuestionModels
+        now = func.now()
+        result = await session.execute(
+            update(question)
+            .where(question.id == question_id)
+            .values(
+                answer_count=question.answer_count + added,
+                last_answer_at=case(
+                    (question.last_answer_at.is_(None), now),
+                    (question.last_answer_at < now, now),
+                    else_=question.last_answer_at,
+                ),
+                version=question.version + 1,
+                updated_at=now,
+            )
+            .returning(question.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
+
+    @classmethod
+    async def _count_removed(cls, removed: dict[int, int], session: AsyncSession) -> None:
+        """
+        Уменьшает счётчики ответов вопросов, пересчитывает даты последнего
+        ответа и поднимает версии вопросов.
+
+        Все вопросы обновляются одним executemany в порядке возрастания ID
+        (как в create_answers_batch): пачка удалённых ответов может задеть
+        тысячи вопросов, и отдельный запрос на каждый стоил бы по обращению
+        к базе на вопрос.
+
+        Args:
+            removed (dict[int, int]): Сколько ответов удалено, по ID вопроса.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+        """
+        question = QuestionModels.__table__
+        last_answer_at = (
+            select(func.max(cls.model.created_at))
+            .where(cls.model.question_id == bindparam("question_id"))
+            .scalar_subquery()
+        )
+        await session.execute(
+            update(question)
+            .where(question.c.id == bindparam("question_id"))
+            .values(
+                answer_count=question.c.answer_count - bindparam("removed"),
+                last_answer_at=last_answer_at,
+                version=question.c.version + 1,
+                updated_at=func.now(),
+            ),
+            [{"question_id": question_id, "removed": removed[question_id]} for question_id in sorted(removed)],
+        )
+
     @classmethod
     async def create_answer(
         cls,
@@ -31,7 +126,7 @@ class AnswerRepository:
         text: str,
         user_id: uuid.UUID,
         session: AsyncSession
-    ) -> AnswerModels:
+    ) -> Optional[AnswerModels]:
         """
         Добавляет ответ для указанного вопроса.
 
@@ -42,8 +137,11 @@ class AnswerRepository:
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
 
         Returns:
-            AnswerModels: Созданный объект ответа с ID.
+            AnswerModels | None: Созданный объект ответа с ID или None, если вопроса нет.
         """
+        if not await cls._count_added(question_id, 1, session):
+            await session.rollback()
+            return None
         answer = cls.model(
             question_id=question_id,
             text=text,
@@ -53,12 +151,86 @@ class AnswerRepository:
         await session.commit()
         return answer
 
+    @classmethod
+    async def create_answers_bulk(
+        cls,
+        question_id: int,
+        items: list[dict],
+        session: AsyncSession,
+        chunk_size: int
+    ) -> Optional[list[int]]:
+        """
+        Добавляет пачку ответов к вопросу в одной транзакции.
+
+        Args:
+            question_id (int): ID вопроса.
+            items (list[dict]): Данные ответов (text, user_id).
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            chunk_size (int): Максимальное количество строк в одном INSERT ... RETURNING.
+
+        Returns:
+            list[int] | None: ID созданных ответов в порядке `items` или None, если вопроса нет.
+        """
+        if not await cls._count_added(question_id, len(items), session):
+            await session.rollback()
+            return None
+        query = insert(cls.model).returning(cls.model.id, sort_by_parameter_order=True)
+        ids = []
+        for start in range(0, len(items), chunk_size):
+            chunk = [{**item, "question_id": question_id} for item in items[start:start + chunk_size]]
+            result = await session.execute(query, chunk)
+            ids.extend(result.scalars().all())
+        await session.commit()
+        return ids
+
+    @classmethod
+    async def create_answers_batch(
+        cls,
+        items: list[dict],
+        session: AsyncSession
+    ) -> list[Optional[Row]]:
+        """
+        Добавляет ответы к разным вопросам одной транзакцией (group commit).
+
+        Статистика обновляется по одному UPDATE на вопрос в порядке возрастания ID
+        (одинаковый порядок блокировок у конкурентных пачек исключает взаимные
+        блокировки). Вопросы, которых нет, выясняются по этим UPDATE, поэтому
+        ответы к ним не вставляются и не роняют пачку ошибкой внешнего ключа.
+        Остальные ответы пишутся одним многострочным INSERT ... RETURNING.
+
+        Args:
+            items (list[dict]): Данные ответов (question_id, text, user_id).
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            list[Row | None]: Для каждого элемента `items` строка (id, created_at)
+            или None, если его вопроса нет.
+        """
+        added: dict[int, int] = {}
+        for item in items:
+            added[item["question_id"]] = added.get(item["question_id"], 0) + 1
+        existing = {
+            question_id
+            for question_id in sorted(added)
+            if await cls._count_added(question_id, added[question_id], session)
+        }
+        rows = [item for item in items if item["question_id"] in existing]
+        inserted = iter(())
+        if rows:
+            result = await session.execute(
+                insert(cls.model).returning(cls.model.id, cls.model.created_at, sort_by_parameter_order=True),
+                rows,
+            )
+            inserted = iter(result.all())
+        await session.commit()
+        return [next(inserted) if item["question_id"] in existing else None for item in items]
+
     @classmethod
     async def get_answer_by_id(
         cls,
         answer_id: int,
         session: AsyncSession
-    ) -> AnswerModels:
+    ) -> Optional[Row]:
         """
         Получает ответ по его ID.
 
@@ -67,30 +239,202 @@ class AnswerRepository:
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
 
         Returns:
-            AnswerModels: Объект ответа.
+            Row | None: Строка (id, question_id, user_id, text, created_at) или None.
         """
-        query = select(cls.model).where(cls.model.id == answer_id)
+        query = select(*cls._columns()).where(cls.model.id == answer_id)
         result = await session.execute(query)
-        answer = result.scalar_one_or_none()
-        return answer
+        return result.one_or_none()
+
+    @classmethod
+    async def answers_by_ids(cls, ids: list[int], session: AsyncSession) -> dict[int, Row]:
+        """
+        Получает ответы по списку ID одним запросом.
+
+        Args:
+            ids (list[int]): ID ответов.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+
+        Returns:
+            dict[int, Row]: ID -> строка (id, question_id, user_id, text, created_at);
+                ненайденных ответов в словаре нет.
+        """
+        if not ids:
+            return {}
+        result = await session.execute(select(*cls._columns()).where(id_in(cls.model.id, ids, session)))
+        return {row.id: row for row in result}
+
+    @classmethod
+    def answers_page_query(
+        cls,
+        question_id: int,
+        limit: int,
+        after: Optional[tuple] = None,
+        created_between: Optional[tuple] = None
+    ) -> Select:
+        """Запрос страницы ответов вопроса (см. answers_page)."""
+        query = (
+            select(*cls._columns())
+            .where(cls.model.question_id == question_id)
+            .order_by(cls.model.created_at, cls.model.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(cls.model.created_at, cls.model.id) > tuple_(*after))
+        if created_between is not None:
+            since, until = created_between
+            if since is not None:
+                query = query.where(cls.model.created_at >= since)
+            if until is not None:
+                query = query.where(cls.model.created_at <= until)
+        return query
+
+    @classmethod
+    async def answers_page(
+        cls,
+        question_id: int,
+        session: AsyncSession,
+        limit: int,
+        after: Optional[tuple] = None,
+        created_between: Optional[tuple] = None
+    ) -> list[Row]:
+        """
+        Получает страницу ответов вопроса в порядке (created_at, id).
+
+        Использует keyset-пагинацию по индексу ix_answer_question_id_created_at_id,
+        поэтому читается не больше `limit` строк независимо от числа ответов.
+
+        Таблица ответов в PostgreSQL секционирована по месяцам created_at.
+        Ответы вопроса созданы не раньше вопроса и не позже его last_answer_at,
+        поэтому с `created_between` читаются только секции месяцев, когда вопрос
+        получал ответы (partition pruning), — в том числе архивные. Курсор
+        тоже сужает диапазон: секции раньше него не читаются.
+        В SQLite границы не применяются: там даты сравниваются как строки,
+        и у значений разной точности сравнение неверно.
+
+        Args:
+            question_id (int): ID вопроса.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            limit (int): Максимальное количество ответов на странице.
+            after (tuple | None): (created_at, id) последнего ответа предыдущей страницы.
+            created_between (tuple | None): (created_at, last_answer_at) вопроса; None — без границы.
+
+        Returns:
+            list[Row]: Строки ответов страницы (id, question_id, user_id, text, created_at).
+        """
+        if session.bind.dialect.name == "postgresql":
+            since, until = created_between or (None, None)
+            if after is not None:
+                since = after[0] if since is None else max(since, after[0])
+            created_between = (since, until)
+        else:
+            created_between = None
+        result = await session.execute(cls.answers_page_query(question_id, limit, after, created_between))
+        return list(result.all())
+
+    @classmethod
+    async def answers_by_user(
+        cls,
+        user_id: uuid.UUID,
+        session: AsyncSession,
+        limit: int,
+        after: Optional[tuple] = None
+    ) -> list[Row]:
+        """
+        Получает страницу ответов пользователя, новые первыми (created_at, id по убыванию).
+
+        Использует keyset-пагинацию по индексу ix_answer_user_id_created_at_id
+        (обратный проход), поэтому читается не больше `limit` строк.
+
+        Args:
+            user_id (uuid.UUID): UUID пользователя.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            limit (int): Максимальное количество ответов на странице.
+            after (tuple | None): (created_at, id) последнего ответа предыдущей страницы.
+
+        Returns:
+            list[Row]: Строки ответов страницы (id, question_id, user_id, text, created_at).
+        """
+        query = (
+            select(*cls._columns())
+            .where(cls.model.user_id == user_id)
+            .order_by(cls.model.created_at.desc(), cls.model.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(cls.model.created_at, cls.model.id) < tuple_(*after))
+        result = await session.execute(query)
+        return list(result.all())
+
+    @classmethod
+    async def delete_answers_by_user(
+        cls,
+        user_id: uuid.UUID,
+        session: AsyncSession,
+        chunk_size: int
+    ) -> list[Row]:
+        """
+        Удаляет не больше `chunk_size` ответов пользователя одной транзакцией.
+
+        Ответы выбираются по индексу ix_answer_user_id_created_at_id и удаляются
+        по (id, created_at) — первичному ключу секционированной таблицы.
+        Статистика затронутых вопросов обновляется в той же транзакции, в
+        порядке возрастания ID вопросов (как в create_answers_batch), чтобы
+        конкурентные транзакции не блокировали друг друга по кругу. Вызывается
+        повторно, пока возвращает полную пачку: каждая транзакция короткая
+        и держит блокировки не больше чем на `chunk_size` строк.
+
+        Args:
+            user_id (uuid.UUID): UUID пользователя.
+            session (AsyncSession): Асинхронная сессия SQLAlchemy.
+            chunk_size (int): Сколько ответов удалять за транзакцию.
+
+        Returns:
+            list[Row]: Строки (id, question_id, created_at) удалённых ответов.
+        """
+        chunk = (
+            select(cls.model.id, cls.model.created_at)
+            .where(cls.model.user_id == user_id)
+            .order_by(cls.model.created_at, cls.model.id)
+            .limit(chunk_size)
+        )
+        result = await session.execute(
+            delete(cls.model)
+            .where(tuple_(cls.model.id, cls.model.created_at).in_(chunk))
+            .returning(cls.model.id, cls.model.question_id, cls.model.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.all()
+        removed: dict[int, int] = {}
+        for row in deleted:
+            removed[row.question_id] = removed.get(row.question_id, 0) + 1
+        if removed:
+            await cls._count_removed(removed, session)
+        await session.commit()
+        return deleted
 
     @classmethod
     async def delete_answer_by_id(
         cls,
         answer_id: int,
         session: AsyncSession
-    ) -> dict:
+    ) -> Optional[Row]:
         """
-        Удаляет ответ по ID.
+        Удаляет ответ по ID одним запросом DELETE ... RETURNING.
 
         Args:
             answer_id (int): ID ответа.
             session (AsyncSession): Асинхронная сессия SQLAlchemy.
 
         Returns:
-            dict: Сообщение об успешном удалении.
+            Row | None: Строка (id, question_id, created_at) удалённого ответа или None, если ответа не было.
         """
-        await session.execute(delete(cls.model).where(cls.model.id == answer_id))
+        result = await session.execute(
+            delete(cls.model).where(cls.model.id == answer_id)
+            .returning(cls.model.id, cls.model.question_id, cls.model.created_at)
+        )
+        deleted = result.one_or_none()
+        if deleted is not None:
+            await cls._count_removed({deleted.question_id: 1}, session)
         await session.commit()
-        return {"message": f"Ответ {answer_id} удалён"}
+        return deleted
 
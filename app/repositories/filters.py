@@ -0,0 +1,23 @@
+from typing import Sequence
+
+from sqlalchemy import ColumnElement, any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def id_in(column, ids: Sequence[int], session: AsyncSession) -> ColumnElement[bool]:
+    """
+    Условие «column входит в ids» для выборки по списку ID одним запросом.
+
+    В PostgreSQL — `column = ANY(:ids)` с одним параметром-массивом: текст
+    запроса не зависит от числа ID, и подготовленный запрос переиспользуется
+    (IN (...) даёт новый текст на каждую длину списка). В остальных СУБД — IN.
+
+    column: Колонка ID.
+    ids: Значения ID.
+    session: Активная асинхронная сессия SQLAlchemy (по ней выбирается диалект).
+    return: Условие для WHERE.
+    """
+    if session.bind.dialect.name == "postgresql":
+        return column == any_(bindparam(None, list(ids), type_=ARRAY(column.type)))
+    return column.in_(ids)
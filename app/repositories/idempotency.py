@@ -0,0 +1,142 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, delete, insert, update, or_, tuple_, Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import IdempotencyKeyModels
+
+
+class IdempotencyRepository:
+    """
+    Репозиторий сохранённых ответов на запросы с Idempotency-Key.
+
+    Строка создаётся при первом запросе с ключом (status_code = NULL — запрос
+    выполняется) и заполняется ответом после его завершения. Первичный ключ
+    (client, key) гарантирует, что выполнить запрос «захватит» только один
+    процесс, а одинаковые ключи разных клиентов не пересекаются.
+    Захват — аренда до locked_until: если процесс упал или перезапустился, не
+    завершив запрос, после окончания аренды ключ захватывает следующий повтор.
+
+    Методы:
+    - claim(client: str, key: str, fingerprint: str, locked_until: datetime, now: datetime,
+        session: AsyncSession) -> Row | None
+    - get(client: str, key: str, session: AsyncSession) -> Row | None
+    - complete(client: str, key: str, status_code: int, body: bytes, expires_at: datetime,
+        session: AsyncSession) -> None
+    - release(client: str, key: str, session: AsyncSession) -> None
+    - delete_expired(now: datetime, session: AsyncSession, limit: int) -> int
+    """
+
+    model = IdempotencyKeyModels
+
+    @classmethod
+    def _columns(cls) -> tuple:
+        return cls.model.fingerprint, cls.model.status_code, cls.model.body, cls.model.locked_until
+
+    @classmethod
+    def _is(cls, client: str, key: str) -> tuple:
+        return cls.model.client == client, cls.model.key == key
+
+    @classmethod
+    async def claim(
+        cls,
+        client: str,
+        key: str,
+        fingerprint: str,
+        locked_until: datetime,
+        now: datetime,
+        session: AsyncSession
+    ) -> Optional[Row]:
+        """
+        Захватывает ключ для выполнения запроса до `locked_until`.
+
+        Истёкший сохранённый ответ с тем же ключом предварительно удаляется.
+        Незавершённая запись, аренда которой истекла (процесс упал, не сохранив
+        ответ), захватывается заново: UPDATE с условием на status_code и
+        locked_until выполнит только один из конкурирующих процессов.
+        До завершения запроса expires_at совпадает с концом аренды, поэтому
+        брошенную запись удаляет и app.commands.purge_idempotency_keys.
+
+        client: Идентификатор клиента.
+        key: Значение Idempotency-Key.
+        fingerprint: Отпечаток запроса.
+        locked_until: Конец аренды ключа.
+        now: Текущее время.
+        session: Активная асинхронная сессия SQLAlchemy.
+        return: None, если ключ захвачен этим вызовом, иначе существующая строка
+            (fingerprint, status_code, body, locked_until).
+        """
+        await session.execute(
+            delete(cls.model)
+            .where(*cls._is(client, key), cls.model.status_code.is_not(None), cls.model.expires_at <= now)
+        )
+        try:
+            await session.execute(
+                insert(cls.model).values(
+                    client=client, key=key, fingerprint=fingerprint, locked_until=locked_until, expires_at=locked_until
+                )
+            )
+            await session.commit()
+            return None
+        except IntegrityError:
+            await session.rollback()
+        result = await session.execute(
+            update(cls.model)
+            .where(
+                *cls._is(client, key),
+                cls.model.status_code.is_(None),
+                # NULL — записи, созданные до появления аренды.
+                or_(cls.model.locked_until.is_(None), cls.model.locked_until < now),
+            )
+            .values(fingerprint=fingerprint, locked_until=locked_until, expires_at=locked_until)
+            .returning(cls.model.key)
+        )
+        taken_over = result.scalar_one_or_none() is not None
+        await session.commit()
+        if taken_over:
+            return None
+        return await cls.get(client, key, session)
+
+    @classmethod
+    async def get(cls, client: str, key: str, session: AsyncSession) -> Optional[Row]:
+        """Строка (fingerprint, status_code, body, locked_until) по ключу клиента или None."""
+        result = await session.execute(select(*cls._columns()).where(*cls._is(client, key)))
+        return result.one_or_none()
+
+    @classmethod
+    async def complete(
+        cls,
+        client: str,
+        key: str,
+        status_code: int,
+        body: bytes,
+        expires_at: datetime,
+        session: AsyncSession
+    ) -> None:
+        """Сохраняет ответ на запрос, захвативший ключ; ответ хранится до `expires_at`."""
+        await session.execute(
+            update(cls.model)
+            .where(*cls._is(client, key))
+            .values(status_code=status_code, body=body, locked_until=None, expires_at=expires_at)
+        )
+        await session.commit()
+
+    @classmethod
+    async def release(cls, client: str, key: str, session: AsyncSession) -> None:
+        """Освобождает ключ, если запрос завершился ошибкой (повтор выполнит его заново)."""
+        await session.execute(delete(cls.model).where(*cls._is(client, key), cls.model.status_code.is_(None)))
+        await session.commit()
+
+    @classmethod
+    async def delete_expired(cls, now: datetime, session: AsyncSession, limit: int) -> int:
+        """
+        Удаляет не больше `limit` истёкших записей (по индексу ix_idempotency_keys_expires_at).
+
+        return: Количество удалённых записей.
+        """
+        expired = select(cls.model.client, cls.model.key).where(cls.model.expires_at <= now).limit(limit)
+        result = await session.execute(delete(cls.model).where(tuple_(cls.model.client, cls.model.key).in_(expired)))
+        await session.commit()
+        return result.rowcount
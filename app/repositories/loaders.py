@@ -0,0 +1,131 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Optional, TypeVar
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logs.logger import logger
+from app.repositories.answers import AnswerRepository
+from app.repositories.questions import QuestionRepository
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Ключ в session.info, под которым хранятся загрузчики сессии.
+_LOADERS_KEY = "loaders"
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Загрузчик по ключу в духе DataLoader: объединяет обращения в один запрос.
+
+    load(key) не идёт в базу сразу, а запоминает ключ и откладывает выборку до
+    следующего шага цикла событий (loop.call_soon). Все ключи, запрошенные до
+    этого момента — например, из задач asyncio.gather, — загружаются одним
+    вызовом `load_many` (запрос WHERE id = ANY(...)). Результаты запоминаются:
+    повторный load того же ключа в пределах загрузчика не идёт в базу.
+
+    Загрузчик живёт столько же, сколько сессия запроса (см. loaders) и
+    предназначен для чтения: после записи в той же сессии вызовите clear().
+    Выборки разных загрузчиков одной сессии выполняются по очереди (общий
+    asyncio.Lock) — AsyncSession не допускает параллельных запросов.
+    """
+
+    def __init__(
+        self,
+        load_many: Callable[[list[K], AsyncSession], Awaitable[dict[K, V]]],
+        session: AsyncSession,
+        lock: asyncio.Lock
+    ):
+        self._load_many = load_many
+        self._session = session
+        self._lock = lock
+        self._futures: dict[K, asyncio.Future] = {}
+        self._pending: list[K] = []
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+
+    def load(self, key: K) -> Awaitable[Optional[V]]:
+        """
+        Загружает значение по ключу в ближайшей пачке.
+
+        key: Ключ (ID).
+        return: Awaitable со значением или None, если ключа нет в базе.
+        """
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            self._pending.append(key)
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> list[Optional[V]]:
+        """Загружает значения по ключам (одной пачкой) в порядке `keys`, повторы допускаются."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self) -> None:
+        """Забывает загруженные значения (ключи, чья пачка ещё не выбрана, остаются)."""
+        self._futures = {key: self._futures[key] for key in self._pending}
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        # Futures берутся сейчас: clear() до начала выборки не должен их потерять.
+        futures = [self._futures[key] for key in keys]
+        task = asyncio.ensure_future(self._fetch(keys, futures))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fetch(self, keys: list[K], futures: list[asyncio.Future]) -> None:
+        try:
+            async with self._lock:
+                values = await self._load_many(keys, self._session)
+        except asyncio.CancelledError:
+            self._forget(keys, futures)
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            # Ошибку получают все ожидающие пачки, а ключи не запоминаются:
+            # следующий load попробует снова. Ошибка логируется здесь, и future
+            # помечается прочитанной: её может и не ждать никто (запрос отменён).
+            logger.warning(f"Ошибка пакетной загрузки ({len(keys)} ключей): {e}")
+            self._forget(keys, futures)
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()
+            return
+        self.batches += 1
+        for key, future in zip(keys, futures):
+            if not future.done():
+                future.set_result(values.get(key))
+
+    def _forget(self, keys: list[K], futures: list[asyncio.Future]) -> None:
+        for key, future in zip(keys, futures):
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+
+class Loaders:
+    """Загрузчики вопросов и ответов по ID для одной сессии (одного запроса)."""
+
+    def __init__(self, session: AsyncSession):
+        lock = asyncio.Lock()
+        self.questions: BatchLoader[int, Row] = BatchLoader(QuestionRepository.questions_by_ids, session, lock)
+        self.answers: BatchLoader[int, Row] = BatchLoader(AnswerRepository.answers_by_ids, session, lock)
+
+
+def loaders(session: AsyncSession) -> Loaders:
+    """
+    Загрузчики сессии; создаются при первом обращении и хранятся в session.info.
+
+    Сессия создаётся на запрос (database.get_session / get_read_session),
+    поэтому загрузчики и их результаты не переживают запрос.
+    """
+    found = session.info.get(_LOADERS_KEY)
+    if found is None:
+        found = session.info[_LOADERS_KEY] = Loaders(session)
+    return found
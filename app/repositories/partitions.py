@@ -0,0 +1,164 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import column, func, select, table, text, Row
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+
+# Ключ pg_advisory_xact_lock: воркеры, одновременно создающие секции, не мешают друг другу.
+PARTITION_LOCK_KEY = 7_412_903_551
+
+
+class AnswerPartitionRepository:
+    """
+    Репозиторий секций таблицы ответов (PostgreSQL, RANGE по created_at).
+
+    Секции создаются и архивируются DDL-запросами, поэтому имена секций
+    подставляются в текст запроса: вызывающий код передаёт только имена,
+    построенные app.database.partitions.partition_name. Границы секций —
+    даты, сформированные приложением, а не пользовательский ввод.
+
+    Методы:
+    - is_partitioned(session: AsyncSession) -> bool
+    - lock(session: AsyncSession) -> None
+    - partitions(session: AsyncSession) -> list[Row]
+    - create_partition(name: str, start: datetime, end: datetime, session: AsyncSession) -> int
+    - relation_size(name: str, session: AsyncSession) -> int
+    - stream_rows(name: str, session: AsyncSession, yield_per: int) -> AsyncResult
+    - archive_partition(name: str, archived_name: str, session: AsyncSession,
+        tablespace: str | None, access_method: str | None) -> None
+    - vacuum(name: str, session: AsyncSession) -> None
+    - explain(query, session: AsyncSession) -> list[str]
+    """
+
+    table_name = "answer"
+    default_partition = "answer_default"
+    cluster_index = "ix_answer_question_id_created_at_id"
+
+    @classmethod
+    async def is_partitioned(cls, session: AsyncSession) -> bool:
+        """True, если таблица ответов секционирована (после миграции 7d3e5b9c1f60 на PostgreSQL)."""
+        if session.bind.dialect.name != "postgresql":
+            return False
+        relkind = await session.scalar(
+            text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass(:name)"), {"name": cls.table_name}
+        )
+        return relkind == "p"
+
+    @staticmethod
+    async def lock(session: AsyncSession) -> None:
+        """Блокировка на время транзакции: секции создаёт и архивирует один процесс за раз."""
+        await session.execute(select(func.pg_advisory_xact_lock(PARTITION_LOCK_KEY)))
+
+    @classmethod
+    async def partitions(cls, session: AsyncSession) -> list[Row]:
+        """
+        Секции таблицы ответов.
+
+        return: Строки (name, bound) по имени; bound — текст границ (FOR VALUES ... / DEFAULT).
+        """
+        result = await session.execute(
+            text(
+                "SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:name) ORDER BY c.relname"
+            ),
+            {"name": cls.table_name},
+        )
+        return result.all()
+
+    @classmethod
+    async def create_partition(cls, name: str, start: datetime, end: datetime, session: AsyncSession) -> int:
+        """
+        Создаёт секцию [start, end) без фиксации транзакции.
+
+        Ответы этого диапазона, уже попавшие в секцию по умолчанию, переносятся
+        в новую секцию: иначе PostgreSQL не даст её создать.
+
+        return: Сколько ответов перенесено из секции по умолчанию.
+        """
+        bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        default = table(cls.default_partition, column("created_at"))
+        stray = await session.scalar(
+            select(func.count()).select_from(default)
+            .where(default.c.created_at >= start, default.c.created_at < end)
+        )
+        if not stray:
+            await session.execute(text(f"CREATE TABLE {name} PARTITION OF {cls.table_name} {bounds}"))
+            return 0
+        columns = "id, question_id, user_id, text, created_at"
+        await session.execute(text(f"ALTER TABLE {cls.table_name} DETACH PARTITION {cls.default_partition}"))
+        await session.execute(text(f"CREATE TABLE {name} PARTITION OF {cls.table_name} {bounds}"))
+        await session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {cls.default_partition} "
+                f"WHERE created_at >= :start AND created_at < :end RETURNING {columns}) "
+                f"INSERT INTO {name} ({columns}) SELECT {columns} FROM moved"
+            ),
+            {"start": start, "end": end},
+        )
+        await session.execute(text(f"ALTER TABLE {cls.table_name} ATTACH PARTITION {cls.default_partition} DEFAULT"))
+        return stray
+
+    @staticmethod
+    async def relation_size(name: str, session: AsyncSession) -> int:
+        """Размер таблицы вместе с индексами и TOAST, байт."""
+        return await session.scalar(select(func.pg_total_relation_size(func.to_regclass(name))))
+
+    @staticmethod
+    async def stream_rows(name: str, session: AsyncSession, yield_per: int) -> AsyncResult:
+        """Потоково читает ответы секции (id, question_id, user_id, text, created_at) в порядке id."""
+        partition = table(name, column("id"), column("question_id"), column("user_id"), column("text"), column("created_at"))
+        query = select(*partition.c).order_by(partition.c.id)
+        return await session.stream(query.execution_options(yield_per=yield_per))
+
+    @classmethod
+    async def archive_partition(
+        cls,
+        name: str,
+        archived_name: str,
+        session: AsyncSession,
+        tablespace: Optional[str] = None,
+        access_method: Optional[str] = None
+    ) -> None:
+        """
+        Переписывает секцию в архивную и фиксирует транзакцию.
+
+        Секция остаётся частью таблицы ответов (чтение через AnswerRepository не
+        меняется), но переписывается без свободного места (fillfactor 100) и без
+        мёртвых строк, в порядке индекса (question_id, created_at, id) — ответы
+        одного вопроса лежат рядом. При необходимости секция переносится в
+        отдельное табличное пространство (например, на дешёвый диск) и на другой
+        метод доступа (например, columnar, если расширение установлено; PostgreSQL 15+).
+        На время перезаписи секция блокируется целиком.
+        """
+        index = await session.scalar(
+            text(
+                "SELECT ic.relname FROM pg_inherits i "
+                "JOIN pg_index x ON x.indexrelid = i.inhrelid "
+                "JOIN pg_class ic ON ic.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:index) AND x.indrelid = to_regclass(:name)"
+            ),
+            {"index": cls.cluster_index, "name": name},
+        )
+        await session.execute(text(f"ALTER TABLE {name} SET (fillfactor = 100)"))
+        if access_method is not None:
+            await session.execute(text(f"ALTER TABLE {name} SET ACCESS METHOD {access_method}"))
+        if tablespace is not None:
+            await session.execute(text(f"ALTER TABLE {name} SET TABLESPACE {tablespace}"))
+        if index is not None:
+            await session.execute(text(f"CLUSTER {name} USING {index}"))
+        await session.execute(text(f"ALTER TABLE {name} RENAME TO {archived_name}"))
+        await session.commit()
+
+    @staticmethod
+    async def vacuum(name: str, session: AsyncSession) -> None:
+        """VACUUM (FREEZE, ANALYZE): архивная секция больше не меняется, её страницы помечаются all-visible."""
+        connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+        await connection.execute(text(f"VACUUM (FREEZE, ANALYZE) {name}"))
+
+    @staticmethod
+    async def explain(query, session: AsyncSession) -> list[str]:
+        """План запроса (EXPLAIN) с подставленными параметрами: видно, какие секции читаются."""
+        compiled = query.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True})
+        result = await session.execute(text(f"EXPLAIN {compiled}"))
+        return list(result.scalars())
@@ -1,9 +1,12 @@
+from datetime import datetime
+from typing import Optional
+
 from fastapi import HTTPException
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert, tuple_, func, Row
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from app.database.models import QuestionModels
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncResult
+from app.database.models import QuestionModels, AnswerModels
+from app.repositories.filters import id_in
 from app.logs.logger import logger
 from app.schemas.questions import QuestionSchemas
 
@@ -12,27 +15,94 @@ class QuestionRepository:
     """
     Репозиторий для работы с сущностью Question в базе данных.
 
+    Методы чтения для API (all_questions, get_question_by_id) выбирают колонки,
+    а не ORM-объекты: строки не попадают в identity map и сразу сериализуются
+    в JSON (см. app.schemas.questions.question_page_json).
+
     Методы:
-    - all_questions(session: AsyncSession) -> list[QuestionModels]
+    - all_questions(session: AsyncSession, limit: int, after: tuple | None, sort: str) -> list[Row]
+    - sort_key(question: Row, sort: str) -> tuple
     - add_question(data: dict, session: AsyncSession) -> QuestionModels
-    - get_question_by_id(id: int, session: AsyncSession) -> QuestionModels
-    - delete_question_by_id(id: int, session: AsyncSession)
+    - add_questions_bulk(items: list[dict], session: AsyncSession, chunk_size: int) -> list[int]
+    - get_question_by_id(id: int, session: AsyncSession) -> Row | None
+    - questions_by_ids(ids: list[int], session: AsyncSession) -> dict[int, Row]
+    - question_exists(id: int, session: AsyncSession) -> bool
+    - delete_question_by_id(id: int, session: AsyncSession) -> list[int] | None
+    - stream_questions_with_answers(session: AsyncSession, yield_per: int) -> AsyncResult
     """
 
     model = QuestionModels
 
+    SORTS = ("created", "most_answered", "recent_activity")
+
+    @classmethod
+    def _columns(cls) -> tuple:
+        """Колонки вопроса в порядке полей QuestionAllResponse."""
+        return (
+            cls.model.id,
+            cls.model.text,
+            cls.model.created_at,
+            cls.model.answer_count,
+            cls.model.last_answer_at,
+        )
+
+    @classmethod
+    def _sort_columns(cls, sort: str) -> tuple[tuple, bool]:
+        """Выражения ключа сортировки и признак сортировки по убыванию."""
+        if sort == "most_answered":
+            return (cls.model.answer_count, cls.model.id), True
+        if sort == "recent_activity":
+            return (func.coalesce(cls.model.last_answer_at, cls.model.created_at), cls.model.id), True
+        return (cls.model.created_at, cls.model.id), False
+
+    @staticmethod
+    def sort_key(question: Row, sort: str) -> tuple:
+        """
+        Значения ключа сортировки для вопроса (из них строится курсор).
+
+        question: Строка вопроса (или объект QuestionModels).
+        sort: Вариант сортировки из SORTS.
+        return: Кортеж значений ключа, последний элемент — ID.
+        """
+        if sort == "most_answered":
+            return question.answer_count, question.id
+        if sort == "recent_activity":
+            return question.last_answer_at or question.created_at, question.id
+        return question.created_at, question.id
+
     @classmethod
-    async def all_questions(cls, session: AsyncSession) -> list[QuestionModels]:
+    async def all_questions(
+        cls,
+        session: AsyncSession,
+        limit: int,
+        after: Optional[tuple] = None,
+        sort: str = "created"
+    ) -> list[Row]:
         """
-        Получает список всех вопросов из базы данных.
+        Получает страницу вопросов в заданном порядке.
+
+        Использует keyset-пагинацию: вместо OFFSET берутся записи строго после
+        ключа `after`, поэтому стоимость запроса не зависит от номера страницы.
+        Каждой сортировке соответствует индекс:
+        - created: (created_at, id) по возрастанию, ix_questions_created_at_id;
+        - most_answered: (answer_count, id) по убыванию, ix_questions_answer_count_id;
+        - recent_activity: (coalesce(last_answer_at, created_at), id) по убыванию,
+          ix_questions_last_activity_id.
 
         session: Активная асинхронная сессия SQLAlchemy.
-        return: Список объектов `QuestionModels`.
+        limit: Максимальное количество вопросов на странице.
+        after: Ключ сортировки последнего вопроса предыдущей страницы (см. sort_key).
+        sort: Вариант сортировки из SORTS.
+        return: Список строк (id, text, created_at, answer_count, last_answer_at).
         """
-        query = select(cls.model)
+        columns, descending = cls._sort_columns(sort)
+        order_by = [column.desc() for column in columns] if descending else list(columns)
+        query = select(*cls._columns()).order_by(*order_by).limit(limit)
+        if after is not None:
+            key = tuple_(*columns)
+            query = query.where(key < tuple_(*after) if descending else key > tuple_(*after))
         result = await session.execute(query)
-        questions = result.scalars().all()
-        return list(questions)
+        return list(result.all())
 
     @classmethod
     async def add_question(cls, data: dict, session: AsyncSession) -> QuestionModels:
@@ -49,28 +119,127 @@ class QuestionRepository:
         return question
 
     @classmethod
-    async def get_question_by_id(cls, id: int, session: AsyncSession) -> QuestionModels:
+    async def add_questions_bulk(cls, items: list[dict], session: AsyncSession, chunk_size: int) -> list[int]:
+        """
+        Создаёт вопросы пачкой в одной транзакции.
+
+        Каждый кусок из `chunk_size` элементов вставляется одним многострочным
+        INSERT ... RETURNING id; порядок возвращённых ID совпадает с порядком `items`.
+
+        items: Данные вопросов.
+        session: Активная асинхронная сессия SQLAlchemy.
+        chunk_size: Максимальное количество строк в одном INSERT.
+        return: Список ID созданных вопросов.
+        """
+        query = insert(cls.model).returning(cls.model.id, sort_by_parameter_order=True)
+        ids = []
+        for start in range(0, len(items), chunk_size):
+            result = await session.execute(query, items[start:start + chunk_size])
+            ids.extend(result.scalars().all())
+        await session.commit()
+        return ids
+
+    @classmethod
+    async def get_question_by_id(cls, id: int, session: AsyncSession) -> Optional[Row]:
         """
-        Получает вопрос по его идентификатору, включая связанные ответы.
+        Получает вопрос по его идентификатору без ответов.
+
+        Ответы загружаются отдельно постранично (AnswerRepository.answers_page),
+        счётчик ответов хранится в самом вопросе. Вместе с вопросом читаются
+        version и updated_at, из которых строятся ETag и Last-Modified: проверка
+        условного запроса стоит одного чтения по первичному ключу.
 
         id: ID вопроса.
         session: Активная асинхронная сессия SQLAlchemy.
-        return: Объект `QuestionModels` или None, если вопрос не найден.
+        return: Строка (id, text, created_at, answer_count, last_answer_at, version, updated_at)
+            или None, если вопрос не найден.
        """
-        query = (select(cls.model).where(cls.model.id == id).options
-                 (selectinload(cls.model.answers)))
+        query = select(*cls._columns(), cls.model.version, cls.model.updated_at).where(cls.model.id == id)
         result = await session.execute(query)
-        return result.scalar_one_or_none()
+        return result.one_or_none()
+
+    @classmethod
+    async def questions_by_ids(cls, ids: list[int], session: AsyncSession) -> dict[int, Row]:
+        """
+        Получает вопросы без ответов по списку ID одним запросом по первичному ключу.
+
+        ids: ID вопросов.
+        session: Активная асинхронная сессия SQLAlchemy.
+        return: ID -> строка (id, text, created_at, answer_count, last_answer_at);
+            ненайденных вопросов в словаре нет.
+        """
+        if not ids:
+            return {}
+        result = await session.execute(select(*cls._columns()).where(id_in(cls.model.id, ids, session)))
+        return {row.id: row for row in result}
+
+    @classmethod
+    async def question_exists(cls, id: int, session: AsyncSession) -> bool:
+        """
+        Проверяет существование вопроса, не загружая его ответы.
+
+        id: ID вопроса.
+        session: Активная асинхронная сессия SQLAlchemy.
+        return: True, если вопрос существует.
+        """
+        result = await session.execute(select(cls.model.id).where(cls.model.id == id))
+        return result.scalar_one_or_none() is not None
 
     @classmethod
-    async def delete_question_by_id(cls, id: int, session: AsyncSession):
+    async def delete_question_by_id(cls, id: int, session: AsyncSession) -> Optional[list[int]]:
         """
-        Удаляет вопрос по его ID.
+        Удаляет вопрос по его ID вместе с ответами в одной транзакции.
+
+        Ответы удаляются явно через DELETE ... RETURNING (а не только каскадом
+        внешнего ключа), чтобы вызывающий код знал их ID и мог точно
+        инвалидировать кэш.
+
         id: ID удаляемого вопроса.
         session: Активная асинхронная сессия SQLAlchemy.
+        return: ID удалённых ответов или None, если вопроса не было.
         """
-        await session.execute(delete(cls.model).where(cls.model.id == id))
+        answers = await session.execute(
+            delete(AnswerModels).where(AnswerModels.question_id == id).returning(AnswerModels.id)
+        )
+        answer_ids = list(answers.scalars().all())
+        result = await session.execute(
+            delete(cls.model).where(cls.model.id == id).returning(cls.model.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await session.rollback()
+            return None
         await session.commit()
+        return answer_ids
 
+    @classmethod
+    async def stream_questions_with_answers(cls, session: AsyncSession, yield_per: int) -> AsyncResult:
+        """
+        Потоково читает все вопросы вместе с ответами через серверный курсор.
 
+        Возвращает плоские строки (вопрос + ответ или NULL-ответ), упорядоченные
+        по ID вопроса и ID ответа, без построения ORM-объектов. В памяти
+        одновременно находится не больше `yield_per` строк.
 
+        session: Активная асинхронная сессия SQLAlchemy.
+        yield_per: Размер пачки строк, забираемой с сервера за раз.
+        return: `AsyncResult` со строками (id, text, created_at, answer_count,
+                last_answer_at, answer_id, answer_user_id, answer_text, answer_created_at).
+        """
+        answer = AnswerModels
+        query = (
+            select(
+                cls.model.id,
+                cls.model.text,
+                cls.model.created_at,
+                cls.model.answer_count,
+                cls.model.last_answer_at,
+                answer.id.label("answer_id"),
+                answer.user_id.label("answer_user_id"),
+                answer.text.label("answer_text"),
+                answer.created_at.label("answer_created_at"),
+            )
+            .outerjoin(answer, answer.question_id == cls.model.id)
+            .order_by(cls.model.id, answer.id)
+            .execution_options(yield_per=yield_per)
+        )
+        return await session.stream(query)
@@ -0,0 +1,180 @@
+from typing import Iterable
+
+from sqlalchemy import select, func, literal, literal_column, union_all, Row
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncResult
+
+from app.database.models import QuestionModels, AnswerModels
+
+
+class SearchRepository:
+    """
+    Репозиторий полнотекстового поиска по вопросам и ответам.
+
+    Для PostgreSQL поиск идёт по генерируемым колонкам search_vector
+    (tsvector из русской и английской конфигураций) с GIN-индексами
+    ix_questions_search_vector и ix_answer_search_vector, см. миграцию
+    full_text_search. В моделях этих колонок нет: их выражение понимает только
+    PostgreSQL, а схема тестов на SQLite создаётся из моделей. Для остальных
+    баз индекс строится в памяти (app.search.index), а репозиторий только
+    читает строки найденных документов.
+
+    Методы:
+    - full_text(query: str, session: AsyncSession, limit: int, offset: int) -> list[Row]
+    - full_text_grouped(query: str, session: AsyncSession, limit: int, offset: int) -> list[Row]
+    - documents(keys: Iterable[tuple[str, int]], session: AsyncSession) -> dict[tuple[str, int], Row]
+    - questions(ids: Iterable[int], session: AsyncSession) -> dict[int, Row]
+    - stream_documents(session: AsyncSession, yield_per: int) -> AsyncResult
+    """
+
+    CONFIGS = ("russian", "english")
+
+    @classmethod
+    def _ts_query(cls, query: str):
+        """Запрос websearch_to_tsquery в обеих конфигурациях, объединённый через ИЛИ."""
+        ts_query = func.websearch_to_tsquery(cls.CONFIGS[0], query)
+        for config in cls.CONFIGS[1:]:
+            ts_query = ts_query.op("||")(func.websearch_to_tsquery(config, query))
+        return ts_query
+
+    @classmethod
+    def _hits(cls, query: str):
+        """Подзапрос найденных документов (kind, id, question_id, text, created_at, rank)."""
+        ts_query = cls._ts_query(query)
+        question = QuestionModels
+        answer = AnswerModels
+        question_vector = literal_column(f"{question.__tablename__}.search_vector")
+        answer_vector = literal_column(f"{answer.__tablename__}.search_vector")
+        questions = select(
+            literal("question").label("kind"),
+            question.id,
+            question.id.label("question_id"),
+            question.text,
+            question.created_at,
+            func.ts_rank_cd(question_vector, ts_query).label("rank"),
+        ).where(question_vector.op("@@")(ts_query))
+        answers = select(
+            literal("answer"),
+            answer.id,
+            answer.question_id,
+            answer.text,
+            answer.created_at,
+            func.ts_rank_cd(answer_vector, ts_query),
+        ).where(answer_vector.op("@@")(ts_query))
+        return union_all(questions, answers).subquery("hits")
+
+    @classmethod
+    async def full_text(cls, query: str, session: AsyncSession, limit: int, offset: int = 0) -> list[Row]:
+        """
+        Ищет вопросы и ответы по индексу tsvector (только PostgreSQL).
+
+        query: Запрос в синтаксисе websearch_to_tsquery ("фраза", -исключить, or).
+        session: Активная асинхронная сессия SQLAlchemy.
+        limit: Максимальное количество документов.
+        offset: Сколько лучших документов пропустить.
+        return: Строки (kind, id, question_id, text, created_at, rank) по убыванию ранга;
+            при равном ранге вопросы идут раньше ответов, затем по ID.
+        """
+        hits = cls._hits(query)
+        result = await session.execute(
+            select(hits)
+            .order_by(hits.c.rank.desc(), hits.c.kind.desc(), hits.c.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(result.all())
+
+    @classmethod
+    async def full_text_grouped(cls, query: str, session: AsyncSession, limit: int, offset: int = 0) -> list[Row]:
+        """
+        Ищет как full_text, но группирует найденное по вопросам (только PostgreSQL).
+
+        Ранг вопроса — лучший ранг среди самого вопроса и его ответов.
+
+        return: Строки (question_id, text, created_at, rank, question_matched, answer_ids),
+            где answer_ids — найденные ответы вопроса по убыванию ранга (None, если их нет).
+        """
+        hits = cls._hits(query)
+        grouped = (
+            select(
+                hits.c.question_id,
+                func.max(hits.c.rank).label("rank"),
+                func.bool_or(hits.c.kind == "question").label("question_matched"),
+                func.array_agg(aggregate_order_by(hits.c.id, hits.c.rank.desc(), hits.c.id))
+                .filter(hits.c.kind == "answer")
+                .label("answer_ids"),
+            )
+            .group_by(hits.c.question_id)
+            .subquery("grouped")
+        )
+        question = QuestionModels
+        result = await session.execute(
+            select(
+                question.id.label("question_id"),
+                question.text,
+                question.created_at,
+                grouped.c.rank,
+                grouped.c.question_matched,
+                grouped.c.answer_ids,
+            )
+            .join(grouped, question.id == grouped.c.question_id)
+            .order_by(grouped.c.rank.desc(), question.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return list(result.all())
+
+    @staticmethod
+    async def documents(keys: Iterable[tuple[str, int]], session: AsyncSession) -> dict[tuple[str, int], Row]:
+        """
+        Загружает найденные документы по ключам (вид, ID) — не больше двух запросов.
+
+        return: Словарь (вид, ID) -> строка (id, question_id, text, created_at);
+            документов, которых уже нет в базе, в словаре нет.
+        """
+        ids = {"question": [], "answer": []}
+        for kind, id in keys:
+            ids[kind].append(id)
+        found = {}
+        if ids["question"]:
+            question = QuestionModels
+            result = await session.execute(
+                select(question.id, question.id.label("question_id"), question.text, question.created_at)
+                .where(question.id.in_(ids["question"]))
+            )
+            found.update((("question", row.id), row) for row in result)
+        if ids["answer"]:
+            answer = AnswerModels
+            result = await session.execute(
+                select(answer.id, answer.question_id, answer.text, answer.created_at)
+                .where(answer.id.in_(ids["answer"]))
+            )
+            found.update((("answer", row.id), row) for row in result)
+        return found
+
+    @staticmethod
+    async def questions(ids: Iterable[int], session: AsyncSession) -> dict[int, Row]:
+        """Загружает вопросы (id, text, created_at) по списку ID одним запросом."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        question = QuestionModels
+        result = await session.execute(
+            select(question.id, question.text, question.created_at).where(question.id.in_(ids))
+        )
+        return {row.id: row for row in result}
+
+    @staticmethod
+    async def stream_documents(session: AsyncSession, yield_per: int) -> AsyncResult:
+        """
+        Потоково читает все вопросы и ответы для построения индекса в памяти.
+
+        return: Строки (kind, id, question_id, text), не больше `yield_per` в памяти.
+        """
+        question = QuestionModels
+        answer = AnswerModels
+        query = union_all(
+            select(literal("question").label("kind"), question.id, question.id.label("question_id"), question.text),
+            select(literal("answer"), answer.id, answer.question_id, answer.text),
+        )
+        return await session.stream(query.execution_options(yield_per=yield_per))
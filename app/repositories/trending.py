@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import delete, select, Row
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+
+from app.database.models import AnswerModels, QuestionActivityModels
+
+UPSERT_CHUNK_SIZE = 1000
+
+
+class TrendingRepository:
+    """
+    Репозиторий свёртки активности вопросов (таблица question_activity).
+
+    Методы:
+    - apply(deltas: dict[tuple[int, int], int], removed: Iterable[int], since: int, session: AsyncSession) -> None
+    - buckets(since: int, session: AsyncSession) -> list[Row]
+    - stream_answers(since: datetime, session: AsyncSession, yield_per: int) -> AsyncResult
+    """
+
+    model = QuestionActivityModels
+
+    @classmethod
+    def _insert(cls, session: AsyncSession):
+        # INSERT ... ON CONFLICT есть только в диалектных insert: Postgres в работе, SQLite в тестах.
+        dialect = postgresql if session.bind.dialect.name == "postgresql" else sqlite
+        return dialect.insert(cls.model)
+
+    @classmethod
+    async def apply(
+        cls,
+        deltas: dict[tuple[int, int], int],
+        removed: Iterable[int],
+        since: int,
+        session: AsyncSession
+    ) -> None:
+        """
+        Прибавляет изменения счётчиков одной транзакцией.
+
+        Строки вставляются в порядке первичного ключа, чтобы воркеры,
+        сбрасывающие изменения одновременно, не ждали друг друга по кругу.
+
+        deltas: (question_id, bucket_start) -> на сколько изменилось число ответов.
+        removed: ID удалённых вопросов (их строки удаляются).
+        since: Строки с bucket_start меньше этого значения удаляются как устаревшие.
+        session: Активная асинхронная сессия SQLAlchemy.
+        """
+        rows = [
+            {"question_id": question_id, "bucket_start": bucket_start, "answers": delta}
+            for (question_id, bucket_start), delta in sorted(deltas.items()) if delta
+        ]
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            statement = cls._insert(session).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            await session.execute(statement.on_conflict_do_update(
+                index_elements=[cls.model.question_id, cls.model.bucket_start],
+                set_={"answers": cls.model.answers + statement.excluded.answers},
+            ))
+        removed = list(removed)
+        if removed:
+            await session.execute(delete(cls.model).where(cls.model.question_id.in_(removed)))
+        await session.execute(delete(cls.model).where(cls.model.bucket_start < since))
+        await session.commit()
+
+    @classmethod
+    async def buckets(cls, since: int, session: AsyncSession) -> list[Row]:
+        """
+        Загружает ненулевые счётчики начиная с интервала `since`.
+
+        return: Строки (question_id, bucket_start, answers).
+        """
+        result = await session.execute(
+            select(cls.model.question_id, cls.model.bucket_start, cls.model.answers)
+            .where(cls.model.bucket_start >= since, cls.model.answers != 0)
+        )
+        return result.all()
+
+    @staticmethod
+    async def stream_answers(since: datetime, session: AsyncSession, yield_per: int) -> AsyncResult:
+        """
+        Потоково читает (question_id, created_at) ответов, созданных начиная с `since`.
+
+        Нужен только для начального заполнения свёртки (app.commands.backfill_trending).
+        """
+        answer = AnswerModels
+        query = select(answer.question_id, answer.created_at).where(answer.created_at >= since)
+        return await session.stream(query.execution_options(yield_per=yield_per))
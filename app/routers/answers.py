@@ -1,13 +1,15 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends
+from typing import Annotated, Any
+from fastapi import APIRouter, Body, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
-from app.database.models import AnswerModels
-from app.schemas.answers import AnswerSchemas, AnswerResponse
+from app.config import settings
+from app.schemas.answers import AnswerSchemas, AnswerResponse, AnswerBatchResponse
 from app.database.database import database
 from app.use_cases.answers.create_answer import CreateAnswerUseCase
+from app.use_cases.answers.bulk_create_answers import BulkCreateAnswersUseCase
 from app.use_cases.answers.get_answer import GetAnswerUseCase
+from app.use_cases.answers.get_answers_by_ids import GetAnswersByIdsUseCase
 from app.use_cases.answers.delete_answer import DeleteAnswerUseCase
 
 router = APIRouter(tags=["Answers"])
@@ -24,15 +26,47 @@ async def add_answer(id: int,
     return await CreateAnswerUseCase.execute(id, data, session)
 
 
+@router.post(
+    '/questions/{id}/answers/bulk',
+    summary='добавить ответы к вопросу пачкой',
+    )
+async def add_answers_bulk(id: int,
+                           items: Annotated[list[Any], Body()],
+                           session: AsyncSession = Depends(database.get_session)
+                           ) -> dict:
+    return await BulkCreateAnswersUseCase.execute(id, items, session)
+
+
+@router.get(
+    '/answers',
+    summary='получить ответы по списку ID (ids=1,2,3)',
+    response_model=AnswerBatchResponse
+    )
+async def get_answers(ids: str = Query(..., description="ID ответов через запятую"),
+                      session: AsyncSession = Depends(database.get_read_session)
+                      ) -> Response:
+    body = await GetAnswersByIdsUseCase.execute(ids, session)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={settings.HTTP_ANSWER_MAX_AGE}"},
+    )
+
+
 @router.get(
     '/answers/{id}',
     summary='получить конкретный ответ',
     response_model=AnswerResponse
     )
 async def get_answer(id: int,
-                     session: AsyncSession = Depends(database.get_session)
-                     ) -> AnswerModels:
-    return await GetAnswerUseCase.execute(id, session)
+                     session: AsyncSession = Depends(database.get_read_session)
+                     ) -> Response:
+    body = await GetAnswerUseCase.execute(id, session)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={settings.HTTP_ANSWER_MAX_AGE}"},
+    )
 
 
 @router.delete(
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.database import database
+from app.use_cases.export.export_questions import ExportQuestionsUseCase
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+
+@router.get(
+    '/questions.ndjson',
+    summary='выгрузка всех вопросов с ответами (NDJSON, потоково)',
+)
+async def export_questions_ndjson(session: AsyncSession = Depends(database.get_read_session)
+                                  ) -> StreamingResponse:
+    return StreamingResponse(
+        ExportQuestionsUseCase.execute(session, settings.EXPORT_CHUNK_SIZE, settings.EXPORT_YIELD_PER),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get(
+    '/questions.json',
+    summary='выгрузка всех вопросов с ответами (JSON-массив, потоково)',
+)
+async def export_questions_json(session: AsyncSession = Depends(database.get_read_session)
+                                ) -> StreamingResponse:
+    return StreamingResponse(
+        ExportQuestionsUseCase.execute(
+            session, settings.EXPORT_CHUNK_SIZE, settings.EXPORT_YIELD_PER, json_array=True
+        ),
+        media_type="application/json",
+    )
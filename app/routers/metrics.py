@@ -0,0 +1,205 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.admission.limits import load_shedder, rate_limiter
+from app.batching.answers import answer_batcher
+from app.cache.cache import cache
+from app.database.database import database
+from app.events.bus import bus
+from app.idempotency.store import idempotency_store
+from app.logs.logger import queue_handler
+from app.monitoring.metrics import Collected, registry
+from app.trending.leaderboard import trending
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+registry.register(Collected(
+    "db_pool_checked_out",
+    "Соединений пула, выданных в данный момент.",
+    lambda: [((name,), engine.pool.checkedout()) for name, engine, _ in database.pools()],
+    ("pool",),
+))
+registry.register(Collected(
+    "db_pool_checkouts_total",
+    "Всего выдач соединения из пула.",
+    lambda: [((name,), metrics.checkouts) for name, _, metrics in database.pools()],
+    ("pool",),
+    "counter",
+))
+registry.register(Collected(
+    "db_pool_wait_seconds_total",
+    "Суммарное ожидание соединения из пула.",
+    lambda: [((name,), metrics.wait_total) for name, _, metrics in database.pools()],
+    ("pool",),
+    "counter",
+))
+registry.register(Collected(
+    "db_pool_timeouts_total",
+    "Отказов по таймауту ожидания соединения.",
+    lambda: [((name,), metrics.timeouts) for name, _, metrics in database.pools()],
+    ("pool",),
+    "counter",
+))
+registry.register(Collected(
+    "cache_requests_total",
+    "Обращения к кэшу по результату.",
+    lambda: [(("hit",), cache.hits), (("miss",), cache.misses)],
+    ("result",),
+    "counter",
+))
+registry.register(Collected(
+    "log_records_dropped_total",
+    "Записей лога, отброшенных из-за переполнения очереди.",
+    lambda: [((), queue_handler.dropped)],
+    (),
+    "counter",
+))
+
+registry.register(Collected(
+    "answer_batches_total",
+    "Пачек ответов, записанных одной транзакцией (group commit).",
+    lambda: [((), answer_batcher.batches)],
+    (),
+    "counter",
+))
+registry.register(Collected(
+    "answer_batch_items_total",
+    "Ответов, записанных в составе пачек.",
+    lambda: [((), answer_batcher.items)],
+    (),
+    "counter",
+))
+registry.register(Collected(
+    "events_subscribers",
+    "Открытых подписок на события (SSE).",
+    lambda: [((), bus.subscribers)],
+))
+registry.register(Collected(
+    "events_overflows_total",
+    "Подписок, закрытых из-за переполнения очереди медленного клиента.",
+    lambda: [((), bus.overflows)],
+    (),
+    "counter",
+))
+registry.register(Collected(
+    "idempotency_requests_total",
+    "Запросов с Idempotency-Key, обработанных без выполнения, по результату.",
+    lambda: [
+        (("replayed",), idempotency_store.replays),
+        (("conflict",), idempotency_store.conflicts),
+        (("mismatch",), idempotency_store.mismatches),
+    ],
+    ("result",),
+    "counter",
+))
+registry.register(Collected(
+    "admission_rejected_total",
+    "Запросов, отклонённых admission-контролем, по причине.",
+    lambda: [
+        (("rate_limit",), rate_limiter.limited),
+        *(((reason,), count) for reason, count in load_shedder.shed.items()),
+    ],
+    ("reason",),
+    "counter",
+))
+registry.register(Collected(
+    "admission_inflight",
+    "Одновременно выполняемых запросов (под контролем LoadShedder).",
+    lambda: [((), load_shedder.inflight)],
+))
+registry.register(Collected(
+    "db_pool_wait_recent_seconds",
+    "Недавнее (затухающее) ожидание соединения из пула.",
+    lambda: [((name,), metrics.recent_wait()) for name, _, metrics in database.pools()],
+    ("pool",),
+))
+
+registry.register(Collected(
+    "trending_questions",
+    "Вопросов с ответами в окне рейтинга.",
+    lambda: [((window,), count) for window, count in trending.stats()["questions"].items()],
+    ("window",),
+))
+registry.register(Collected(
+    "trending_sync_errors_total",
+    "Неудачных синхронизаций рейтинга вопросов со свёрткой в базе.",
+    lambda: [((), trending.sync_errors)],
+    (),
+    "counter",
+))
+
+
+@router.get(
+    '',
+    summary='все метрики в формате Prometheus',
+    response_class=PlainTextResponse,
+)
+async def get_prometheus_metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get(
+    '/cache',
+    summary='счётчики кэша (попадания, промахи, вытеснения)',
+)
+async def get_cache_metrics() -> dict:
+    return cache.stats()
+
+
+@router.get(
+    '/pool',
+    summary='состояние пула соединений и время ожидания соединения',
+)
+async def get_pool_metrics() -> dict:
+    return database.pool_stats()
+
+
+@router.get(
+    '/logging',
+    summary='счётчики очереди логов (в том числе отброшенные записи)',
+)
+async def get_logging_metrics() -> dict:
+    return queue_handler.stats()
+
+
+@router.get(
+    '/events',
+    summary='счётчики шины событий (подписки, доставка, переполнения)',
+)
+async def get_events_metrics() -> dict:
+    return bus.stats()
+
+
+@router.get(
+    '/batching',
+    summary='счётчики групповой записи ответов',
+)
+async def get_batching_metrics() -> dict:
+    return answer_batcher.stats()
+
+
+@router.get(
+    '/idempotency',
+    summary='счётчики повторов запросов с Idempotency-Key',
+)
+async def get_idempotency_metrics() -> dict:
+    return idempotency_store.stats()
+
+
+@router.get(
+    '/admission',
+    summary='счётчики ограничения частоты и сброса нагрузки',
+)
+async def get_admission_metrics() -> dict:
+    return {"rate_limit": rate_limiter.stats(), "load_shedding": load_shedder.stats()}
+
+
+@router.get(
+    '/trending',
+    summary='размер рейтинга вопросов и счётчики его синхронизации',
+)
+async def get_trending_metrics() -> dict:
+    return trending.stats()
@@ -1,27 +1,48 @@
-from typing import Annotated, List
-from fastapi import APIRouter, Depends
+from typing import Annotated, Any, Literal, Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
+from starlette.background import BackgroundTask
 
+from app.config import settings
 from app.database.database import database
-from app.database.models import QuestionModels
-from app.schemas.questions import QuestionSchemas, QuestionIDResponse, QuestionAllResponse
+from app.events.bus import bus
+from app.schemas.questions import (
+    QuestionSchemas, QuestionIDResponse, QuestionPageResponse, QuestionTrendingResponse, QuestionBatchResponse
+)
 from app.use_cases.questions.get_question import GetQuestionUseCase
 from app.use_cases.questions.get_all_questions import GetAllQuestionsUseCase
+from app.use_cases.questions.get_questions_by_ids import GetQuestionsByIdsUseCase
+from app.use_cases.questions.get_trending_questions import GetTrendingQuestionsUseCase
 from app.use_cases.questions.add_questions import CreateQuestionUseCase
+from app.use_cases.questions.bulk_add_questions import BulkCreateQuestionsUseCase
 from app.use_cases.questions.delete_question import DeleteQuestionUseCase
+from app.use_cases.questions.subscribe_question import SubscribeQuestionUseCase
 
 router = APIRouter(prefix="/questions", tags=["Questions"])
 
 
 @router.get(
     '/',
-    summary='список всех вопросов',
-    response_model=List[QuestionAllResponse]
+    summary='список вопросов (постранично) или вопросы по списку ID (ids=1,2,3)',
+    response_model=QuestionPageResponse | QuestionBatchResponse
 )
-async def get_all_questions(session: AsyncSession = Depends(database.get_session)
-                            ) -> list[QuestionModels]:
-    return await GetAllQuestionsUseCase.execute(session)
+async def get_all_questions(limit: int = Query(50, ge=1, le=500),
+                            cursor: Optional[str] = None,
+                            sort: Literal["created", "most_answered", "recent_activity"] = "created",
+                            ids: Optional[str] = Query(None, description="ID вопросов через запятую"),
+                            session: AsyncSession = Depends(database.get_read_session)
+                            ) -> Response:
+    if ids is not None:
+        body = await GetQuestionsByIdsUseCase.execute(ids, session)
+    else:
+        body = await GetAllQuestionsUseCase.execute(session, limit, cursor, sort)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={settings.HTTP_QUESTIONS_MAX_AGE}"},
+    )
 
 
 @router.post(
@@ -34,15 +55,70 @@ async def add_questions(question_data: Annotated[QuestionSchemas, Depends()],
     return await CreateQuestionUseCase.execute(question_data, session)
 
 
+@router.post(
+    '/bulk',
+    summary='создать вопросы пачкой',
+)
+async def add_questions_bulk(items: Annotated[list[Any], Body()],
+                             session: AsyncSession = Depends(database.get_session)
+                             ) -> dict:
+    return await BulkCreateQuestionsUseCase.execute(items, session)
+
+
+# Объявлен раньше '/{id}': иначе "trending" сопоставится с ID вопроса и получит 422.
+@router.get(
+    '/trending',
+    summary='вопросы с наибольшим числом новых ответов за окно (1h, 24h, 7d)',
+    response_model=QuestionTrendingResponse
+)
+async def get_trending_questions(window: Literal["1h", "24h", "7d"] = "24h",
+                                 limit: int = Query(20, ge=1),
+                                 session: AsyncSession = Depends(database.get_read_session)
+                                 ) -> Response:
+    # Граница проверяется здесь, а не в Query: TRENDING_TOP_K задаётся create_app после импорта.
+    if limit > settings.TRENDING_TOP_K:
+        raise HTTPException(status_code=422, detail=f"limit: не больше {settings.TRENDING_TOP_K}")
+    body = await GetTrendingQuestionsUseCase.execute(window, limit, session)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": f"public, max-age={settings.HTTP_QUESTIONS_MAX_AGE}"},
+    )
+
+
 @router.get(
     '/{id}',
-    summary='получить вопрос и все ответы на него',
+    summary='получить вопрос и страницу ответов на него',
     response_model=QuestionIDResponse
 )
 async def get_question(id: int,
-                       session: AsyncSession = Depends(database.get_session)
-                       ) -> QuestionModels:
-    return await GetQuestionUseCase.execute(id, session)
+                       answers_limit: int = Query(50, ge=1, le=500),
+                       answers_cursor: Optional[str] = None,
+                       if_none_match: Optional[str] = Header(None),
+                       if_modified_since: Optional[str] = Header(None),
+                       session: AsyncSession = Depends(database.get_read_session)
+                       ) -> Response:
+    body, headers = await GetQuestionUseCase.execute(
+        id, session, answers_limit, answers_cursor, if_none_match, if_modified_since
+    )
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    '/{id}/events',
+    summary='поток новых и удалённых ответов вопроса (Server-Sent Events)',
+)
+async def question_events(id: int,
+                          session: AsyncSession = Depends(database.get_read_session)
+                          ) -> StreamingResponse:
+    subscription = await SubscribeQuestionUseCase.execute(id, session)
+    return StreamingResponse(
+        SubscribeQuestionUseCase.stream(subscription, settings.EVENTS_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Если поток так и не начался (клиент ушёл сразу), подписку снимает фоновая задача.
+        background=BackgroundTask(bus.unsubscribe, subscription),
+    )
 
 
 @router.delete(
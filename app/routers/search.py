@@ -0,0 +1,24 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import database
+from app.schemas.search import SearchGroupPageResponse, SearchPageResponse
+from app.use_cases.search.search import SearchUseCase
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get(
+    '',
+    summary='полнотекстовый поиск по вопросам и ответам (постранично, по рангу)',
+    response_model=SearchPageResponse | SearchGroupPageResponse
+)
+async def search(q: str = Query(..., min_length=1, max_length=255),
+                 limit: int = Query(20, ge=1, le=100),
+                 cursor: Optional[str] = None,
+                 group: bool = False,
+                 session: AsyncSession = Depends(database.get_read_session)
+                 ) -> Response:
+    body = await SearchUseCase.execute(q, session, limit, cursor, group)
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,37 @@
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from app.database.database import database
+from app.schemas.answers import AnswerPageResponse
+from app.use_cases.users.delete_user_answers import DeleteUserAnswersUseCase
+from app.use_cases.users.get_user_answers import GetUserAnswersUseCase
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+
+@router.get(
+    '/{user_id}/answers',
+    summary='ответы пользователя, новые первыми (постранично)',
+    response_model=AnswerPageResponse
+)
+async def get_user_answers(user_id: uuid.UUID,
+                           limit: int = Query(50, ge=1, le=500),
+                           cursor: Optional[str] = None,
+                           session: AsyncSession = Depends(database.get_read_session)
+                           ) -> Response:
+    body = await GetUserAnswersUseCase.execute(user_id, session, limit, cursor)
+    return Response(content=body, media_type="application/json")
+
+
+@router.delete(
+    '/{user_id}/answers',
+    summary='удалить все ответы пользователя (пачками)',
+    status_code=status.HTTP_200_OK
+)
+async def delete_user_answers(user_id: uuid.UUID,
+                              session: AsyncSession = Depends(database.get_session)
+                              ) -> dict:
+    return await DeleteUserAnswersUseCase.execute(user_id, session)
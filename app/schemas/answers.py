@@ -1,8 +1,9 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
 
 
 class AnswerSchemas(BaseModel):
@@ -20,3 +21,45 @@ class AnswerResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AnswerPageResponse(BaseModel):
+    items: List[AnswerResponse]
+    next_cursor: Optional[str] = None
+
+
+class AnswerBatchItem(BaseModel):
+    id: int
+    found: bool
+    answer: Optional[AnswerResponse] = None
+
+
+class AnswerBatchResponse(BaseModel):
+    items: List[AnswerBatchItem]
+
+
+class AnswerRow(TypedDict):
+    """Ответ в виде словаря из колонок строки (поля и порядок как у AnswerResponse)."""
+    id: int
+    question_id: int
+    user_id: UUID
+    text: str
+    created_at: datetime
+
+
+class AnswerPageRow(TypedDict):
+    items: List[AnswerRow]
+    next_cursor: Optional[str]
+
+
+class AnswerBatchItemRow(TypedDict):
+    id: int
+    found: bool
+    answer: Optional[AnswerRow]
+
+
+class AnswerBatchRow(TypedDict):
+    items: List[AnswerBatchItemRow]
+
+
+answer_json = TypeAdapter(AnswerRow)
+answer_page_json = TypeAdapter(AnswerPageRow)
+answer_batch_json = TypeAdapter(AnswerBatchRow)
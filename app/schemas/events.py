@@ -0,0 +1,24 @@
+from typing import Literal
+
+from pydantic import TypeAdapter
+from typing_extensions import NotRequired, TypedDict
+
+from app.schemas.answers import AnswerRow
+
+
+class QuestionEvent(TypedDict):
+    """
+    Событие об ответах вопроса (поле data в потоке SSE /questions/{id}/events).
+
+    - answer_created: создан ответ, он целиком в `answer`;
+    - answers_created: ответы созданы пачкой, их ID в `ids`;
+    - answer_deleted: удалён ответ, его ID в `ids`;
+    - question_deleted: вопрос удалён вместе с ответами.
+    """
+    type: Literal["answer_created", "answers_created", "answer_deleted", "question_deleted"]
+    question_id: int
+    answer: NotRequired[AnswerRow]
+    ids: NotRequired[list[int]]
+
+
+question_event_json = TypeAdapter(QuestionEvent)
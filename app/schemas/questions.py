@@ -1,9 +1,10 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
 
-from app.schemas.answers import AnswerResponse
+from app.schemas.answers import AnswerResponse, AnswerRow
 
 
 class QuestionSchemas(BaseModel):
@@ -14,11 +15,84 @@ class QuestionAllResponse(BaseModel):
     id: int
     text: str
     created_at: datetime
+    answer_count: int = 0
+    last_answer_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class QuestionIDResponse(QuestionAllResponse):
     answers: List[AnswerResponse]
+    answers_next_cursor: Optional[str] = None
 
 
+class QuestionPageResponse(BaseModel):
+    items: List[QuestionAllResponse]
+    next_cursor: Optional[str] = None
+
+
+class TrendingQuestionResponse(QuestionAllResponse):
+    answers_in_window: int
+
+
+class QuestionTrendingResponse(BaseModel):
+    window: str
+    items: List[TrendingQuestionResponse]
+
+
+class QuestionBatchItem(BaseModel):
+    id: int
+    found: bool
+    question: Optional[QuestionAllResponse] = None
+
+
+class QuestionBatchResponse(BaseModel):
+    items: List[QuestionBatchItem]
+
+
+# Быстрый путь сериализации для чтения: строки из базы превращаются в словари
+# и сразу пишутся в JSON через TypeAdapter.dump_json, без ORM-объектов и без
+# повторной валидации через response_model. Поля и их порядок совпадают с
+# моделями выше, поэтому JSON получается тем же.
+
+class QuestionRow(TypedDict):
+    id: int
+    text: str
+    created_at: datetime
+    answer_count: int
+    last_answer_at: Optional[datetime]
+
+
+class QuestionPageRow(TypedDict):
+    items: List[QuestionRow]
+    next_cursor: Optional[str]
+
+
+class QuestionWithAnswersRow(QuestionRow):
+    answers: List[AnswerRow]
+    answers_next_cursor: Optional[str]
+
+
+class TrendingQuestionRow(QuestionRow):
+    answers_in_window: int
+
+
+class QuestionTrendingRow(TypedDict):
+    window: str
+    items: List[TrendingQuestionRow]
+
+
+class QuestionBatchItemRow(TypedDict):
+    id: int
+    found: bool
+    question: Optional[QuestionRow]
+
+
+class QuestionBatchRow(TypedDict):
+    items: List[QuestionBatchItemRow]
+
+
+question_page_json = TypeAdapter(QuestionPageRow)
+question_json = TypeAdapter(QuestionWithAnswersRow)
+question_trending_json = TypeAdapter(QuestionTrendingRow)
+question_batch_json = TypeAdapter(QuestionBatchRow)
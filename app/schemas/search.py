@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+
+class SearchHitResponse(BaseModel):
+    kind: Literal["question", "answer"]
+    id: int
+    question_id: int
+    text: str
+    created_at: datetime
+    rank: float
+
+
+class SearchPageResponse(BaseModel):
+    items: List[SearchHitResponse]
+    next_cursor: Optional[str] = None
+
+
+class SearchGroupResponse(BaseModel):
+    question_id: int
+    text: str
+    created_at: datetime
+    rank: float
+    question_matched: bool
+    answer_ids: List[int]
+
+
+class SearchGroupPageResponse(BaseModel):
+    items: List[SearchGroupResponse]
+    next_cursor: Optional[str] = None
+
+
+# Быстрый путь сериализации (см. app.schemas.questions): поля и порядок
+# совпадают с моделями выше.
+
+class SearchHitRow(TypedDict):
+    kind: str
+    id: int
+    question_id: int
+    text: str
+    created_at: datetime
+    rank: float
+
+
+class SearchGroupRow(TypedDict):
+    question_id: int
+    text: str
+    created_at: datetime
+    rank: float
+    question_matched: bool
+    answer_ids: List[int]
+
+
+class SearchPageRow(TypedDict):
+    items: List[SearchHitRow]
+    next_cursor: Optional[str]
+
+
+class SearchGroupPageRow(TypedDict):
+    items: List[SearchGroupRow]
+    next_cursor: Optional[str]
+
+
+search_page_json = TypeAdapter(SearchPageRow)
+search_group_page_json = TypeAdapter(SearchGroupPageRow)
@@ -0,0 +1,204 @@
+import heapq
+import math
+import re
+from collections import defaultdict
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.logs.logger import logger
+from app.repositories.search import SearchRepository
+
+QUESTION = "question"
+ANSWER = "answer"
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Разбивает текст на слова в нижнем регистре (ё приравнивается к е)."""
+    return _TOKEN.findall(text.lower().replace("ё", "е"))
+
+
+class Hit(NamedTuple):
+    """Найденный документ: вопрос или ответ."""
+    kind: str
+    id: int
+    question_id: int
+    rank: float
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс вопросов и ответов в памяти процесса.
+
+    Запасной вариант полнотекстового поиска для SQLite и тестов, где нет
+    tsvector/GIN. Для каждого слова хранится словарь документ -> число
+    вхождений; документ находится, если содержит все слова запроса, и
+    ранжируется по BM25. Стемминга нет: слово ищется только в той форме,
+    в которой написано.
+
+    Ключ документа — целое число (id << 1 | вид), чтобы на миллионе
+    документов не хранить кортежи. Индекс поддерживается use case'ами записи
+    (add_* / remove_*) и заполняется при старте (rebuild); при нескольких
+    воркерах у каждого свой индекс, поэтому в работе используется Postgres.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self) -> None:
+        # Поддерживать ли индекс при записи; включается после rebuild.
+        self.enabled = False
+        self._postings: defaultdict[str, dict[int, int]] = defaultdict(dict)
+        self._terms: dict[int, tuple[str, ...]] = {}
+        self._lengths: dict[int, int] = {}
+        self._questions: dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    @staticmethod
+    def _key(kind: str, id: int) -> int:
+        return id << 1 | (kind == ANSWER)
+
+    def _add(self, key: int, question_id: int, text: str) -> None:
+        self._remove(key)
+        tokens = tokenize(text)
+        counts: dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            self._postings[token][key] = count
+        self._terms[key] = tuple(counts)
+        self._lengths[key] = len(tokens)
+        self._questions[key] = question_id
+        self._total_length += len(tokens)
+
+    def _remove(self, key: int) -> None:
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            return
+        for token in terms:
+            postings = self._postings[token]
+            postings.pop(key, None)
+            if not postings:
+                del self._postings[token]
+        self._total_length -= self._lengths.pop(key)
+        del self._questions[key]
+
+    def add_question(self, id: int, text: str) -> None:
+        if self.enabled:
+            self._add(self._key(QUESTION, id), id, text)
+
+    def add_answer(self, id: int, question_id: int, text: str) -> None:
+        if self.enabled:
+            self._add(self._key(ANSWER, id), question_id, text)
+
+    def remove_answers(self, ids: Iterable[int]) -> None:
+        if self.enabled:
+            for id in ids:
+                self._remove(self._key(ANSWER, id))
+
+    def remove_question(self, id: int, answer_ids: Iterable[int]) -> None:
+        if self.enabled:
+            self._remove(self._key(QUESTION, id))
+            self.remove_answers(answer_ids)
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._terms.clear()
+        self._lengths.clear()
+        self._questions.clear()
+        self._total_length = 0
+
+    async def rebuild(self, session_factory: async_sessionmaker, yield_per: int) -> int:
+        """
+        Строит индекс заново по всем вопросам и ответам базы (потоково) и
+        включает его поддержку use case'ами записи.
+
+        session_factory: Фабрика сессий базы.
+        yield_per: Сколько строк забирать из курсора за раз.
+        return: Количество проиндексированных документов.
+        """
+        self.clear()
+        async with session_factory() as session:
+            rows = await SearchRepository.stream_documents(session, yield_per)
+            async for row in rows:
+                self._add(self._key(row.kind, row.id), row.question_id, row.text)
+        self.enabled = True
+        logger.info(f"Поисковый индекс в памяти построен: документов {len(self)}")
+        return len(self)
+
+    def search(self, query: str, limit: Optional[int] = None) -> list[Hit]:
+        """
+        Ищет документы, содержащие все слова запроса.
+
+        query: Текст запроса.
+        limit: Сколько лучших документов вернуть (None — все найденные).
+        return: Документы по убыванию ранга, при равном ранге — вопросы раньше ответов, затем по ID.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._terms:
+            return []
+        postings = sorted((self._postings.get(term, {}) for term in terms), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            candidates.intersection_update(other)
+            if not candidates:
+                return []
+
+        documents = len(self._terms)
+        average_length = self._total_length / documents or 1
+        weights = [
+            (entries, math.log(1 + (documents - len(entries) + 0.5) / (len(entries) + 0.5)))
+            for entries in postings
+        ]
+        scored = []
+        for key in candidates:
+            norm = self.K1 * (1 - self.B + self.B * self._lengths[key] / average_length)
+            score = 0.0
+            for entries, idf in weights:
+                tf = entries[key]
+                score += idf * tf * (self.K1 + 1) / (tf + norm)
+            scored.append((-score, key & 1, key >> 1, key))
+        best = heapq.nsmallest(limit, scored) if limit is not None else sorted(scored)
+        return [
+            Hit(ANSWER if is_answer else QUESTION, id, self._questions[key], -negative)
+            for negative, is_answer, id, key in best
+        ]
+
+
+def resolve_backend(backend: str, url: Optional[str]) -> str:
+    """
+    Выбирает реализацию поиска.
+
+    backend: "postgres", "memory" или "auto" (postgres для PostgreSQL, иначе memory).
+    url: URL базы SQLAlchemy.
+    """
+    if backend == "auto":
+        return "postgres" if url and make_url(url).get_backend_name() == "postgresql" else "memory"
+    if backend not in ("postgres", "memory"):
+        raise ValueError(f"Неизвестный бэкенд поиска: {backend}")
+    return backend
+
+
+def session_backend(session: AsyncSession) -> str:
+    """
+    Реализация поиска для сессии: по базе, с которой она работает, а не по URL
+    из настроек. SQL PostgreSQL (tsvector, websearch_to_tsquery) отправляется
+    только в PostgreSQL; на остальных базах — индекс в памяти.
+
+    session: Активная асинхронная сессия SQLAlchemy.
+    """
+    if session.bind.dialect.name != "postgresql":
+        return "memory"
+    return "memory" if settings.SEARCH_BACKEND == "memory" else "postgres"
+
+
+search_index = InvertedIndex()
@@ -0,0 +1,289 @@
+import asyncio
+import contextvars
+import heapq
+import math
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import Settings
+from app.logs.logger import logger
+from app.repositories.trending import TrendingRepository
+from app.utils.component import Component
+
+# Окна рейтинга: имя -> длина, секунды.
+WINDOWS = {"1h": 60 * 60, "24h": 24 * 60 * 60, "7d": 7 * 24 * 60 * 60}
+LONGEST = max(WINDOWS, key=WINDOWS.get)
+
+
+def timestamp(at: datetime) -> float:
+    """Unix time даты из базы (SQLite возвращает даты без часового пояса — это UTC)."""
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return at.timestamp()
+
+
+class TrendingLeaderboard:
+    """
+    Рейтинг вопросов по числу новых ответов за скользящие окна 1h, 24h и 7d.
+
+    Ответы считаются по интервалам (`bucket_seconds`): интервал -> вопрос -> число
+    ответов. Для каждого окна поддерживается сумма по вопросам: новый или
+    удалённый ответ меняет её за O(1), а когда интервал выходит за границу окна,
+    его счётчики вычитаются. Окно сдвигается целыми интервалами, поэтому «1h» —
+    это последние 3600 / bucket_seconds интервалов, включая текущий.
+
+    Лучшие `top_k` вопросов окна выбираются кучей (heapq.nlargest) не чаще
+    раза в `refresh_seconds` и только если суммы окна изменились; между
+    пересчётами чтение рейтинга — срез готового списка, O(limit).
+
+    Счётчики наполняются use case'ами записи ответов (record, remove_question).
+    При нескольких воркерах каждый раз в `sync_seconds` воркер прибавляет свои
+    изменения к свёртке в базе (таблица question_activity) и перечитывает её
+    целиком за последние 7 дней, так что рейтинг у всех воркеров сходится с
+    задержкой не больше `sync_seconds`. Таблица `answer` при этом не читается.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int,
+        top_k: int,
+        refresh_seconds: float,
+        sync_seconds: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.bucket_seconds = bucket_seconds
+        self.top_k = top_k
+        self.refresh_seconds = refresh_seconds
+        self.sync_seconds = sync_seconds
+        self.clock = clock
+        # Начало интервала -> ID вопроса -> ответов в интервале.
+        self._buckets: dict[int, dict[int, int]] = {}
+        self._counts: dict[str, dict[int, int]] = {window: {} for window in WINDOWS}
+        # Начало первого интервала, входящего в окно.
+        self._horizons = dict.fromkeys(WINDOWS, 0)
+        self._top: dict[str, list[tuple[int, int]]] = {window: [] for window in WINDOWS}
+        self._top_at = dict.fromkeys(WINDOWS, -math.inf)
+        self._dirty = set(WINDOWS)
+        # Изменения, ещё не сброшенные в базу: (ID вопроса, начало интервала) -> ответов.
+        self._pending: dict[tuple[int, int], int] = {}
+        self._removed: set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+        self.syncs = 0
+        self.sync_errors = 0
+        self.refreshes = 0
+
+    def _bucket(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds) * self.bucket_seconds
+
+    @staticmethod
+    def _add_count(counts: dict[int, int], question_id: int, delta: int) -> None:
+        value = counts.get(question_id, 0) + delta
+        if value:
+            counts[question_id] = value
+        else:
+            counts.pop(question_id, None)
+
+    def _advance(self, now: float) -> None:
+        """Сдвигает окна к текущему интервалу, вычитая вышедшие из них интервалы."""
+        current = self._bucket(now)
+        for window, span in WINDOWS.items():
+            horizon = current - span + self.bucket_seconds
+            previous = self._horizons[window]
+            if horizon <= previous:
+                continue
+            self._horizons[window] = horizon
+            counts = self._counts[window]
+            for bucket_start, questions in self._buckets.items():
+                if previous <= bucket_start < horizon:
+                    for question_id, answers in questions.items():
+                        self._add_count(counts, question_id, -answers)
+            self._dirty.add(window)
+        oldest = self._horizons[LONGEST]
+        for bucket_start in [bucket_start for bucket_start in self._buckets if bucket_start < oldest]:
+            del self._buckets[bucket_start]
+
+    def _bump(self, question_id: int, bucket_start: int, delta: int) -> None:
+        questions = self._buckets.setdefault(bucket_start, {})
+        self._add_count(questions, question_id, delta)
+        if not questions:
+            del self._buckets[bucket_start]
+        for window, horizon in self._horizons.items():
+            if bucket_start >= horizon:
+                self._add_count(self._counts[window], question_id, delta)
+                self._dirty.add(window)
+
+    def record(self, question_id: int, at: Optional[datetime] = None, delta: int = 1) -> None:
+        """
+        Учитывает созданные (delta > 0) или удалённые (delta < 0) ответы вопроса.
+
+        question_id: ID вопроса.
+        at: Дата создания ответов (None — сейчас). Ответы старше 7 дней не учитываются.
+        delta: Сколько ответов добавилось.
+        """
+        now = self.clock()
+        self._advance(now)
+        bucket_start = self._bucket(timestamp(at) if at is not None else now)
+        if bucket_start < self._horizons[LONGEST]:
+            return
+        self._bump(question_id, bucket_start, delta)
+        key = (question_id, bucket_start)
+        self._add_count(self._pending, key, delta)
+
+    def remove_question(self, question_id: int) -> None:
+        """Убирает удалённый вопрос из рейтинга (и из свёртки при следующей синхронизации)."""
+        for bucket_start in list(self._buckets):
+            questions = self._buckets[bucket_start]
+            questions.pop(question_id, None)
+            if not questions:
+                del self._buckets[bucket_start]
+        for window, counts in self._counts.items():
+            if counts.pop(question_id, None) is not None:
+                self._dirty.add(window)
+        self._pending = {key: delta for key, delta in self._pending.items() if key[0] != question_id}
+        self._removed.add(question_id)
+
+    def top(self, window: str, limit: int) -> list[tuple[int, int]]:
+        """
+        Лучшие вопросы окна.
+
+        window: "1h", "24h" или "7d".
+        limit: Сколько вопросов вернуть (не больше top_k).
+        return: Пары (ID вопроса, ответов за окно) по убыванию числа ответов,
+            при равенстве — сначала более новые вопросы (больший ID).
+        """
+        now = self.clock()
+        self._advance(now)
+        if window in self._dirty and now - self._top_at[window] >= self.refresh_seconds:
+            counts = self._counts[window]
+            self._top[window] = heapq.nlargest(
+                self.top_k,
+                ((answers, question_id) for question_id, answers in counts.items() if answers > 0),
+            )
+            self._dirty.discard(window)
+            self._top_at[window] = now
+            self.refreshes += 1
+        return [(question_id, answers) for answers, question_id in self._top[window][:limit]]
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        for counts in self._counts.values():
+            counts.clear()
+        self._horizons = dict.fromkeys(WINDOWS, 0)
+        self._pending.clear()
+        self._removed.clear()
+        self._dirty = set(WINDOWS)
+        self._top_at = dict.fromkeys(WINDOWS, -math.inf)
+
+    def _load(self, rows) -> None:
+        """Заменяет счётчики свёрткой из базы и ещё не сброшенными изменениями процесса."""
+        buckets: dict[int, dict[int, int]] = {}
+        for row in rows:
+            buckets.setdefault(row.bucket_start, {})[row.question_id] = row.answers
+        # Изменения, сделанные, пока шла синхронизация, в базу ещё не попали.
+        for (question_id, bucket_start), delta in self._pending.items():
+            questions = buckets.setdefault(bucket_start, {})
+            self._add_count(questions, question_id, delta)
+        for questions in buckets.values():
+            for question_id in self._removed:
+                questions.pop(question_id, None)
+        self._advance(self.clock())
+        oldest = self._horizons[LONGEST]
+        self._buckets = {
+            bucket_start: questions for bucket_start, questions in buckets.items()
+            if questions and bucket_start >= oldest
+        }
+        for window, horizon in self._horizons.items():
+            counts: dict[int, int] = {}
+            for bucket_start, questions in self._buckets.items():
+                if bucket_start >= horizon:
+                    for question_id, answers in questions.items():
+                        self._add_count(counts, question_id, answers)
+            self._counts[window] = counts
+        self._dirty = set(WINDOWS)
+
+    async def sync(self, session_factory: async_sessionmaker) -> None:
+        """
+        Сбрасывает изменения процесса в свёртку и перечитывает её.
+
+        Если записать изменения не удалось, они остаются в процессе до следующей попытки.
+
+        session_factory: Фабрика сессий основной базы.
+        """
+        self._advance(self.clock())
+        since = self._horizons[LONGEST]
+        pending, self._pending = self._pending, {}
+        removed, self._removed = self._removed, set()
+        try:
+            async with session_factory() as session:
+                await TrendingRepository.apply(pending, removed, since, session)
+        except BaseException:
+            self._removed |= removed
+            for key, delta in pending.items():
+                if key[0] not in self._removed:
+                    self._add_count(self._pending, key, delta)
+            raise
+        async with session_factory() as session:
+            rows = await TrendingRepository.buckets(since, session)
+        self._load(rows)
+        self.syncs += 1
+
+    async def _run(self, session_factory: async_sessionmaker) -> None:
+        while True:
+            await asyncio.sleep(self.sync_seconds)
+            try:
+                await self.sync(session_factory)
+            except Exception as e:
+                self.sync_errors += 1
+                logger.warning(f"Не удалось синхронизировать рейтинг вопросов: {e}")
+
+    async def start(self, session_factory: async_sessionmaker) -> None:
+        """Запускает периодическую синхронизацию и загружает рейтинг из базы."""
+        if self._task is None:
+            # Новый контекст: иначе задача унаследует метрики запроса, который её запустил.
+            self._task = asyncio.create_task(self._run(session_factory), context=contextvars.Context())
+        await self.sync(session_factory)
+        logger.info(f"Рейтинг вопросов загружен: интервалов {len(self._buckets)}")
+
+    async def stop(self, session_factory: async_sessionmaker) -> None:
+        """Останавливает синхронизацию и сбрасывает оставшиеся изменения в базу."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._pending or self._removed:
+            try:
+                await self.sync(session_factory)
+            except Exception as e:
+                logger.warning(f"Изменения рейтинга вопросов не сохранены при остановке: {e}")
+
+    def stats(self) -> dict:
+        """Размер рейтинга и счётчики синхронизации."""
+        return {
+            "questions": {window: len(counts) for window, counts in self._counts.items()},
+            "buckets": len(self._buckets),
+            "pending": len(self._pending),
+            "syncs": self.syncs,
+            "sync_errors": self.sync_errors,
+            "refreshes": self.refreshes,
+            "bucket_seconds": self.bucket_seconds,
+            "top_k": self.top_k,
+        }
+
+
+def trending_from_settings(settings: Settings) -> TrendingLeaderboard:
+    return TrendingLeaderboard(
+        bucket_seconds=settings.TRENDING_BUCKET_SECONDS,
+        top_k=settings.TRENDING_TOP_K,
+        refresh_seconds=settings.TRENDING_REFRESH_SECONDS,
+        sync_seconds=settings.TRENDING_SYNC_SECONDS,
+    )
+
+
+trending: Component[TrendingLeaderboard] = Component(trending_from_settings)
@@ -0,0 +1,52 @@
+import uuid
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache import cache, question_key
+from app.config import settings
+from app.events.bus import publish, question_channel
+from app.logs.logger import logger
+from app.repositories.answers import AnswerRepository
+from app.schemas.answers import AnswerSchemas
+from app.schemas.events import question_event_json
+from app.search.index import search_index
+from app.trending.leaderboard import trending
+from app.utils.validation import validate_items
+
+
+class BulkCreateAnswersUseCase:
+    """
+       Use case для пакетного добавления ответов к вопросу.
+
+       Логика:
+       - Валидирует каждый элемент отдельно и возвращает ошибки с индексами элементов.
+       - Генерирует UUID пользователя для элементов, где он не передан.
+       - Сохраняет ответы и статистику вопроса одной транзакцией (404, если вопроса нет).
+       - Обновляет поисковый индекс в памяти (если он используется) и рейтинг вопросов.
+       - Инвалидирует кэш вопроса и публикует событие answers_created с ID ответов.
+       - Возвращает ID ответов в порядке элементов запроса.
+    """
+
+    @staticmethod
+    async def execute(question_id: int, items: list[Any], session: AsyncSession) -> dict:
+        answers = validate_items(AnswerSchemas, items, settings.BULK_MAX_ITEMS)
+        ids = await AnswerRepository.create_answers_bulk(
+            question_id,
+            [{"text": answer.text, "user_id": answer.user_id or uuid.uuid4()} for answer in answers],
+            session,
+            settings.BULK_CHUNK_SIZE,
+        )
+        if ids is None:
+            logger.warning(f"Попытка добавить ответы к несуществующему вопросу ID {question_id}")
+            raise HTTPException(status_code=404, detail="Вопрос не найден")
+        for id, answer in zip(ids, answers):
+            search_index.add_answer(id, question_id, answer.text)
+        trending.record(question_id, delta=len(ids))
+        await cache.delete(question_key(question_id))
+        await publish(question_channel(question_id), question_event_json.dump_json({
+            "type": "answers_created", "question_id": question_id, "ids": ids,
+        }))
+        logger.info(f"Пакетно создано ответов: {len(ids)} для вопроса {question_id}")
+        return {"message": "Ответы добавлены", "ids": ids}
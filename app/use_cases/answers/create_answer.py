@@ -3,10 +3,16 @@ import uuid
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.batching.answers import answer_batcher
+from app.cache.cache import cache, question_key
+from app.config import settings
+from app.events.bus import publish, question_channel
 from app.logs.logger import logger
 from app.repositories.answers import AnswerRepository
-from app.repositories.questions import QuestionRepository
 from app.schemas.answers import AnswerSchemas
+from app.schemas.events import question_event_json
+from app.search.index import search_index
+from app.trending.leaderboard import trending
 
 
 class CreateAnswerUseCase:
@@ -14,26 +20,46 @@ class CreateAnswerUseCase:
        Use case для создания ответа на вопрос.
 
        Логика:
-       - Проверяет существование вопроса.
        - Генерирует UUID пользователя, если он не передан.
-       - Создаёт ответ через репозиторий.
+       - Создаёт ответ через репозиторий; в той же транзакции обновляются счётчик
+         ответов и дата последнего ответа вопроса (404, если вопроса нет).
+         При ANSWER_BATCH_ENABLED ответ пишется не своей транзакцией, а в общей
+         пачке с ответами других запросов (answer_batcher, group commit);
+         404 при этом получает только запрос к несуществующему вопросу.
+       - Обновляет поисковый индекс в памяти (если он используется) и рейтинг вопросов.
+       - Инвалидирует кэш вопроса и публикует событие answer_created подписчикам вопроса.
        - Возвращает словарь с результатом создания
     """
 
     @staticmethod
     async def execute(question_id: int, data: AnswerSchemas, session: AsyncSession) -> dict:
-        question = await QuestionRepository.get_question_by_id(question_id, session)
-        if question is None:
+        user_id = data.user_id or uuid.uuid4()
+        if settings.ANSWER_BATCH_ENABLED:
+            answer = await answer_batcher.submit(question_id, data.text, user_id, session)
+        else:
+            answer = await AnswerRepository.create_answer(
+                question_id=question_id,
+                text=data.text,
+                user_id=user_id,
+                session=session
+            )
+        if answer is None:
             logger.warning(f"Попытка добавить ответ к несуществующему вопросу ID {question_id}")
             raise HTTPException(status_code=404, detail="Вопрос не найден")
-
-        user_id = data.user_id or str(uuid.uuid4())
-        answer = await AnswerRepository.create_answer(
-            question_id=question_id,
-            text=data.text,
-            user_id=user_id,
-            session=session
-        )
+        search_index.add_answer(answer.id, question_id, data.text)
+        trending.record(question_id, answer.created_at)
+        await cache.delete(question_key(question_id))
+        await publish(question_channel(question_id), question_event_json.dump_json({
+            "type": "answer_created",
+            "question_id": question_id,
+            "answer": {
+                "id": answer.id,
+                "question_id": question_id,
+                "user_id": user_id,
+                "text": data.text,
+                "created_at": answer.created_at,
+            },
+        }))
         logger.info(f"Создан ответ с ID {answer.id} для вопроса {question_id}")
         return {"message": "Ответ добавлен", "id": answer.id}
 
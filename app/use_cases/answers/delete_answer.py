@@ -1,6 +1,12 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache import cache, answer_key, question_key
+from app.events.bus import publish, question_channel
 from app.repositories.answers import AnswerRepository
+from app.schemas.events import question_event_json
+from app.search.index import search_index
+from app.trending.leaderboard import trending
 
 
 class DeleteAnswerUseCase:
@@ -8,14 +14,22 @@ class DeleteAnswerUseCase:
     Use case для удаления ответа.
 
     Логика:
-    - Проверяет существование ответа.
-    - Выполняет удаление ответа через репозиторий.
+    - Удаляет ответ через репозиторий одним запросом (DELETE ... RETURNING).
+    - Если ничего не удалено — ответа не было, возвращает 404.
+    - Инвалидирует кэш ответа и вопроса, к которому он относился, убирает ответ из поискового индекса.
+    - Вычитает ответ из рейтинга вопросов (в интервале даты его создания).
+    - Публикует событие answer_deleted подписчикам вопроса.
     - Возвращает сообщение об успешном удалении.
     """
     @staticmethod
     async def execute(answer_id: int, session: AsyncSession) -> dict:
-        answer = await AnswerRepository.get_answer_by_id(answer_id, session)
-        if answer is None:
+        deleted = await AnswerRepository.delete_answer_by_id(answer_id, session)
+        if deleted is None:
             raise HTTPException(status_code=404, detail="Ответ не найден")
-        await AnswerRepository.delete_answer_by_id(answer_id, session)
+        search_index.remove_answers([answer_id])
+        trending.record(deleted.question_id, deleted.created_at, -1)
+        await cache.delete(answer_key(answer_id), question_key(deleted.question_id))
+        await publish(question_channel(deleted.question_id), question_event_json.dump_json({
+            "type": "answer_deleted", "question_id": deleted.question_id, "ids": [answer_id],
+        }))
         return {"message": f"Ответ {answer_id} удалён"}
@@ -1,9 +1,11 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import AnswerModels
+from app.cache.cache import cache, answer_key
 from app.logs.logger import logger
-from app.repositories.answers import AnswerRepository
+from app.repositories.loaders import loaders
+from app.schemas.answers import answer_json
+from app.utils.validation import is_valid_id
 
 
 class GetAnswerUseCase:
@@ -11,14 +13,22 @@ class GetAnswerUseCase:
      Use case для получения ответа по его ID.
 
      Логика:
-     - Загружает ответ через репозиторий.
-     - Проверяет факт существования.
-     - Возвращает модель ответа.
+     - Ищет готовый JSON ответа в кэше.
+     - При промахе загружает ответ через загрузчик сессии (app.repositories.loaders) и
+       проверяет факт существования.
+     - Сериализует строку ответа сразу в JSON (`answer_json`), кладёт байты в кэш и возвращает их.
      """
     @staticmethod
-    async def execute(answer_id: int, session: AsyncSession) -> AnswerModels:
-        answer = await AnswerRepository.get_answer_by_id(answer_id, session)
+    async def execute(answer_id: int, session: AsyncSession) -> bytes:
+        key = answer_key(answer_id)
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached
+
+        answer = await loaders(session).answers.load(answer_id) if is_valid_id(answer_id) else None
         if answer is None:
             logger.warning(f"Ответ с ID {answer_id} не найден")
             raise HTTPException(status_code=404, detail="Ответ не найден")
-        return answer
+        body = answer_json.dump_json(answer._asdict())
+        await cache.set(key, body)
+        return body
@@ -0,0 +1,36 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logs.logger import logger
+from app.repositories.loaders import loaders
+from app.schemas.answers import answer_batch_json
+from app.utils.validation import is_valid_id, parse_ids
+
+
+class GetAnswersByIdsUseCase:
+    """
+     Use case для пакетного получения ответов по списку ID (`GET /answers?ids=1,2,3`).
+
+     Логика:
+     - Разбирает ID (не больше MULTI_GET_MAX_IDS).
+     - Загружает ответы через загрузчик сессии (app.repositories.loaders):
+       все ID — одним запросом WHERE id = ANY(...), повторы не запрашиваются,
+       ID вне диапазона колонки — не запрашиваются вовсе.
+     - Возвращает JSON (формат `AnswerBatchResponse`): элемент на каждый
+       запрошенный ID в исходном порядке; ненайденные — с `found: false`.
+     """
+    @staticmethod
+    async def execute(raw_ids: str, session: AsyncSession) -> bytes:
+        ids = parse_ids(raw_ids, settings.MULTI_GET_MAX_IDS)
+        # ID вне диапазона колонки не существуют, и драйвер не смог бы передать их в запрос.
+        valid = [id for id in ids if is_valid_id(id)]
+        found = dict(zip(valid, await loaders(session).answers.load_many(valid)))
+        answers = [found.get(id) for id in ids]
+        missing = sum(answer is None for answer in answers)
+        logger.info(f"Получено ответов по списку ID: {len(ids) - missing}, не найдено: {missing}")
+        return answer_batch_json.dump_json({
+            "items": [
+                {"id": id, "found": answer is not None, "answer": answer._asdict() if answer is not None else None}
+                for id, answer in zip(ids, answers)
+            ],
+        })
@@ -0,0 +1,74 @@
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logs.logger import logger
+from app.repositories.questions import QuestionRepository
+from app.schemas.questions import QuestionIDResponse
+
+
+class ExportQuestionsUseCase:
+    """
+    Use case для потоковой выгрузки всех вопросов вместе с ответами.
+
+    Логика:
+    - Читает строки вопросов и ответов из репозитория серверным курсором.
+    - Собирает ответы одного вопроса и сериализует вопрос одной строкой JSON
+      (формат `QuestionIDResponse`).
+    - Отдаёт данные кусками фиксированного размера, поэтому потребление памяти
+      не зависит от размера таблиц (ограничено одним вопросом и одним куском).
+    """
+
+    @staticmethod
+    async def execute(
+        session: AsyncSession,
+        chunk_size: int,
+        yield_per: int,
+        json_array: bool = False
+    ) -> AsyncIterator[bytes]:
+        buffer = bytearray(b"[" if json_array else b"")
+        separator = b"," if json_array else b"\n"
+        exported = 0
+        current = None
+
+        def flush_question() -> None:
+            nonlocal exported
+            if exported and json_array:
+                buffer.extend(separator)
+            buffer.extend(QuestionIDResponse.model_validate(current).model_dump_json().encode())
+            if not json_array:
+                buffer.extend(separator)
+            exported += 1
+
+        rows = await QuestionRepository.stream_questions_with_answers(session, yield_per)
+        async for row in rows:
+            if current is None or current["id"] != row.id:
+                if current is not None:
+                    flush_question()
+                current = {
+                    "id": row.id,
+                    "text": row.text,
+                    "created_at": row.created_at,
+                    "answer_count": row.answer_count,
+                    "last_answer_at": row.last_answer_at,
+                    "answers": [],
+                }
+            if row.answer_id is not None:
+                current["answers"].append({
+                    "id": row.answer_id,
+                    "question_id": row.id,
+                    "user_id": row.answer_user_id,
+                    "text": row.answer_text,
+                    "created_at": row.answer_created_at,
+                })
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if current is not None:
+            flush_question()
+        if json_array:
+            buffer.extend(b"]")
+        if buffer:
+            yield bytes(buffer)
+        logger.info(f"Выгружено вопросов: {exported}")
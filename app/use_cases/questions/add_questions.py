@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.questions import QuestionRepository
 from app.schemas.questions import QuestionSchemas
+from app.search.index import search_index
 
 
 class CreateQuestionUseCase:
@@ -10,11 +11,13 @@ class CreateQuestionUseCase:
         Логика:
         - Принимает данные нового вопроса.
         - Передаёт их репозиторию для сохранения.
+        - Добавляет вопрос в поисковый индекс в памяти (если он используется).
         - Возвращает результат создания в удобном формате.
     """
     @staticmethod
     async def execute(data: QuestionSchemas, session: AsyncSession) -> dict:
         data_dict = data.model_dump()
         question = await QuestionRepository.add_question(data_dict, session)
+        search_index.add_question(question.id, question.text)
         return {"message": "Вопрос создан", "id": question.id}
 
@@ -0,0 +1,34 @@
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logs.logger import logger
+from app.repositories.questions import QuestionRepository
+from app.schemas.questions import QuestionSchemas
+from app.search.index import search_index
+from app.utils.validation import validate_items
+
+
+class BulkCreateQuestionsUseCase:
+    """
+        Use case для пакетного создания вопросов.
+
+        Логика:
+        - Валидирует каждый элемент отдельно и возвращает ошибки с индексами элементов.
+        - Сохраняет все вопросы одной транзакцией многострочными INSERT ... RETURNING.
+        - Добавляет вопросы в поисковый индекс в памяти (если он используется).
+        - Возвращает ID созданных вопросов в порядке элементов запроса.
+    """
+    @staticmethod
+    async def execute(items: list[Any], session: AsyncSession) -> dict:
+        questions = validate_items(QuestionSchemas, items, settings.BULK_MAX_ITEMS)
+        ids = await QuestionRepository.add_questions_bulk(
+            [question.model_dump() for question in questions],
+            session,
+            settings.BULK_CHUNK_SIZE,
+        )
+        for id, question in zip(ids, questions):
+            search_index.add_question(id, question.text)
+        logger.info(f"Пакетно создано вопросов: {len(ids)}")
+        return {"message": "Вопросы созданы", "ids": ids}
@@ -1,6 +1,12 @@
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache import cache, answer_key, question_key
+from app.events.bus import publish, question_channel
 from app.repositories.questions import QuestionRepository
+from app.schemas.events import question_event_json
+from app.search.index import search_index
+from app.trending.leaderboard import trending
 
 
 class DeleteQuestionUseCase:
@@ -8,14 +14,20 @@ class DeleteQuestionUseCase:
         Use case для удаления вопроса вместе с его ответами.
 
         Логика:
-        - Проверяет существование вопроса.
-        - Удаляет вопрос через репозиторий.
+        - Удаляет вопрос и его ответы через репозиторий в одной транзакции.
+        - Если вопроса не было, возвращает 404.
+        - Инвалидирует кэш вопроса и всех удалённых ответов, убирает их из поискового индекса
+          и рейтинга вопросов.
+        - Публикует событие question_deleted подписчикам вопроса.
         - Возвращает сообщение об успешном удалении.
     """
     @staticmethod
     async def execute(id: int, session: AsyncSession) -> dict:
-        question = await QuestionRepository.get_question_by_id(id, session)
-        if question is None:
+        answer_ids = await QuestionRepository.delete_question_by_id(id, session)
+        if answer_ids is None:
             raise HTTPException(status_code=404, detail="Вопрос не найден")
-        await QuestionRepository.delete_question_by_id(id, session)
+        search_index.remove_question(id, answer_ids)
+        trending.remove_question(id)
+        await cache.delete(question_key(id), *(answer_key(answer_id) for answer_id in answer_ids))
+        await publish(question_channel(id), question_event_json.dump_json({"type": "question_deleted", "question_id": id}))
         return {"message": "Вопрос успешно удален вместе с ответами"}
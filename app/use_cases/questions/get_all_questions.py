@@ -1,20 +1,51 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import QuestionModels
 from app.logs.logger import logger
 from app.repositories.questions import QuestionRepository
+from app.schemas.questions import question_page_json
+from app.utils.cursor import decode_cursor, encode_cursor
 
 
 class GetAllQuestionsUseCase:
     """
-      Use case для получения списка всех вопросов.
+      Use case для получения страницы списка вопросов.
 
       Логика:
-      - Загружает список вопросов через репозиторий.
-      - Возвращает модели вопросов.
+      - Декодирует курсор предыдущей страницы (если передан) и проверяет, что он
+        выдан для той же сортировки.
+      - Загружает на одну запись больше лимита, чтобы понять, есть ли следующая страница.
+      - Возвращает JSON (формат `QuestionPageResponse`) с вопросами страницы и
+        курсором следующей страницы, сериализованный напрямую из строк базы.
     """
     @staticmethod
-    async def execute(session: AsyncSession) -> list[QuestionModels]:
-        res = await QuestionRepository.all_questions(session)
+    async def execute(
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: str = "created"
+    ) -> bytes:
+        after = None
+        if cursor is not None:
+            value_type = int if sort == "most_answered" else datetime.fromisoformat
+            try:
+                cursor_sort, value, last_id = decode_cursor(cursor, str, value_type, int)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Некорректный курсор")
+            if cursor_sort != sort:
+                raise HTTPException(status_code=400, detail="Курсор выдан для другой сортировки")
+            after = (value, last_id)
+
+        questions = await QuestionRepository.all_questions(session, limit + 1, after, sort)
+        next_cursor = None
+        if len(questions) > limit:
+            questions = questions[:limit]
+            next_cursor = encode_cursor((sort, *QuestionRepository.sort_key(questions[-1], sort)))
         logger.info("Список вопросов получен")
-        return res
+        return question_page_json.dump_json({
+            "items": [question._asdict() for question in questions],
+            "next_cursor": next_cursor,
+        })
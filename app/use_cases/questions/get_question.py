@@ -1,25 +1,112 @@
+import uuid
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import QuestionModels
+from app.cache.cache import cache, question_key, question_page_key
 from app.logs.logger import logger
+from app.repositories.answers import AnswerRepository
 from app.repositories.questions import QuestionRepository
+from app.schemas.questions import question_json
+from app.utils.conditional import http_date, is_not_modified, make_etag
+from app.utils.cursor import decode_cursor, encode_cursor
+
+# Клиенты опрашивают вопрос в ожидании новых ответов: копию можно хранить,
+# но перед использованием её нужно перепроверить условным запросом.
+CACHE_CONTROL = "no-cache"
+
+
+def _pack(etag: str, last_modified: str, body: bytes) -> bytes:
+    """Кладёт валидаторы в начало значения кэша, чтобы хватало одного чтения."""
+    return f"{etag}\n{last_modified}\n".encode() + body
+
+
+def _unpack(value: bytes) -> tuple[str, str, bytes]:
+    etag, last_modified, body = value.split(b"\n", 2)
+    return etag.decode(), last_modified.decode(), body
 
 
 class GetQuestionUseCase:
     """
-      Use case для получения конкретного вопроса по его ID.
+      Use case для получения конкретного вопроса по его ID со страницей ответов.
 
       Логика:
-      - Загружает вопрос через репозиторий.
-      - Проверяет его существование.
-      - Возвращает модель вопроса.
+      - Декодирует курсор ответов (если передан).
+      - Ищет готовый JSON страницы в кэше. Ключ страницы содержит токен поколения
+        вопроса, который сбрасывается при любой записи в вопрос или его ответы.
+        Вместе с телом в кэше лежат ETag и Last-Modified страницы.
+      - При промахе загружает вопрос (вместе с version и updated_at) и, если
+        клиентская копия актуальна (If-None-Match / If-Modified-Since), отвечает
+        304 без загрузки ответов.
+      - Иначе загружает не больше `answers_limit` ответов после курсора (только
+        из секций таблицы ответов между датой вопроса и его последнего ответа) и
+        сериализует строки сразу в JSON (`question_json`, формат `QuestionIDResponse`),
+        кладёт байты в кэш и возвращает их вместе с заголовками.
+        Общее количество ответов отдаётся в `answer_count`, курсор следующей
+        страницы — в `answers_next_cursor`.
+
+      ETag строится из ID и версии вопроса: версию поднимает AnswerRepository
+      при каждом добавлении и удалении ответов. Параметры страницы в ETag не
+      входят — они часть URL, а ETag сравнивается в пределах одного URL.
     """
     @staticmethod
-    async def execute(id: int, session: AsyncSession) -> QuestionModels:
+    async def execute(
+        id: int,
+        session: AsyncSession,
+        answers_limit: int = 50,
+        answers_cursor: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None
+    ) -> tuple[bytes, dict[str, str]]:
+        after = None
+        if answers_cursor is not None:
+            try:
+                after = decode_cursor(answers_cursor, datetime.fromisoformat, int)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+        generation = await cache.get(question_key(id))
+        if generation is None:
+            # Новое поколение создаётся до чтения из базы: если запись успеет
+            # завершиться между чтением и сохранением страницы, она сбросит и его.
+            generation = uuid.uuid4().hex.encode()
+            await cache.set(question_key(id), generation)
+        key = question_page_key(id, generation, answers_limit, answers_cursor)
+        cached = await cache.get(key)
+        if cached is not None:
+            etag, last_modified, body = _unpack(cached)
+            headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": CACHE_CONTROL}
+            conditional = if_none_match is not None or if_modified_since is not None
+            if conditional and is_not_modified(
+                etag, parsedate_to_datetime(last_modified), if_none_match, if_modified_since
+            ):
+                raise HTTPException(status_code=304, headers=headers)
+            return body, headers
+
         question = await QuestionRepository.get_question_by_id(id, session)
         if question is None:
             raise HTTPException(status_code=404, detail="Вопрос не найден")
-        logger.info(f"Получен вопрос с ID {id}")
-        return question
+        etag = make_etag(id, question.version)
+        headers = {"ETag": etag, "Last-Modified": http_date(question.updated_at), "Cache-Control": CACHE_CONTROL}
+        if is_not_modified(etag, question.updated_at, if_none_match, if_modified_since):
+            raise HTTPException(status_code=304, headers=headers)
+
+        answers = await AnswerRepository.answers_page(
+            id, session, answers_limit + 1, after, (question.created_at, question.last_answer_at)
+        )
+        next_cursor = None
+        if len(answers) > answers_limit:
+            answers = answers[:answers_limit]
+            next_cursor = encode_cursor((answers[-1].created_at, answers[-1].id))
 
+        body = question_json.dump_json({
+            **question._asdict(),
+            "answers": [answer._asdict() for answer in answers],
+            "answers_next_cursor": next_cursor,
+        })
+        await cache.set(key, _pack(etag, headers["Last-Modified"], body))
+        logger.info(f"Получен вопрос с ID {id}")
+        return body, headers
@@ -0,0 +1,36 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logs.logger import logger
+from app.repositories.loaders import loaders
+from app.schemas.questions import question_batch_json
+from app.utils.validation import is_valid_id, parse_ids
+
+
+class GetQuestionsByIdsUseCase:
+    """
+      Use case для пакетного получения вопросов по списку ID (`GET /questions/?ids=1,2,3`).
+
+      Логика:
+      - Разбирает ID (не больше MULTI_GET_MAX_IDS).
+      - Загружает вопросы через загрузчик сессии (app.repositories.loaders):
+        все ID — одним запросом WHERE id = ANY(...), повторы не запрашиваются,
+        ID вне диапазона колонки — не запрашиваются вовсе.
+      - Возвращает JSON (формат `QuestionBatchResponse`): элемент на каждый
+        запрошенный ID в исходном порядке; ненайденные — с `found: false`.
+    """
+    @staticmethod
+    async def execute(raw_ids: str, session: AsyncSession) -> bytes:
+        ids = parse_ids(raw_ids, settings.MULTI_GET_MAX_IDS)
+        # ID вне диапазона колонки не существуют, и драйвер не смог бы передать их в запрос.
+        valid = [id for id in ids if is_valid_id(id)]
+        found = dict(zip(valid, await loaders(session).questions.load_many(valid)))
+        questions = [found.get(id) for id in ids]
+        missing = sum(question is None for question in questions)
+        logger.info(f"Получено вопросов по списку ID: {len(ids) - missing}, не найдено: {missing}")
+        return question_batch_json.dump_json({
+            "items": [
+                {"id": id, "found": question is not None, "question": question._asdict() if question is not None else None}
+                for id, question in zip(ids, questions)
+            ],
+        })
@@ -0,0 +1,32 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logs.logger import logger
+from app.repositories.questions import QuestionRepository
+from app.schemas.questions import question_trending_json
+from app.trending.leaderboard import trending
+
+
+class GetTrendingQuestionsUseCase:
+    """
+      Use case для получения рейтинга вопросов по активности ответов.
+
+      Логика:
+      - Берёт лучшие вопросы окна из рейтинга в памяти (app.trending), без
+        подсчёта по таблице ответов.
+      - Загружает эти вопросы одним запросом по первичному ключу; вопросы,
+        удалённые после последней синхронизации рейтинга, пропускаются.
+      - Возвращает JSON (формат `QuestionTrendingResponse`) с числом ответов
+        каждого вопроса за окно.
+    """
+    @staticmethod
+    async def execute(window: str, limit: int, session: AsyncSession) -> bytes:
+        top = trending.top(window, limit)
+        questions = await QuestionRepository.questions_by_ids([question_id for question_id, _ in top], session)
+        logger.info(f"Рейтинг вопросов за {window} получен")
+        return question_trending_json.dump_json({
+            "window": window,
+            "items": [
+                {**questions[question_id]._asdict(), "answers_in_window": answers}
+                for question_id, answers in top if question_id in questions
+            ],
+        })
@@ -0,0 +1,66 @@
+import asyncio
+import json
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.events.backends import BusUnavailable, Subscription, TooManySubscribers
+from app.events.bus import bus, question_channel
+from app.logs.logger import logger
+from app.repositories.questions import QuestionRepository
+
+
+class SubscribeQuestionUseCase:
+    """
+      Use case для подписки на новые и удалённые ответы вопроса (Server-Sent Events).
+
+      Логика:
+      - Проверяет, что вопрос существует (404), и сразу закрывает сессию: поток
+        живёт долго, а держать на нём соединение из пула нельзя.
+      - Подписывается на канал вопроса в шине событий; при превышении лимита
+        подписок или без связи шины с Postgres возвращает 503 с Retry-After.
+      - stream() превращает события подписки в поток SSE: каждое событие — строка
+        `data: <JSON QuestionEvent>`, при простое отправляется комментарий-пинг,
+        чтобы прокси не закрывали соединение. Если клиент не успевает читать и
+        подписка переполнилась (или шина потеряла связь с Postgres), отправляется
+        событие `resync` и поток закрывается: клиент должен перечитать вопрос и
+        подписаться снова. После события question_deleted поток закрывается:
+        других событий у удалённого вопроса не будет.
+    """
+    @staticmethod
+    async def execute(id: int, session: AsyncSession) -> Subscription:
+        exists = await QuestionRepository.question_exists(id, session)
+        await session.close()
+        if not exists:
+            raise HTTPException(status_code=404, detail="Вопрос не найден")
+        try:
+            subscription = bus.subscribe(question_channel(id))
+        except TooManySubscribers as e:
+            logger.warning(f"Отказ в подписке на вопрос {id}: {e}")
+            raise HTTPException(status_code=503, detail="Слишком много подписок", headers={"Retry-After": "5"})
+        except BusUnavailable as e:
+            logger.warning(f"Отказ в подписке на вопрос {id}: {e}")
+            raise HTTPException(status_code=503, detail="События временно недоступны", headers={"Retry-After": "5"})
+        logger.info(f"Подписка на события вопроса {id}")
+        return subscription
+
+    @staticmethod
+    async def stream(subscription: Subscription, heartbeat: float) -> AsyncIterator[bytes]:
+        try:
+            yield b"retry: 3000\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if message is None:
+                    if subscription.resync:
+                        yield b"event: resync\ndata: {}\n\n"
+                    return
+                yield b"data: " + message + b"\n\n"
+                if json.loads(message).get("type") == "question_deleted":
+                    return
+        finally:
+            bus.unsubscribe(subscription)
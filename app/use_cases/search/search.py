@@ -0,0 +1,152 @@
+import hashlib
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.logs.logger import logger
+from app.repositories.search import SearchRepository
+from app.schemas.search import search_group_page_json, search_page_json
+from app.search.index import search_index, session_backend, tokenize
+from app.utils.cursor import decode_cursor, encode_cursor
+
+# Во сколько раз больше документов, чем групп на странице, берётся из индекса
+# для группировки: у вопроса может быть несколько найденных ответов.
+GROUP_OVERFETCH = 4
+
+
+def query_digest(query: str, group: bool) -> str:
+    """
+    Отпечаток запроса для курсора: смещение осмысленно только для того же
+    запроса и режима группировки. Считается по словам запроса (как их видит
+    индекс), поэтому регистр и порядок слов не важны.
+    """
+    terms = " ".join(sorted(set(tokenize(query))))
+    return hashlib.sha256(f"{int(group)}:{terms}".encode()).hexdigest()[:16]
+
+
+class SearchUseCase:
+    """
+      Use case для полнотекстового поиска по вопросам и ответам.
+
+      Логика:
+      - Проверяет запрос и курсор. Результаты ранжированы, поэтому курсор хранит
+        смещение (и отпечаток запроса — с другим запросом курсор не принимается),
+        а глубина листания ограничена SEARCH_MAX_OFFSET: дальше полезнее уточнить
+        запрос, чем ранжировать весь хвост.
+      - Если сессия работает с PostgreSQL, ищет по tsvector с GIN-индексом
+        (SearchRepository.full_text), на остальных базах или при SEARCH_BACKEND=memory —
+        по инвертированному индексу в памяти (search_index),
+        после чего загружает найденные документы одним-двумя запросами по ID.
+      - При group=True объединяет найденное по вопросам: ранг вопроса — лучший
+        ранг среди него и его ответов, в answer_ids — найденные ответы. Индекс в
+        памяти отдаёт лишь лучшие документы (с запасом GROUP_OVERFETCH на группу,
+        при нехватке — вдвое больше), поэтому в answer_ids попадают ответы из их
+        числа, а менее релевантные ответы вопроса могут не попасть.
+      - Загружает на один элемент больше лимита, чтобы понять, есть ли следующая
+        страница, и возвращает JSON (`SearchPageResponse` или `SearchGroupPageResponse`).
+    """
+    @staticmethod
+    async def execute(
+        query: str,
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        group: bool = False
+    ) -> bytes:
+        query = query.strip()
+        if not query:
+            raise HTTPException(status_code=400, detail="Пустой поисковый запрос")
+        offset = 0
+        digest = query_digest(query, group)
+        if cursor is not None:
+            try:
+                offset, cursor_digest = decode_cursor(cursor, int, str)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Некорректный курсор")
+            if cursor_digest != digest:
+                raise HTTPException(status_code=400, detail="Курсор получен для другого запроса")
+        if offset > settings.SEARCH_MAX_OFFSET:
+            raise HTTPException(status_code=400, detail="Слишком далёкая страница, уточните запрос")
+
+        if session_backend(session) == "postgres":
+            items = await SearchUseCase._postgres(query, session, limit + 1, offset, group)
+            has_more = len(items) > limit
+        elif group:
+            items, has_more = await SearchUseCase._memory_grouped(query, session, limit, offset)
+        else:
+            items, has_more = await SearchUseCase._memory(query, session, limit, offset)
+
+        next_cursor = encode_cursor((offset + limit, digest)) if has_more else None
+        logger.info(f"Поиск выполнен, найдено на странице: {min(len(items), limit)}")
+        dump = search_group_page_json if group else search_page_json
+        return dump.dump_json({"items": items[:limit], "next_cursor": next_cursor})
+
+    @staticmethod
+    async def _postgres(query: str, session: AsyncSession, limit: int, offset: int, group: bool) -> list[dict]:
+        if group:
+            rows = await SearchRepository.full_text_grouped(query, session, limit, offset)
+            return [{**row._asdict(), "answer_ids": row.answer_ids or []} for row in rows]
+        rows = await SearchRepository.full_text(query, session, limit, offset)
+        return [row._asdict() for row in rows]
+
+    @staticmethod
+    async def _memory(query: str, session: AsyncSession, limit: int, offset: int) -> tuple[list[dict], bool]:
+        hits = search_index.search(query, offset + limit + 1)[offset:]
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+        documents = await SearchRepository.documents(((hit.kind, hit.id) for hit in hits), session)
+        items = []
+        for hit in hits:
+            document = documents.get((hit.kind, hit.id))
+            # Документ мог быть удалён другим воркером, индекс которого ещё не знает об этом.
+            if document is not None:
+                items.append({**document._asdict(), "kind": hit.kind, "rank": hit.rank})
+        return items, has_more
+
+    @staticmethod
+    async def _memory_grouped(query: str, session: AsyncSession, limit: int, offset: int) -> tuple[list[dict], bool]:
+        needed = offset + limit + 1
+        fetch = needed * GROUP_OVERFETCH
+        while True:
+            hits = search_index.search(query, fetch)
+            groups = SearchUseCase._group(hits)
+            if len(hits) < fetch:
+                break
+            # Документы индекса идут по убыванию ранга: групп хватает, если набралось
+            # нужное число и непрочитанные документы ранжированы строго ниже последней
+            # нужной группы (иначе они могли бы встать раньше неё при равном ранге).
+            if len(groups) >= needed:
+                boundary = sorted((group["rank"] for group in groups.values()), reverse=True)[needed - 1]
+                if hits[-1].rank < boundary:
+                    break
+            fetch *= 2
+        ordered = sorted(groups.values(), key=lambda group: (-group["rank"], group["question_id"]))
+        page = ordered[offset:offset + limit]
+        questions = await SearchRepository.questions((group["question_id"] for group in page), session)
+        items = [
+            {**group, "text": questions[group["question_id"]].text, "created_at": questions[group["question_id"]].created_at}
+            for group in page
+            if group["question_id"] in questions
+        ]
+        return items, len(ordered) > offset + limit
+
+    @staticmethod
+    def _group(hits: list) -> dict[int, dict]:
+        """Объединяет найденные документы по вопросам; ранг группы — лучший ранг её документов."""
+        groups: dict[int, dict] = {}
+        for hit in hits:
+            group = groups.get(hit.question_id)
+            if group is None:
+                group = groups[hit.question_id] = {
+                    "question_id": hit.question_id,
+                    "rank": hit.rank,
+                    "question_matched": False,
+                    "answer_ids": [],
+                }
+            if hit.kind == "question":
+                group["question_matched"] = True
+            else:
+                group["answer_ids"].append(hit.id)
+        return groups
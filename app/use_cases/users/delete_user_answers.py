@@ -0,0 +1,60 @@
+import asyncio
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache.cache import cache, answer_key, question_key
+from app.config import settings
+from app.events.bus import publish, question_channel
+from app.logs.logger import logger
+from app.repositories.answers import AnswerRepository
+from app.schemas.events import question_event_json
+from app.search.index import search_index
+from app.trending.leaderboard import trending
+
+
+class DeleteUserAnswersUseCase:
+    """
+    Use case для удаления всех ответов пользователя (модерация).
+
+    Логика:
+    - Удаляет ответы пачками по USER_DELETE_CHUNK_SIZE, каждая пачка — отдельная
+      короткая транзакция вместе со статистикой затронутых вопросов; между
+      пачками управление возвращается циклу событий.
+    - После каждой пачки убирает ответы из поискового индекса и рейтинга вопросов,
+      инвалидирует кэш ответов и их вопросов и публикует answer_deleted подписчикам
+      каждого вопроса.
+    - Если запрос прервётся, уже удалённые пачки остаются удалёнными (повторный
+      запрос удалит остальное).
+    - Возвращает количество удалённых ответов.
+    """
+    @staticmethod
+    async def execute(user_id: uuid.UUID, session: AsyncSession) -> dict:
+        chunk_size = settings.USER_DELETE_CHUNK_SIZE
+        total = 0
+        while True:
+            deleted = await AnswerRepository.delete_answers_by_user(user_id, session, chunk_size)
+            if deleted:
+                await DeleteUserAnswersUseCase._deleted(deleted)
+                total += len(deleted)
+            if len(deleted) < chunk_size:
+                break
+            await asyncio.sleep(0)
+        logger.info(f"Удалено ответов пользователя {user_id}: {total}")
+        return {"message": f"Ответы пользователя {user_id} удалены", "deleted": total}
+
+    @staticmethod
+    async def _deleted(rows: list) -> None:
+        by_question: dict[int, list[int]] = {}
+        for row in rows:
+            by_question.setdefault(row.question_id, []).append(row.id)
+            trending.record(row.question_id, row.created_at, -1)
+        search_index.remove_answers(row.id for row in rows)
+        await cache.delete(
+            *(answer_key(row.id) for row in rows),
+            *(question_key(question_id) for question_id in by_question),
+        )
+        for question_id, ids in by_question.items():
+            await publish(question_channel(question_id), question_event_json.dump_json({
+                "type": "answer_deleted", "question_id": question_id, "ids": ids,
+            }))
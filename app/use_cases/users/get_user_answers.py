@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logs.logger import logger
+from app.repositories.answers import AnswerRepository
+from app.schemas.answers import answer_page_json
+from app.utils.cursor import decode_cursor, encode_cursor
+
+
+class GetUserAnswersUseCase:
+    """
+      Use case для получения страницы ответов пользователя (для модерации).
+
+      Логика:
+      - Декодирует курсор предыдущей страницы (если передан).
+      - Загружает на одну запись больше лимита, новые ответы первыми, чтобы
+        понять, есть ли следующая страница.
+      - Возвращает JSON (формат `AnswerPageResponse`) с ответами страницы и
+        курсором следующей страницы, сериализованный напрямую из строк базы.
+    """
+    @staticmethod
+    async def execute(
+        user_id: uuid.UUID,
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> bytes:
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_cursor(cursor, datetime.fromisoformat, int)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Некорректный курсор")
+
+        answers = await AnswerRepository.answers_by_user(user_id, session, limit + 1, after)
+        next_cursor = None
+        if len(answers) > limit:
+            answers = answers[:limit]
+            next_cursor = encode_cursor((answers[-1].created_at, answers[-1].id))
+        logger.info(f"Получены ответы пользователя {user_id}")
+        return answer_page_json.dump_json({
+            "items": [answer._asdict() for answer in answers],
+            "next_cursor": next_cursor,
+        })
@@ -0,0 +1,18 @@
+from starlette.requests import HTTPConnection
+
+
+def get_client_id(connection: HTTPConnection) -> str:
+    """
+    Определяет клиента запроса.
+
+    Приоритет: заголовок X-Client-Id (проставляется BFF/шлюзом), затем IP-адрес.
+
+    connection: Запрос (или WebSocket-соединение) Starlette.
+    return: Идентификатор клиента.
+    """
+    client_id = connection.headers.get("x-client-id")
+    if client_id:
+        return client_id
+    if connection.client is not None:
+        return connection.client.host
+    return "anonymous"
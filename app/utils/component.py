@@ -0,0 +1,61 @@
+"""Модульные объекты приложения, создаваемые из настроек.
+
+Кэш, шина событий, ограничитель частоты и другие компоненты импортируются
+по имени во многих модулях (`from app.cache.cache import cache`), поэтому
+create_app(settings) не подменяет сами объекты, а задаёт, из каких настроек
+создаётся то, на что они ссылаются (Component.configure)."""
+
+from typing import Callable, Generic, Optional, TypeVar
+
+from app.config import Settings, settings as active_settings
+
+T = TypeVar("T")
+
+
+class Component(Generic[T]):
+    """
+    Ссылка на компонент, создаваемый фабрикой из настроек.
+
+    Компонент создаётся при первом обращении к его атрибутам — из действующих
+    настроек процесса (app.config.settings), если configure ещё не вызывался, —
+    поэтому импорт модуля ничего не создаёт (клиентов Redis, соединений).
+    Обращения к атрибутам и их изменение передаются компоненту.
+    """
+
+    def __init__(self, factory: Callable[[Settings], T]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_settings", None)
+
+    def configure(self, settings: Settings) -> None:
+        """
+        Создаёт компонент из `settings`.
+
+        С теми же настройками, что и у уже созданного компонента, ничего не
+        делает: его состояние (кэш, счётчики) сохраняется.
+        """
+        if self._target is not None and settings == self._settings:
+            return
+        object.__setattr__(self, "_target", self._factory(settings))
+        object.__setattr__(self, "_settings", settings.model_copy())
+
+    @property
+    def target(self) -> T:
+        """Сам компонент (создаётся из действующих настроек при первом обращении)."""
+        if self._target is None:
+            self.configure(active_settings)
+        return self._target
+
+    @property
+    def settings(self) -> Optional[Settings]:
+        """Настройки, из которых создан компонент (None — ещё не создан)."""
+        return self._settings
+
+    def __getattr__(self, name: str):
+        return getattr(self.target, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self.target, name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self.target, name)
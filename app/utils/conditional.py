@@ -0,0 +1,83 @@
+"""Условные GET-запросы (RFC 9110): ETag, Last-Modified и ответ 304.
+
+Валидаторы считаются без загрузки тела ответа, поэтому проверку можно
+сделать до тяжёлой части запроса и сразу вернуть 304 Not Modified."""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """
+    Строит сильный ETag из частей версии ресурса.
+
+    parts: Значения, однозначно определяющие представление (например, ID и версия).
+    return: ETag в кавычках, например "12-3".
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def http_date(value: datetime) -> str:
+    """
+    Форматирует дату для заголовка Last-Modified (IMF-fixdate, GMT).
+
+    value: Дата; без часового пояса считается UTC (так её отдаёт SQLite).
+    return: Строка вида "Sun, 18 Oct 2026 15:30:00 GMT".
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Проверяет If-None-Match (слабое сравнение: префикс W/ игнорируется).
+
+    if_none_match: Значение заголовка — "*" или список ETag через запятую.
+    etag: Текущий ETag ресурса.
+    return: True, если клиентская копия актуальна.
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag.removeprefix("W/")
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    """
+    Проверяет If-Modified-Since с точностью до секунды (точность HTTP-даты).
+
+    if_modified_since: Значение заголовка; некорректная дата игнорируется.
+    last_modified: Дата последнего изменения ресурса.
+    return: True, если ресурс не менялся после указанной даты.
+    """
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def is_not_modified(
+    etag: str,
+    last_modified: datetime,
+    if_none_match: Optional[str] = None,
+    if_modified_since: Optional[str] = None
+) -> bool:
+    """
+    Решает, можно ли ответить 304.
+
+    If-Modified-Since учитывается, только если нет If-None-Match (RFC 9110, 13.1.3).
+    """
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if if_modified_since is not None:
+        return not_modified_since(if_modified_since, last_modified)
+    return False
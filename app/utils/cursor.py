@@ -0,0 +1,43 @@
+"""Курсоры для keyset-пагинации.
+
+Курсор — это непрозрачная для клиента строка (base64url от JSON-массива),
+в которой хранятся значения ключа сортировки последней отданной записи."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Кодирует значения ключа сортировки в курсор.
+
+    values: Значения ключа (datetime сериализуется в ISO 8601).
+    return: Строка курсора.
+    """
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, *types: Callable[[Any], Any]) -> tuple:
+    """
+    Декодирует курсор обратно в значения ключа сортировки.
+
+    cursor: Строка курсора, полученная от клиента.
+    types: Преобразователи для каждого значения ключа (например, datetime.fromisoformat, int).
+    return: Кортеж значений ключа.
+    raises ValueError: Если курсор повреждён или не соответствует ключу.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Некорректный курсор") from e
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise ValueError("Некорректный курсор")
+    try:
+        return tuple(convert(value) for convert, value in zip(types, payload))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Некорректный курсор") from e
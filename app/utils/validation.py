@@ -0,0 +1,68 @@
+from typing import Any, Type, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# ID вопросов и ответов — INTEGER (int4) с последовательностью от 1.
+MAX_ID = 2 ** 31 - 1
+
+
+def validate_items(schema: Type[SchemaT], items: list[Any], max_items: int) -> list[SchemaT]:
+    """
+    Валидирует элементы пакетного запроса по отдельности.
+
+    В отличие от валидации всего тела запроса, ошибки собираются для каждого
+    элемента с указанием его индекса, чтобы клиент мог исправить только их.
+
+    schema: Pydantic-схема одного элемента.
+    items: Элементы из тела запроса.
+    max_items: Максимально допустимое количество элементов.
+    return: Список провалидированных элементов.
+    raises HTTPException: 413 при превышении лимита, 422 при пустом списке
+                          или со списком ошибок по элементам.
+    """
+    if not items:
+        # Пустая пачка ничего не создаёт, но обновила бы статистику и версию вопроса.
+        raise HTTPException(status_code=422, detail="Нужен хотя бы один элемент")
+    if len(items) > max_items:
+        raise HTTPException(status_code=413, detail=f"Не более {max_items} элементов за запрос")
+
+    validated, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            validated.append(schema.model_validate(item))
+        except ValidationError as e:
+            errors.append({"index": index, "errors": e.errors(include_url=False, include_context=False)})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    return validated
+
+
+def parse_ids(raw: str, max_ids: int) -> list[int]:
+    """
+    Разбирает список ID из параметра запроса вида `1,2,3`.
+
+    Порядок и повторы сохраняются: ответ на пакетное чтение возвращает
+    элементы в порядке запрошенных ID. ID вне диапазона колонки (см. is_valid_id)
+    не отклоняются: таких записей нет, вызывающий отвечает на них found: false,
+    не передавая их в базу.
+
+    raw: Значение параметра `ids`.
+    max_ids: Максимально допустимое количество ID.
+    return: Список ID.
+    raises HTTPException: 413 при превышении лимита, 422 при нечисловом ID.
+    """
+    parts = [part.strip() for part in raw.split(",") if part.strip()]
+    if len(parts) > max_ids:
+        raise HTTPException(status_code=413, detail=f"Не более {max_ids} ID за запрос")
+    try:
+        return [int(part) for part in parts]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids: ожидаются целые числа через запятую")
+
+
+def is_valid_id(value: int) -> bool:
+    """True, если значение помещается в колонку ID (1..MAX_ID) и его можно передать в запрос."""
+    return 1 <= value <= MAX_ID
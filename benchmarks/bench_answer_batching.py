@@ -0,0 +1,105 @@
+"""Бенчмарк групповой записи ответов (ANSWER_BATCH_ENABLED) под всплеском нагрузки.
+
+`--concurrency` клиентов одновременно создают ответы через CreateAnswerUseCase
+(всего `--answers`) к `--questions` вопросам; каждый сотый ответ адресован
+несуществующему вопросу и должен получить 404, не мешая остальным. Режимы:
+- off: каждый ответ — своя транзакция и свой commit (create_answer);
+- on: ответы собираются в пачки (answer_batcher) и пишутся одним INSERT на пачку.
+
+Выводится пропускная способность (ответов в секунду), задержка запроса
+и число пачек.
+
+Запуск:
+    python -m benchmarks.bench_answer_batching --answers 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import uuid
+
+from fastapi import HTTPException
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+# benchmarks.common импортируется раньше app: он задаёт PG_URL по умолчанию.
+from benchmarks.common import DEFAULT_URL, make_engine, reset_schema, summarize
+from app.batching.answers import answer_batcher
+from app.config import settings
+from app.database.models import AnswerModels, QuestionModels
+from app.logs.logger import logger
+from app.schemas.answers import AnswerSchemas
+from app.use_cases.answers.create_answer import CreateAnswerUseCase
+
+
+async def run_mode(session_factory, batched: bool, answers: int, concurrency: int, questions: int) -> dict:
+    settings.ANSWER_BATCH_ENABLED = batched
+    batches_before = answer_batcher.batches
+    queue = iter(range(answers))
+    latencies, not_found, errors = [], 0, 0
+
+    async def client():
+        nonlocal not_found, errors
+        for i in queue:
+            question_id = questions + 1 if i % 100 == 99 else i % questions + 1
+            data = AnswerSchemas(text=f"Ответ {i}", user_id=uuid.uuid4())
+            started = time.perf_counter()
+            try:
+                async with session_factory() as session:
+                    await CreateAnswerUseCase.execute(question_id, data, session)
+            except HTTPException:
+                not_found += 1
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "answers_per_s": round(answers / elapsed, 1),
+        "latency": summarize(latencies),
+        "not_found": not_found,
+        "errors": errors,
+        "batches": answer_batcher.batches - batches_before,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--answers", type=int, default=5000, help="Ответов на режим")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--max-items", type=int, default=settings.ANSWER_BATCH_MAX_ITEMS)
+    parser.add_argument("--max-delay-ms", type=float, default=settings.ANSWER_BATCH_MAX_DELAY_MS)
+    args = parser.parse_args()
+    # Ответы к несуществующему вопросу логируются как WARNING — здесь это шум.
+    logger.setLevel(logging.ERROR)
+    answer_batcher.max_items = args.max_items
+    answer_batcher.max_delay = args.max_delay_ms / 1000
+
+    engine = make_engine(args.url)
+    await reset_schema(engine)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with session_factory() as session:
+        await session.execute(insert(QuestionModels), [{"text": f"Вопрос {i}"} for i in range(args.questions)])
+        await session.commit()
+
+    result = {}
+    for mode, batched in (("off", False), ("on", True)):
+        result[mode] = await run_mode(session_factory, batched, args.answers, args.concurrency, args.questions)
+    async with session_factory() as session:
+        stored = (await session.execute(select(func.count()).select_from(AnswerModels))).scalar_one()
+        counted = (await session.execute(select(func.sum(QuestionModels.answer_count)))).scalar_one()
+    result["stored_answers"] = stored
+    result["answer_count_matches"] = stored == counted
+    result["speedup"] = round(result["on"]["answers_per_s"] / result["off"]["answers_per_s"], 2)
+    await engine.dispose()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
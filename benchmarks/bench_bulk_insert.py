@@ -0,0 +1,67 @@
+"""Бенчмарк пакетного создания вопросов.
+
+Сравнивает пропускную способность (строк в секунду):
+- single: CreateQuestionUseCase на каждый вопрос (отдельный INSERT и COMMIT);
+- bulk: BulkCreateQuestionsUseCase с разными размерами кусков (BULK_CHUNK_SIZE).
+
+Запуск:
+    python -m benchmarks.bench_bulk_insert --rows 10000 --chunks 100 1000 5000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.logs.logger import logger
+from app.schemas.questions import QuestionSchemas
+from app.use_cases.questions.add_questions import CreateQuestionUseCase
+from app.use_cases.questions.bulk_add_questions import BulkCreateQuestionsUseCase
+from benchmarks.common import DEFAULT_URL, make_engine, reset_schema
+
+
+async def rows_per_second(fn, rows: int) -> float:
+    start = time.perf_counter()
+    await fn()
+    return round(rows / (time.perf_counter() - start), 1)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--chunks", type=int, nargs="+", default=[100, 1_000, 5_000])
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    engine = make_engine(args.url)
+    await reset_schema(engine)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    items = [{"text": f"Вопрос {i}"} for i in range(args.rows)]
+    settings.BULK_MAX_ITEMS = max(settings.BULK_MAX_ITEMS, args.rows)
+
+    async def single():
+        async with session_factory() as session:
+            for item in items:
+                await CreateQuestionUseCase.execute(QuestionSchemas(**item), session)
+
+    result = {"rows": args.rows, "single_rows_per_sec": await rows_per_second(single, args.rows), "bulk": {}}
+    for chunk_size in args.chunks:
+        settings.BULK_CHUNK_SIZE = chunk_size
+
+        async def bulk():
+            async with session_factory() as session:
+                await BulkCreateQuestionsUseCase.execute(items, session)
+
+        result["bulk"][chunk_size] = await rows_per_second(bulk, args.rows)
+
+    await engine.dispose()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Бенчмарк создания ответа к «популярному» вопросу.
+
+Засевает вопрос с большим числом ответов (по умолчанию 10 000) и сравнивает:
+- old: загрузку вопроса со всеми ответами (selectinload) + create_answer;
+- new: CreateAnswerUseCase (create_answer с обновлением статистики вопроса).
+
+Запуск:
+    python -m benchmarks.bench_create_answer --answers 10000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.database.models import QuestionModels, AnswerModels
+from app.logs.logger import logger
+from app.repositories.answers import AnswerRepository
+from app.schemas.answers import AnswerSchemas
+from app.use_cases.answers.create_answer import CreateAnswerUseCase
+from benchmarks.common import DEFAULT_URL, make_engine, measure, reset_schema, summarize
+
+SEED_CHUNK = 10_000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--answers", type=int, default=10_000, help="Количество ответов у вопроса")
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    engine = make_engine(args.url)
+    await reset_schema(engine)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    async with session_factory() as session:
+        question = QuestionModels(text="Популярный вопрос")
+        session.add(question)
+        await session.flush()
+        for offset in range(0, args.answers, SEED_CHUNK):
+            await session.execute(insert(AnswerModels), [
+                {"question_id": question.id, "user_id": uuid.uuid4(), "text": f"Ответ {i}"}
+                for i in range(offset, min(offset + SEED_CHUNK, args.answers))
+            ])
+        await session.commit()
+        question_id = question.id
+
+    data = AnswerSchemas(text="Новый ответ", user_id=uuid.uuid4())
+
+    async def old_path():
+        async with session_factory() as session:
+            await session.execute(
+                select(QuestionModels)
+                .where(QuestionModels.id == question_id)
+                .options(selectinload(QuestionModels.answers))
+            )
+            await AnswerRepository.create_answer(question_id, data.text, data.user_id, session)
+
+    async def new_path():
+        async with session_factory() as session:
+            await CreateAnswerUseCase.execute(question_id, data, session)
+
+    result = {
+        "answers": args.answers,
+        "old": summarize(await measure(old_path, args.repeat)),
+        "new": summarize(await measure(new_path, args.repeat)),
+    }
+    await engine.dispose()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,289 @@
+"""Нагрузочный бенчмарк API по сценариям.
+
+Приложение вызывается в том же процессе через httpx.ASGITransport (без сети),
+база — одноразовая (по умолчанию SQLite), перед каждым сценарием она
+пересоздаётся и засевается одинаково (фиксированный seed), поэтому прогоны
+сравнимы между коммитами.
+
+Сценарии (смеси запросов):
+- read_heavy: в основном списки вопросов и вопросы по ID, немного новых ответов;
+- write_heavy: создание вопросов и ответов, пакетные ответы, немного чтения;
+- hot_question: чтение одного популярного вопроса вперемешку с ответами к нему;
+- deep_thread: последовательный обход всех страниц ответов популярного вопроса.
+
+Для каждого сценария выводятся RPS и p50/p95/p99 по каждому эндпоинту (JSON).
+Результат можно сохранить как базовый (--save-baseline) и сравнить с ним
+следующий прогон (--baseline): для каждого эндпоинта печатается отношение
+p99 и RPS, а при ухудшении p99 больше чем на --max-regression код выхода 1.
+
+Запуск:
+    python -m benchmarks.bench_load --requests 2000 --concurrency 20
+    python -m benchmarks.bench_load --baseline benchmarks/baselines/load_sqlite.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from httpx import AsyncClient, ASGITransport, Response
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+# benchmarks.common импортируется раньше app: он задаёт PG_URL по умолчанию.
+from benchmarks.common import DEFAULT_URL, bind_app, make_engine, reset_schema, summarize
+from app.cache.cache import cache
+from app.database.database import database
+from app.database.models import AnswerModels, QuestionModels
+from app.logs.logger import logger
+
+SEED_CHUNK = 5_000
+
+Operation = Callable[[AsyncClient, dict], Awaitable[tuple[str, Response]]]
+
+
+async def list_questions(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    sort = state["rng"].choice(("created", "most_answered", "recent_activity"))
+    return "GET /questions/", await client.get("/questions/", params={"limit": 20, "sort": sort})
+
+
+async def get_question(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    question_id = state["rng"].choice(state["question_ids"])
+    return "GET /questions/{id}", await client.get(f"/questions/{question_id}")
+
+
+async def get_hot_question(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    return "GET /questions/{id}", await client.get(f"/questions/{state['hot_id']}")
+
+
+async def get_answer(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    answer_id = state["rng"].randint(1, state["answers"])
+    return "GET /answers/{id}", await client.get(f"/answers/{answer_id}")
+
+
+async def create_question(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    return "POST /questions/", await client.post("/questions/", params={"text": "Новый вопрос"})
+
+
+async def create_answer(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    question_id = state["rng"].choice(state["question_ids"])
+    return "POST /questions/{id}/answers/", await client.post(
+        f"/questions/{question_id}/answers/", params={"text": "Новый ответ"}
+    )
+
+
+async def answer_hot_question(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    return "POST /questions/{id}/answers/", await client.post(
+        f"/questions/{state['hot_id']}/answers/", params={"text": "Новый ответ"}
+    )
+
+
+async def create_answers_bulk(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    question_id = state["rng"].choice(state["question_ids"])
+    return "POST /questions/{id}/answers/bulk", await client.post(
+        f"/questions/{question_id}/answers/bulk", json=[{"text": f"Ответ {i}"} for i in range(20)]
+    )
+
+
+async def next_hot_answers_page(client: AsyncClient, state: dict) -> tuple[str, Response]:
+    params = {"answers_limit": 50}
+    if state.get("cursor"):
+        params["answers_cursor"] = state["cursor"]
+    response = await client.get(f"/questions/{state['hot_id']}", params=params)
+    if response.status_code == 200:
+        state["cursor"] = response.json()["answers_next_cursor"]
+    return "GET /questions/{id}?answers_cursor", response
+
+
+SCENARIOS: dict[str, list[tuple[Operation, int]]] = {
+    "read_heavy": [(list_questions, 45), (get_question, 35), (get_answer, 15), (create_answer, 5)],
+    "write_heavy": [(create_question, 35), (create_answer, 40), (create_answers_bulk, 10), (list_questions, 15)],
+    "hot_question": [(get_hot_question, 80), (answer_hot_question, 20)],
+    "deep_thread": [(next_hot_answers_page, 100)],
+}
+
+
+async def seed(session_factory: async_sessionmaker, questions: int, hot_answers: int, rng: random.Random) -> dict:
+    """
+    Засевает базу: `questions` вопросов по 0–5 ответов и один «популярный»
+    вопрос с `hot_answers` ответами. Счётчики ответов заполняются сразу.
+
+    return: Данные для сценариев (ID вопросов, ID популярного вопроса, число ответов).
+    """
+    start = datetime(2024, 1, 1)
+    counts = [rng.randint(0, 5) for _ in range(questions)] + [hot_answers]
+    async with session_factory() as session:
+        await session.execute(insert(QuestionModels), [
+            {
+                "text": f"Вопрос {i}",
+                "created_at": start + timedelta(minutes=i),
+                "answer_count": count,
+                "last_answer_at": start + timedelta(minutes=i, seconds=count) if count else None,
+            }
+            for i, count in enumerate(counts)
+        ])
+        question_ids = list((await session.scalars(select(QuestionModels.id).order_by(QuestionModels.id))).all())
+        rows = [
+            {
+                "question_id": question_id,
+                "user_id": uuid.uuid4(),
+                "text": f"Ответ {n}",
+                "created_at": start + timedelta(minutes=i, seconds=n + 1),
+            }
+            for i, (question_id, count) in enumerate(zip(question_ids, counts))
+            for n in range(count)
+        ]
+        for offset in range(0, len(rows), SEED_CHUNK):
+            await session.execute(insert(AnswerModels), rows[offset:offset + SEED_CHUNK])
+        await session.commit()
+    return {"question_ids": question_ids[:-1], "hot_id": question_ids[-1], "answers": len(rows)}
+
+
+async def run_scenario(
+    client: AsyncClient,
+    operations: list[tuple[Operation, int]],
+    data: dict,
+    requests: int,
+    concurrency: int,
+    seed_value: int,
+) -> dict:
+    """
+    Выполняет `requests` запросов сценария `concurrency` воркерами.
+
+    У каждого воркера своё состояние (генератор случайных чисел, курсор),
+    поэтому последовательность запросов воспроизводима.
+    """
+    functions = [operation for operation, _ in operations]
+    weights = [weight for _, weight in operations]
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    remaining = requests
+
+    async def worker(index: int) -> None:
+        nonlocal remaining
+        state = {**data, "rng": random.Random(seed_value * 1000 + index)}
+        while remaining > 0:
+            remaining -= 1
+            operation = state["rng"].choices(functions, weights)[0]
+            started = time.perf_counter()
+            endpoint, response = await operation(client, state)
+            samples.setdefault(endpoint, []).append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors[endpoint] = errors.get(endpoint, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "rps": round(requests / elapsed, 1),
+        "endpoints": {
+            endpoint: {
+                "rps": round(len(values) / elapsed, 1),
+                "errors": errors.get(endpoint, 0),
+                **summarize(values),
+            }
+            for endpoint, values in sorted(samples.items())
+        },
+    }
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> bool:
+    """
+    Печатает сравнение с базовым прогоном и возвращает False при регрессии p99.
+
+    max_regression: Допустимый относительный рост p99 (0.2 — на 20%).
+    """
+    ok = True
+    changed = [
+        key for key, value in report["meta"].items()
+        if key != "url" and baseline.get("meta", {}).get(key) != value
+    ]
+    if changed:
+        print(f"Внимание: параметры прогона отличаются от базового: {', '.join(changed)}", file=sys.stderr)
+    print(f"{'сценарий / эндпоинт':<60} {'p99, мс':>20} {'RPS':>20}", file=sys.stderr)
+    for name, scenario in report["scenarios"].items():
+        base_scenario = baseline.get("scenarios", {}).get(name)
+        if base_scenario is None:
+            continue
+        for endpoint, stats in scenario["endpoints"].items():
+            base = base_scenario["endpoints"].get(endpoint)
+            if base is None or not base["p99_ms"]:
+                continue
+            p99_ratio = stats["p99_ms"] / base["p99_ms"]
+            rps_ratio = stats["rps"] / base["rps"] if base["rps"] else 0.0
+            regressed = p99_ratio > 1 + max_regression
+            ok = ok and not regressed
+            print(
+                f"{name + ' ' + endpoint:<60} "
+                f"{base['p99_ms']:>8} -> {stats['p99_ms']:<8} x{p99_ratio:.2f} "
+                f"{base['rps']:>8} -> {stats['rps']:<8} x{rps_ratio:.2f}"
+                f"{'  РЕГРЕССИЯ' if regressed else ''}",
+                file=sys.stderr,
+            )
+    return ok
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=2000, help="Запросов на сценарий")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=2000)
+    parser.add_argument("--hot-answers", type=int, default=5000, help="Ответов у популярного вопроса")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save-baseline", type=Path, help="Сохранить отчёт как базовый")
+    parser.add_argument("--baseline", type=Path, help="Сравнить с базовым отчётом")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Допустимый рост p99 относительно базового")
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    engine = make_engine(args.url)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    app = bind_app(session_factory)
+    report = {
+        "meta": {
+            "url": engine.url.render_as_string(hide_password=True),
+            "python": platform.python_version(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "questions": args.questions,
+            "hot_answers": args.hot_answers,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for name in args.scenarios:
+            await reset_schema(engine)
+            await cache.clear()
+            data = await seed(session_factory, args.questions, args.hot_answers, random.Random(args.seed))
+            report["scenarios"][name] = await run_scenario(
+                client, SCENARIOS[name], data, args.requests, args.concurrency, args.seed
+            )
+    await engine.dispose()
+    await database.dispose()
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.save_baseline:
+        args.save_baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.save_baseline.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if not compare(report, baseline, args.max_regression):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
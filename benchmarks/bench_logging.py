@@ -0,0 +1,120 @@
+"""Бенчмарк влияния логирования в файл на задержку GET /questions/.
+
+Запросы идут в приложение напрямую через ASGI (httpx.ASGITransport) с
+заданной конкурентностью. Сравниваются режимы логгера `app_logger`:
+- off: вывод в файл отключён;
+- sync: FileHandler прямо на логгере (запись на диск в цикле событий, как было раньше);
+- queue: очередь логов + QueueListener с записью в файл в отдельном потоке.
+
+Консольный вывод во всех режимах отключён, чтобы замерять только файл.
+На локальном диске запись попадает в page cache и почти ничего не стоит;
+`--write-delay-ms` добавляет задержку к каждой записи, имитируя медленный
+или перегруженный диск (сетевой том, fsync соседнего процесса).
+
+Запуск:
+    python -m benchmarks.bench_logging --concurrency 50 --requests 2000 --write-delay-ms 1
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+# benchmarks.common импортируется раньше app: он задаёт PG_URL по умолчанию.
+from benchmarks.common import DEFAULT_URL, bind_app, make_engine, reset_schema, summarize
+from app.cache.cache import cache
+from app.database.database import database
+from app.database.models import QuestionModels
+from app.logs.logger import create_file_handler, create_formatter, create_queue_pipeline, logger
+
+
+def slow_down(handler: logging.Handler, delay_ms: float) -> None:
+    """Добавляет к каждой записи обработчика блокирующую задержку."""
+    emit = handler.emit
+
+    def slow_emit(record: logging.LogRecord) -> None:
+        time.sleep(delay_ms / 1000)
+        emit(record)
+
+    handler.emit = slow_emit
+
+
+async def run_load(client: AsyncClient, concurrency: int, requests: int) -> list[float]:
+    """Выполняет `requests` запросов не более чем по `concurrency` одновременно, возвращает задержки (мс)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get("/questions/", params={"limit": 20})
+            samples.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--write-delay-ms", type=float, default=0, help="Задержка каждой записи в файл, мс")
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    await reset_schema(engine)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    start = datetime(2024, 1, 1)
+    async with session_factory() as session:
+        await session.execute(insert(QuestionModels), [
+            {"text": f"Вопрос {i}", "created_at": start + timedelta(seconds=i)} for i in range(args.questions)
+        ])
+        await session.commit()
+    app = bind_app(session_factory)
+    await cache.clear()
+
+    log_path = Path(tempfile.mkdtemp()) / "bench.log"
+    original_handlers = logger.handlers[:]
+    result = {"concurrency": args.concurrency, "requests": args.requests, "write_delay_ms": args.write_delay_ms}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        for mode in ("off", "sync", "queue"):
+            file_handler = create_file_handler(log_path, rotation="none")
+            file_handler.setFormatter(create_formatter())
+            if args.write_delay_ms:
+                slow_down(file_handler, args.write_delay_ms)
+            listener = None
+            if mode == "off":
+                handlers = [logging.NullHandler()]
+            elif mode == "sync":
+                handlers = [file_handler]
+            else:
+                queue_handler, listener = create_queue_pipeline([file_handler], queue_size=10_000)
+                handlers = [queue_handler]
+                listener.start()
+            logger.handlers = handlers
+            await run_load(client, args.concurrency, args.concurrency)
+            samples = await run_load(client, args.concurrency, args.requests)
+            if listener is not None:
+                listener.stop()
+                result[f"{mode}_dropped"] = queue_handler.stats()["dropped"]
+            file_handler.close()
+            result[mode] = summarize(samples)
+    logger.handlers = original_handlers
+    await engine.dispose()
+    await database.dispose()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Бенчмарк накладных расходов сбора метрик.
+
+Одни и те же запросы выполняются последовательно (без конкурентности, чтобы
+не мерить очереди) в двух режимах, чередующихся на каждом запросе:
+- off: те же маршруты в приложении без MetricsMiddleware, движок без хуков SQLAlchemy;
+- on: приложение с MetricsMiddleware, движок с хуками (как в работе).
+
+Выводится задержка каждого режима и разница медиан на запрос в микросекундах.
+
+Запуск:
+    python -m benchmarks.bench_metrics_overhead --requests 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+# benchmarks.common импортируется раньше app: он задаёт PG_URL по умолчанию.
+from benchmarks.common import DEFAULT_URL, bind_app, make_engine, reset_schema, summarize
+from app.database.database import database
+from app.database.models import QuestionModels
+from app.logs.logger import logger
+from app.monitoring.sql import instrument_engine
+
+PATHS = ("/questions/?limit=20", "/questions/?limit=20&sort=most_answered")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--requests", type=int, default=2000, help="Запросов на режим")
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    plain_engine = make_engine(args.url)
+    instrumented_engine = make_engine(args.url)
+    instrument_engine(instrumented_engine.sync_engine)
+    await reset_schema(plain_engine)
+    start = datetime(2024, 1, 1)
+    async with plain_engine.begin() as conn:
+        await conn.execute(insert(QuestionModels), [
+            {"text": f"Вопрос {i}", "created_at": start + timedelta(seconds=i)} for i in range(100)
+        ])
+    factories = {
+        "off": async_sessionmaker(plain_engine, autoflush=False, expire_on_commit=False),
+        "on": async_sessionmaker(instrumented_engine, autoflush=False, expire_on_commit=False),
+    }
+    app = bind_app(factories["off"])
+    bare_app = FastAPI()
+    bare_app.include_router(app.router)
+    clients = {
+        "off": AsyncClient(transport=ASGITransport(app=bare_app), base_url="http://test"),
+        "on": AsyncClient(transport=ASGITransport(app=app), base_url="http://test"),
+    }
+    samples = {mode: [] for mode in clients}
+    order = list(clients)
+    for i in range(args.requests):
+        # Режимы чередуются на каждом запросе (и меняются местами), чтобы
+        # дрейф скорости машины одинаково влиял на оба.
+        for mode in order if i % 2 else reversed(order):
+            database.session_factory = factories[mode]
+            started = time.perf_counter()
+            response = await clients[mode].get(PATHS[i % len(PATHS)])
+            samples[mode].append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+    for client in clients.values():
+        await client.aclose()
+
+    result = {mode: summarize(values) for mode, values in samples.items()}
+    result["overhead_us_per_request"] = round((result["on"]["p50_ms"] - result["off"]["p50_ms"]) * 1000, 1)
+    await plain_engine.dispose()
+    await instrumented_engine.dispose()
+    await database.dispose()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
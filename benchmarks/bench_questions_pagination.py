@@ -0,0 +1,91 @@
+"""Бенчмарк keyset-пагинации GET /questions/.
+
+Для каждого размера таблицы засевает `questions` и замеряет:
+- первую страницу;
+- «глубокую» страницу (курсор указывает на 90% таблицы);
+- старый вариант — выборку всей таблицы без LIMIT (для сравнения).
+
+Ожидаемый результат: время страницы почти не зависит от размера таблицы,
+тогда как полная выборка растёт линейно.
+
+Запуск:
+    python -m benchmarks.bench_questions_pagination --sizes 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.models import QuestionModels
+from app.repositories.questions import QuestionRepository
+from benchmarks.common import DEFAULT_URL, make_engine, measure, reset_schema, summarize
+
+SEED_CHUNK = 10_000
+
+
+async def seed_questions(session_factory, count: int) -> None:
+    """Засевает `count` вопросов с возрастающим created_at."""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with session_factory() as session:
+        for offset in range(0, count, SEED_CHUNK):
+            rows = [
+                {"text": f"Вопрос {i}", "created_at": start + timedelta(seconds=i)}
+                for i in range(offset, min(offset + SEED_CHUNK, count))
+            ]
+            await session.execute(insert(QuestionModels), rows)
+        await session.commit()
+
+
+async def run_size(url: str, size: int, limit: int, repeat: int) -> dict:
+    engine = make_engine(url)
+    await reset_schema(engine)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    await seed_questions(session_factory, size)
+
+    async with session_factory() as session:
+        deep = (await session.execute(
+            select(QuestionModels.created_at, QuestionModels.id)
+            .order_by(QuestionModels.created_at, QuestionModels.id)
+            .offset(int(size * 0.9)).limit(1)
+        )).one()
+
+        async def first_page():
+            await QuestionRepository.all_questions(session, limit + 1)
+            session.expunge_all()
+
+        async def deep_page():
+            await QuestionRepository.all_questions(session, limit + 1, (deep.created_at, deep.id))
+            session.expunge_all()
+
+        async def full_scan():
+            await session.execute(select(QuestionModels))
+            session.expunge_all()
+
+        result = {
+            "size": size,
+            "first_page": summarize(await measure(first_page, repeat)),
+            "deep_page": summarize(await measure(deep_page, repeat)),
+            "full_scan": summarize(await measure(full_scan, max(1, repeat // 10))),
+        }
+    await engine.dispose()
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    results = [await run_size(args.url, size, args.limit, args.repeat) for size in args.sizes]
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,171 @@
+"""Бенчмарк полнотекстового поиска GET /search на синтетическом корпусе.
+
+Засевает `--rows` документов (10% вопросов, 90% ответов) из слов синтетического
+словаря с распределением Ципфа и сравнивает для запросов с частым, средним и
+редким словом, а также из двух слов (мс на запрос, страница из 20 документов):
+- index: поиск по индексу — GIN по tsvector на PostgreSQL или инвертированный
+  индекс в памяти (app.search.index) на остальных базах, вместе с загрузкой
+  найденных документов;
+- scan: поиск без индекса — LIKE '%слово%' по обеим таблицам без ранжирования
+  (нижняя граница того, что даёт фильтрация «на клиенте»).
+
+Для индекса в памяти дополнительно выводится время его построения из базы.
+На PostgreSQL колонки search_vector и GIN-индексы создаются так же, как в
+миграции full_text_search.
+
+Запуск:
+    python -m benchmarks.bench_search --rows 1000000
+    BENCH_DB_URL=postgresql+asyncpg://... python -m benchmarks.bench_search --rows 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, literal, select, text, union_all
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+# benchmarks.common импортируется раньше app: он задаёт PG_URL по умолчанию.
+from benchmarks.common import DEFAULT_URL, make_engine, measure, reset_schema, summarize
+from app.database.models import AnswerModels, QuestionModels
+from app.logs.logger import logger
+from app.repositories.search import SearchRepository
+from app.search.index import InvertedIndex
+
+SEED_CHUNK = 10_000
+WORDS_PER_DOCUMENT = 8
+LIMIT = 20
+
+SEARCH_DDL = (
+    "ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "to_tsvector('russian'::regconfig, coalesce(text, '')) || "
+    "to_tsvector('english'::regconfig, coalesce(text, ''))) STORED",
+    "CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)",
+    "ANALYZE {table}",
+)
+
+
+def vocabulary(size: int) -> list[str]:
+    """Синтетические «слова» без цифр, чтобы их не разбивал ни один токенизатор."""
+    letters = "бвгдклмнпрст"
+    words = []
+    for i in range(size):
+        word = ""
+        while True:
+            word += letters[i % len(letters)] + "аоиеу"[i % 5]
+            i //= len(letters)
+            if not i:
+                break
+        words.append(word + "ка")
+    return words
+
+
+async def seed(session_factory, rows: int, words: list[str], seed: int) -> None:
+    """Засевает вопросы и ответы случайными текстами из словаря (распределение Ципфа)."""
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    questions = max(rows // 10, 1)
+    start = datetime(2025, 1, 1)
+
+    def texts(count: int) -> list[str]:
+        chosen = rng.choices(words, weights, k=count * WORDS_PER_DOCUMENT)
+        return [" ".join(chosen[i:i + WORDS_PER_DOCUMENT]) for i in range(0, len(chosen), WORDS_PER_DOCUMENT)]
+
+    async with session_factory() as session:
+        for offset in range(0, questions, SEED_CHUNK):
+            count = min(SEED_CHUNK, questions - offset)
+            await session.execute(insert(QuestionModels), [
+                {"text": body, "created_at": start + timedelta(seconds=offset + i)}
+                for i, body in enumerate(texts(count))
+            ])
+        for offset in range(0, rows - questions, SEED_CHUNK):
+            count = min(SEED_CHUNK, rows - questions - offset)
+            await session.execute(insert(AnswerModels), [
+                {"question_id": rng.randint(1, questions), "text": body,
+                 "created_at": start + timedelta(seconds=offset + i)}
+                for i, body in enumerate(texts(count))
+            ])
+        await session.commit()
+
+
+def scan_query(query: str):
+    """Поиск без индекса: все слова запроса через LIKE, первые LIMIT документов."""
+    def matches(column):
+        return [column.like(f"%{word}%") for word in query.split()]
+
+    return union_all(
+        select(literal("question").label("kind"), QuestionModels.id, QuestionModels.text)
+        .where(*matches(QuestionModels.text)),
+        select(literal("answer"), AnswerModels.id, AnswerModels.text)
+        .where(*matches(AnswerModels.text)),
+    ).limit(LIMIT)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Документов в корпусе")
+    parser.add_argument("--vocabulary", type=int, default=50_000, help="Размер словаря")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    engine = make_engine(args.url)
+    postgres = make_url(args.url).get_backend_name() == "postgresql"
+    await reset_schema(engine)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    words = vocabulary(args.vocabulary)
+    started = time.perf_counter()
+    await seed(session_factory, args.rows, words, args.seed)
+    result = {"rows": args.rows, "backend": "postgres" if postgres else "memory",
+              "seed_s": round(time.perf_counter() - started, 1)}
+
+    index = InvertedIndex()
+    if postgres:
+        started = time.perf_counter()
+        async with engine.begin() as conn:
+            for table in ("questions", "answer"):
+                for statement in SEARCH_DDL:
+                    await conn.execute(text(statement.format(table=table)))
+        result["index_build_s"] = round(time.perf_counter() - started, 1)
+    else:
+        index.enabled = True
+        started = time.perf_counter()
+        await index.rebuild(session_factory, 10_000)
+        result["index_build_s"] = round(time.perf_counter() - started, 1)
+
+    queries = {
+        "common": words[9],
+        "medium": words[999],
+        "rare": words[min(19_999, len(words) - 1)],
+        "two_words": f"{words[99]} {words[9]}",
+    }
+    async with session_factory() as session:
+        for name, query in queries.items():
+            async def indexed():
+                if postgres:
+                    await SearchRepository.full_text(query, session, LIMIT + 1)
+                else:
+                    hits = index.search(query, LIMIT + 1)
+                    await SearchRepository.documents(((hit.kind, hit.id) for hit in hits), session)
+
+            async def scan():
+                await session.execute(scan_query(query))
+
+            result[name] = {
+                "query": query,
+                "index": summarize(await measure(indexed, args.repeat)),
+                "scan": summarize(await measure(scan, max(args.repeat // 4, 3))),
+            }
+    await engine.dispose()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
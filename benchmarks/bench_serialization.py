@@ -0,0 +1,106 @@
+"""Микробенчмарк стоимости чтения и сериализации строки списка вопросов.
+
+Сравнивает два пути получения страницы GET /questions/ (мкс на строку):
+- orm: select(QuestionModels) -> ORM-объекты -> QuestionPageResponse с
+  from_attributes -> model_dump(mode="json") -> json.dumps (как делал FastAPI
+  с response_model);
+- rows: select колонок -> Row._asdict() -> question_page_json.dump_json.
+
+Отдельно замеряется только сериализация уже загруженных данных, чтобы
+отделить её от выборки из базы.
+
+Запуск:
+    python -m benchmarks.bench_serialization --rows 50 500
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.models import QuestionModels
+from app.logs.logger import logger
+from app.repositories.questions import QuestionRepository
+from app.schemas.questions import QuestionPageResponse, question_page_json
+from benchmarks.common import DEFAULT_URL, make_engine, reset_schema
+
+
+def orm_dump(questions: list) -> bytes:
+    page = QuestionPageResponse.model_validate({"items": questions, "next_cursor": None})
+    return json.dumps(page.model_dump(mode="json"), ensure_ascii=False).encode()
+
+
+def rows_dump(rows: list) -> bytes:
+    return question_page_json.dump_json({"items": [row._asdict() for row in rows], "next_cursor": None})
+
+
+async def per_row_us(fn, rows: int, repeat: int) -> float:
+    """Лучшее из `repeat` время вызова `fn`, делённое на число строк (мкс)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await result
+        best = min(best, time.perf_counter() - start)
+    return round(best / rows * 1_000_000, 2)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    logger.setLevel(logging.WARNING)
+
+    engine = make_engine(args.url)
+    await reset_schema(engine)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    start = datetime(2024, 1, 1)
+    async with session_factory() as session:
+        await session.execute(insert(QuestionModels), [
+            {"text": f"Вопрос {i}", "created_at": start + timedelta(seconds=i), "answer_count": i % 7}
+            for i in range(max(args.rows))
+        ])
+        await session.commit()
+
+    result = {}
+    async with session_factory() as session:
+        for rows in args.rows:
+            async def orm_path():
+                session.expunge_all()
+                query = select(QuestionModels).order_by(QuestionModels.created_at, QuestionModels.id).limit(rows)
+                orm_dump(list((await session.execute(query)).scalars().all()))
+
+            async def rows_path():
+                rows_dump(await QuestionRepository.all_questions(session, rows))
+
+            session.expunge_all()
+            orm_objects = list((await session.execute(
+                select(QuestionModels).order_by(QuestionModels.id).limit(rows)
+            )).scalars().all())
+            row_tuples = await QuestionRepository.all_questions(session, rows)
+            assert json.loads(orm_dump(orm_objects)) == json.loads(rows_dump(row_tuples))
+
+            result[rows] = {
+                "fetch_and_serialize_us_per_row": {
+                    "orm": await per_row_us(orm_path, rows, args.repeat),
+                    "rows": await per_row_us(rows_path, rows, args.repeat),
+                },
+                "serialize_only_us_per_row": {
+                    "orm": await per_row_us(lambda: orm_dump(orm_objects), rows, args.repeat),
+                    "rows": await per_row_us(lambda: rows_dump(row_tuples), rows, args.repeat),
+                },
+            }
+    await engine.dispose()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,221 @@
+"""Бенчмарк холодного старта и масштабирования по ядрам (app.commands.serve).
+
+Холодный старт (медиана по `--repeat` запускам):
+- import: импорт app.main и create_app() в новом интерпретаторе;
+- uvicorn: от запуска `uvicorn app.main:app` (один процесс) до первого ответа 200;
+- prefork: от запуска `app.commands.serve --workers N` до первого ответа 200,
+  а также время старта воркера после fork (из лога мастера).
+
+Масштабирование: сервер запускается с 1, 2, 4, ... воркерами (до `--max-workers`,
+по умолчанию — число ядер), `--clients` процессов нагрузки держат `--connections`
+keep-alive соединений и `--duration` секунд запрашивают GET /questions/1
+(ответ из кэша — измеряется обработка запроса, а не база; перед замером
+WARMUP секунд прогрева). Выводятся запросы в секунду, на одного воркера
+и эффективность относительно одного воркера.
+Клиенты работают на той же машине и отнимают у сервера процессорное время.
+
+Запуск:
+    python -m benchmarks.bench_startup --repeat 5 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import insert
+
+# benchmarks.common импортируется раньше app: он задаёт PG_URL по умолчанию.
+from benchmarks.common import DEFAULT_URL, make_engine, reset_schema
+from app.commands.serve import default_workers
+from app.database.models import AnswerModels, QuestionModels
+
+ROOT = Path(__file__).resolve().parent.parent
+PATH = "/questions/1"
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); "
+    "from app.main import create_app; create_app(); "
+    "print(time.perf_counter() - started)"
+)
+WARMUP = 2.0
+WORKER_READY = re.compile(r"Воркер \d+ готов за (\d+) мс")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_env(url: str) -> dict:
+    return {**os.environ, "PG_URL": url, "LOG_FILE_ENABLED": "false", "SEARCH_BACKEND": "postgres"}
+
+
+def wait_ok(port: int, timeout: float = 30) -> None:
+    """Ждёт первого ответа 200 на GET PATH."""
+    deadline = time.perf_counter() + timeout
+    request = f"GET {PATH} HTTP/1.1\r\nHost: bench\r\nConnection: close\r\n\r\n".encode()
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1) as sock:
+                sock.sendall(request)
+                if sock.recv(32).startswith(b"HTTP/1.1 200"):
+                    return
+        except OSError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"Сервер на порту {port} не ответил за {timeout} с")
+
+
+def start_server(command: list[str], url: str, log_path: Path) -> tuple[subprocess.Popen, int, float]:
+    """Запускает сервер и ждёт первого ответа; возвращает процесс, порт и время до ответа, мс."""
+    port = free_port()
+    started = time.perf_counter()
+    with open(log_path, "w") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", *command, "--port", str(port)],
+            cwd=ROOT, env=server_env(url), stdout=log, stderr=subprocess.STDOUT,
+        )
+    try:
+        wait_ok(port)
+    except TimeoutError:
+        process.kill()
+        raise
+    return process, port, (time.perf_counter() - started) * 1000
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+async def load_connection(port: int, deadline: float) -> tuple[int, int]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET {PATH} HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+    done = errors = 0
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(request)
+            status = await reader.readline()
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.partition(b":")
+                if name.lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            if status.startswith(b"HTTP/1.1 200"):
+                done += 1
+            else:
+                errors += 1
+    finally:
+        writer.close()
+    return done, errors
+
+
+def load_client(port: int, connections: int, duration: float) -> tuple[int, int]:
+    """Процесс нагрузки: `connections` keep-alive соединений на `duration` секунд."""
+    async def run():
+        deadline = time.perf_counter() + duration
+        results = await asyncio.gather(*(load_connection(port, deadline) for _ in range(connections)))
+        return sum(done for done, _ in results), sum(errors for _, errors in results)
+
+    return asyncio.run(run())
+
+
+def cold_start(url: str, repeat: int, workers: int, log_path: Path) -> dict:
+    imports, uvicorn_ms, prefork_ms, worker_ready_ms = [], [], [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, env=server_env(url),
+            capture_output=True, text=True, check=True,
+        ).stdout
+        imports.append(float(output.strip().splitlines()[-1]) * 1000)
+
+        process, _, elapsed = start_server(["uvicorn", "app.main:app", "--no-access-log"], url, log_path)
+        uvicorn_ms.append(elapsed)
+        stop_server(process)
+
+        process, _, elapsed = start_server(["app.commands.serve", "--workers", str(workers)], url, log_path)
+        prefork_ms.append(elapsed)
+        stop_server(process)
+        worker_ready_ms.extend(int(ms) for ms in WORKER_READY.findall(log_path.read_text()))
+    return {
+        "import_create_app_ms": round(statistics.median(imports), 1),
+        "uvicorn_first_response_ms": round(statistics.median(uvicorn_ms), 1),
+        f"prefork_{workers}_first_response_ms": round(statistics.median(prefork_ms), 1),
+        "prefork_worker_fork_to_ready_ms": round(statistics.median(worker_ready_ms), 1),
+    }
+
+
+def scaling(url: str, max_workers: int, clients: int, connections: int, duration: float, log_path: Path) -> dict:
+    result = {}
+    counts = sorted({1, *(2 ** i for i in range(1, max_workers.bit_length()) if 2 ** i <= max_workers), max_workers})
+    for workers in counts:
+        process, port, _ = start_server(["app.commands.serve", "--workers", str(workers)], url, log_path)
+        try:
+            with ProcessPoolExecutor(clients) as pool:
+                # Прогрев: кэш и пулы соединений воркеров заполняются до замера.
+                for future in [pool.submit(load_client, port, connections, WARMUP) for _ in range(clients)]:
+                    future.result()
+                futures = [pool.submit(load_client, port, connections, duration) for _ in range(clients)]
+                outcomes = [future.result() for future in futures]
+        finally:
+            stop_server(process)
+        done = sum(ok for ok, _ in outcomes)
+        rps = done / duration
+        result[workers] = {
+            "rps": round(rps, 1),
+            "rps_per_worker": round(rps / workers, 1),
+            "errors": sum(errors for _, errors in outcomes),
+        }
+    base = result[1]["rps"]
+    for workers, row in result.items():
+        row["efficiency"] = round(row["rps"] / (base * workers), 2) if base else 0.0
+    return result
+
+
+async def seed(url: str) -> None:
+    engine = make_engine(url)
+    await reset_schema(engine)
+    async with engine.begin() as conn:
+        await conn.execute(insert(QuestionModels), [{"text": "Вопрос"}])
+        await conn.execute(insert(AnswerModels), [{"question_id": 1, "text": f"Ответ {i}"} for i in range(20)])
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--repeat", type=int, default=5, help="Запусков для холодного старта")
+    parser.add_argument("--max-workers", type=int, default=default_workers())
+    parser.add_argument("--clients", type=int, default=2, help="Процессов нагрузки")
+    parser.add_argument("--connections", type=int, default=32, help="Соединений на процесс нагрузки")
+    parser.add_argument("--duration", type=float, default=10, help="Секунд нагрузки на каждое число воркеров")
+    args = parser.parse_args()
+
+    asyncio.run(seed(args.url))
+    log_path = Path(tempfile.gettempdir()) / "qa_bench_server.log"
+    result = {
+        "cpus": default_workers(),
+        "cold_start": cold_start(args.url, args.repeat, args.max_workers, log_path),
+        "scaling": scaling(args.url, args.max_workers, args.clients, args.connections, args.duration, log_path),
+    }
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
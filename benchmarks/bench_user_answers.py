@@ -0,0 +1,154 @@
+"""Бенчмарк ответов пользователя: GET /users/{user_id}/answers и удаление пачками.
+
+Засевает `--answers` ответов (по умолчанию 2 млн) на `--questions` вопросов от
+`--users` пользователей; двое «активных» пользователей получают по `--heavy`
+ответов каждый. Замеряет:
+- первую и «глубокую» (курсор на 90% ответов пользователя) страницу
+  AnswerRepository.answers_by_user — с индексом ix_answer_user_id_created_at_id
+  и без него (индекс удаляется, запрос сканирует таблицу);
+- время построения индекса;
+- удаление всех ответов активного пользователя пачками по `--chunk-size`
+  (delete_answers_by_user: общее время и самая долгая транзакция) против одного
+  DELETE по user_id одной транзакцией для второго активного пользователя
+  (без пересчёта статистики вопросов — нижняя граница для одной транзакции).
+
+Ожидаемый результат: страница с индексом не зависит от размера таблицы,
+без индекса — растёт линейно; при удалении пачками ни одна транзакция не
+держит блокировки дольше, чем нужно на `--chunk-size` строк.
+
+Запуск:
+    python -m benchmarks.bench_user_answers --answers 2000000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.models import AnswerModels, QuestionModels
+from app.repositories.answers import AnswerRepository
+from benchmarks.common import DEFAULT_URL, make_engine, measure, reset_schema, summarize
+
+SEED_CHUNK = 10_000
+INDEX = "ix_answer_user_id_created_at_id"
+
+
+async def seed(session_factory, answers: int, questions: int, users: int, heavy: int) -> tuple[uuid.UUID, uuid.UUID]:
+    """Засевает вопросы и ответы; возвращает UUID двух активных пользователей."""
+    rng = random.Random(42)
+    user_ids = [uuid.uuid4() for _ in range(users)]
+    heavy_users = user_ids[:2]
+    # Позиции ответов активных пользователей равномерно распределены по таблице.
+    heavy_at = {position: heavy_users[n % 2] for n, position in enumerate(rng.sample(range(answers), 2 * heavy))}
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with session_factory() as session:
+        await session.execute(insert(QuestionModels), [
+            {"text": f"Вопрос {i}", "created_at": start, "answer_count": 0} for i in range(questions)
+        ])
+        for offset in range(0, answers, SEED_CHUNK):
+            await session.execute(insert(AnswerModels), [
+                {
+                    "question_id": rng.randint(1, questions),
+                    "user_id": heavy_at.get(i) or user_ids[rng.randrange(2, users)],
+                    "text": f"Ответ {i}",
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + SEED_CHUNK, answers))
+            ])
+        await session.commit()
+    return heavy_users[0], heavy_users[1]
+
+
+async def pages(session_factory, user_id: uuid.UUID, heavy: int, limit: int, repeat: int) -> dict:
+    async with session_factory() as session:
+        deep = (await session.execute(
+            select(AnswerModels.created_at, AnswerModels.id)
+            .where(AnswerModels.user_id == user_id)
+            .order_by(AnswerModels.created_at.desc(), AnswerModels.id.desc())
+            .offset(int(heavy * 0.9)).limit(1)
+        )).one()
+
+        async def first_page():
+            await AnswerRepository.answers_by_user(user_id, session, limit + 1)
+
+        async def deep_page():
+            await AnswerRepository.answers_by_user(user_id, session, limit + 1, (deep.created_at, deep.id))
+
+        return {
+            "first_page": summarize(await measure(first_page, repeat)),
+            "deep_page": summarize(await measure(deep_page, repeat)),
+        }
+
+
+async def delete_chunked(session_factory, user_id: uuid.UUID, chunk_size: int) -> dict:
+    started = time.perf_counter()
+    longest = 0.0
+    deleted = chunks = 0
+    while True:
+        chunk_started = time.perf_counter()
+        async with session_factory() as session:
+            rows = await AnswerRepository.delete_answers_by_user(user_id, session, chunk_size)
+        longest = max(longest, time.perf_counter() - chunk_started)
+        deleted += len(rows)
+        chunks += 1
+        if len(rows) < chunk_size:
+            break
+    return {
+        "deleted": deleted,
+        "chunks": chunks,
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "longest_transaction_ms": round(longest * 1000, 2),
+    }
+
+
+async def delete_single(session_factory, user_id: uuid.UUID) -> dict:
+    started = time.perf_counter()
+    async with session_factory() as session:
+        result = await session.execute(delete(AnswerModels).where(AnswerModels.user_id == user_id))
+        await session.commit()
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+    return {"deleted": result.rowcount, "total_ms": elapsed, "longest_transaction_ms": elapsed}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="URL одноразовой базы (схема пересоздаётся)")
+    parser.add_argument("--answers", type=int, default=2_000_000)
+    parser.add_argument("--questions", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--heavy", type=int, default=20_000, help="Ответов у каждого из двух активных пользователей")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    await reset_schema(engine)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    started = time.perf_counter()
+    chunked_user, single_user = await seed(session_factory, args.answers, args.questions, args.users, args.heavy)
+    result = {"answers": args.answers, "seed_s": round(time.perf_counter() - started, 1)}
+
+    result["with_index"] = await pages(session_factory, chunked_user, args.heavy, args.limit, args.repeat)
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP INDEX {INDEX}"))
+    result["without_index"] = await pages(session_factory, chunked_user, args.heavy, args.limit, max(1, args.repeat // 10))
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE INDEX {INDEX} ON answer (user_id, created_at, id)"))
+    result["index_build_s"] = round(time.perf_counter() - started, 1)
+
+    result["delete_chunked"] = await delete_chunked(session_factory, chunked_user, args.chunk_size)
+    result["delete_single_statement"] = await delete_single(session_factory, single_user)
+    await engine.dispose()
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
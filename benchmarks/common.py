@@ -0,0 +1,90 @@
+"""Общие утилиты для бенчмарков.
+
+Бенчмарки работают с отдельной (одноразовой) базой данных: перед замером
+схема пересоздаётся, поэтому НЕ указывайте в BENCH_DB_URL рабочую базу.
+По умолчанию используется временный файл SQLite (драйвер aiosqlite)."""
+
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.database.models import Base
+
+DEFAULT_URL = os.getenv(
+    "BENCH_DB_URL",
+    f"sqlite+aiosqlite:///{Path(tempfile.gettempdir()) / 'qa_bench.db'}",
+)
+
+# Настройки приложения читают PG_URL при импорте app.config. Движок приложения
+# создаётся лениво, но URL должен быть задан; запросы бенчмарков всё равно идут
+# в базу бенчмарка (см. bind_app).
+os.environ.setdefault("PG_URL", DEFAULT_URL)
+
+
+def make_engine(url: str = DEFAULT_URL) -> AsyncEngine:
+    """Создаёт движок для бенчмарка."""
+    return create_async_engine(url)
+
+
+async def reset_schema(engine: AsyncEngine) -> None:
+    """Пересоздаёт все таблицы приложения в базе бенчмарка."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def bind_app(session_factory: async_sessionmaker):
+    """
+    Возвращает ASGI-приложение, сессии которого открываются в базе бенчмарка.
+
+    session_factory: Фабрика сессий базы бенчмарка.
+    """
+    from app.database.database import database
+    from app.main import create_app
+
+    app = create_app()
+    database.session_factory = session_factory
+    database.replica_session_factories = []
+    return app
+
+
+async def measure(fn: Callable[[], Awaitable[object]], repeat: int) -> list[float]:
+    """
+    Выполняет корутину `repeat` раз и возвращает длительности в миллисекундах.
+
+    fn: Фабрика корутины для одного замера.
+    repeat: Количество повторов.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples: list[float], p: float) -> float:
+    """Возвращает перцентиль `p` (0..100) по выборке."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (k - lower)
+
+
+def summarize(samples: list[float]) -> dict:
+    """Сводка по выборке замеров (мс)."""
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples), 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+    }
@@ -0,0 +1,53 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_questions_and_answers(sqlite_app):
+    """
+        Проверяет эндпоинты POST /questions/bulk и POST /questions/{id}/answers/bulk.
+
+        Логика теста:
+        - Создаются 3 вопроса пачкой, ID возвращаются в порядке элементов.
+        - К первому вопросу пачкой добавляются 2 ответа.
+        - Вопрос содержит ровно эти ответы.
+    """
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        response = await client.post("/questions/bulk", json=[{"text": f"Вопрос {i}"} for i in range(3)])
+        assert response.status_code == 200
+        ids = response.json()["ids"]
+        assert len(ids) == 3
+
+        response = await client.post(f"/questions/{ids[0]}/answers/bulk", json=[{"text": "a"}, {"text": "b"}])
+        assert response.status_code == 200
+        answer_ids = response.json()["ids"]
+
+        question = (await client.get(f"/questions/{ids[0]}")).json()
+
+    assert question["text"] == "Вопрос 0"
+    assert [a["id"] for a in question["answers"]] == answer_ids
+    assert [a["text"] for a in question["answers"]] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_item_errors(sqlite_app):
+    """
+        Проверяет, что ошибки валидации возвращаются по элементам и ничего не сохраняется.
+        Пустая пачка отклоняется и не меняет вопрос (ETag прежний).
+    """
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        response = await client.post("/questions/bulk", json=[{"text": "ok"}, {"title": "bad"}, "bad"])
+        assert response.status_code == 422
+        assert [error["index"] for error in response.json()["detail"]] == [1, 2]
+
+        response = await client.post("/questions/404/answers/bulk", json=[{"text": "a"}])
+        assert response.status_code == 404
+        assert (await client.post("/questions/bulk", json=[])).status_code == 422
+
+        page = (await client.get("/questions/")).json()
+        assert page["items"] == []
+
+        question_id = (await client.post("/questions/", params={"text": "Вопрос"})).json()["id"]
+        etag = (await client.get(f"/questions/{question_id}")).headers["etag"]
+        assert (await client.post(f"/questions/{question_id}/answers/bulk", json=[])).status_code == 422
+        assert (await client.get(f"/questions/{question_id}")).headers["etag"] == etag
@@ -0,0 +1,39 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.cache.cache import cache
+
+
+@pytest.mark.asyncio
+async def test_cached_question_and_answer_are_invalidated(sqlite_app):
+    """
+        Проверяет, что кэш GET /questions/{id} и GET /answers/{id} инвалидируется записью.
+
+        Логика теста:
+        - Вопрос читается дважды: второй раз — из кэша (поколение вопроса и страница).
+        - После добавления ответа вопрос содержит новый ответ.
+        - После удаления ответа он пропадает из вопроса, а GET /answers/{id} даёт 404.
+        - После удаления вопроса оставшиеся ответы тоже недоступны.
+    """
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        question_id = (await client.post("/questions/", params={"text": "Вопрос"})).json()["id"]
+        await client.get(f"/questions/{question_id}")
+        hits = cache.stats()["hits"]
+        assert (await client.get(f"/questions/{question_id}")).json()["answers"] == []
+        assert cache.stats()["hits"] == hits + 2
+
+        first = (await client.post(f"/questions/{question_id}/answers/", params={"text": "a"})).json()["id"]
+        second = (await client.post(f"/questions/{question_id}/answers/", params={"text": "b"})).json()["id"]
+        question = (await client.get(f"/questions/{question_id}")).json()
+        assert [a["id"] for a in question["answers"]] == [first, second]
+
+        assert (await client.get(f"/answers/{first}")).status_code == 200
+        assert (await client.delete(f"/answers/{first}")).status_code == 200
+        assert (await client.get(f"/answers/{first}")).status_code == 404
+        question = (await client.get(f"/questions/{question_id}")).json()
+        assert [a["id"] for a in question["answers"]] == [second]
+
+        assert (await client.get(f"/answers/{second}")).status_code == 200
+        assert (await client.delete(f"/questions/{question_id}")).status_code == 200
+        assert (await client.get(f"/answers/{second}")).status_code == 404
+        assert (await client.get(f"/questions/{question_id}")).status_code == 404
@@ -0,0 +1,91 @@
+import json
+import tracemalloc
+import uuid
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+
+from app.database.models import QuestionModels, AnswerModels
+from app.use_cases.export.export_questions import ExportQuestionsUseCase
+
+
+async def seed(session_factory, questions: int, answers_per_question: int) -> None:
+    async with session_factory() as session:
+        await session.execute(
+            insert(QuestionModels),
+            [{"id": i, "text": f"Вопрос {i}"} for i in range(1, questions + 1)],
+        )
+        await session.execute(
+            insert(AnswerModels),
+            [
+                {"question_id": i, "user_id": uuid.uuid4(), "text": f"Ответ {j} на {i}"}
+                for i in range(1, questions + 1)
+                for j in range(answers_per_question)
+            ],
+        )
+        await session.commit()
+
+
+async def export_peak_memory(session_factory) -> tuple[int, int]:
+    """Выгружает всё, не накапливая результат, и возвращает (число строк, пик памяти в байтах)."""
+    lines = 0
+    tracemalloc.start()
+    try:
+        async with session_factory() as session:
+            async for chunk in ExportQuestionsUseCase.execute(session, chunk_size=64 * 1024, yield_per=500):
+                lines += chunk.count(b"\n")
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return lines, peak
+
+
+@pytest.mark.asyncio
+async def test_export_questions_ndjson(sqlite_app, sqlite_session_factory):
+    """
+        Проверяет эндпоинт GET /export/questions.ndjson.
+
+        Логика теста:
+        - В пустую базу добавляются 3 вопроса по 2 ответа и вопрос без ответов.
+        - Каждая строка ответа — отдельный JSON-объект вопроса со списком ответов.
+    """
+    await seed(sqlite_session_factory, questions=3, answers_per_question=2)
+    async with sqlite_session_factory() as session:
+        session.add(QuestionModels(id=4, text="Без ответов"))
+        await session.commit()
+
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        response = await client.get("/export/questions.ndjson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [q["id"] for q in lines] == [1, 2, 3, 4]
+    assert [len(q["answers"]) for q in lines] == [2, 2, 2, 0]
+    assert all(a["question_id"] == 1 for a in lines[0]["answers"])
+
+
+@pytest.mark.asyncio
+async def test_export_questions_memory_is_bounded(sqlite_session_factory):
+    """
+        Проверяет, что пик памяти при выгрузке не растёт вместе с размером таблиц.
+
+        Логика теста:
+        - Выгружаются 2 000 вопросов, затем база дополняется до 8 000.
+        - Пик выделенной памяти во втором прогоне не должен заметно превышать первый.
+    """
+    await seed(sqlite_session_factory, questions=2_000, answers_per_question=3)
+    small_lines, small_peak = await export_peak_memory(sqlite_session_factory)
+
+    async with sqlite_session_factory() as session:
+        await session.execute(
+            insert(QuestionModels),
+            [{"id": i, "text": f"Вопрос {i}"} for i in range(2_001, 8_001)],
+        )
+        await session.commit()
+    large_lines, large_peak = await export_peak_memory(sqlite_session_factory)
+
+    assert small_lines == 2_000
+    assert large_lines == 8_000
+    assert large_peak < small_peak * 1.5
@@ -11,7 +11,7 @@ async def test_get_all_questions_structure():
         Логика теста:
         - Отправляется GET-запрос к /questions/.
         - Проверяется, что статус ответа 200.
-        - Проверяется, что ответ является списком.
+        - Проверяется, что ответ содержит страницу: список items и курсор next_cursor.
         - Для каждого вопроса проверяются обязательные поля: id, text, created_at.
     """
     async with AsyncClient(
@@ -23,10 +23,24 @@ async def test_get_all_questions_structure():
     assert response.status_code == 200
 
     data = response.json()
-    assert isinstance(data, list)
+    assert isinstance(data["items"], list)
+    assert "next_cursor" in data
 
-    for question in data:
+    for question in data["items"]:
         assert "id" in question
         assert "text" in question
         assert "created_at" in question
 
+
+@pytest.mark.asyncio
+async def test_get_all_questions_invalid_cursor():
+    """
+        Проверяет, что повреждённый курсор отклоняется с кодом 400.
+    """
+    async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test"
+    ) as client:
+        response = await client.get("/questions/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import func, select
+
+from app.database.models import AnswerModels, QuestionModels
+from app.idempotency.middleware import idempotency_scope
+from app.idempotency.store import idempotency_store
+from app.repositories.idempotency import IdempotencyRepository
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_response(sqlite_app, sqlite_session_factory, monkeypatch):
+    """
+        Проверяет заголовок Idempotency-Key у POST /questions/ и POST /questions/{id}/answers/.
+
+        Логика теста:
+        - Повтор запроса с тем же ключом возвращает тот же ответ с Idempotent-Replayed,
+          новая строка не создаётся — и из LRU, и из таблицы (LRU очищен).
+        - Одновременные дубликаты создают один ответ и получают одинаковый ID.
+        - Тот же ключ с другим телом даёт 422.
+        - Ключи разделяются по IP: X-Client-Id (его задаёт сам вызывающий) не даёт отдельной
+          области, тот же ключ с другого IP — отдельный запрос; X-Client-Id учитывается только
+          в режиме "client".
+        - Запросы без ключа не затрагиваются.
+    """
+    monkeypatch.setattr(idempotency_store, "session_factory", sqlite_session_factory)
+    await idempotency_store.clear()
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        headers = {"Idempotency-Key": "question-1"}
+        first = await client.post("/questions/", params={"text": "Вопрос"}, headers=headers)
+        replayed = await client.post("/questions/", params={"text": "Вопрос"}, headers=headers)
+        assert first.status_code == replayed.status_code == 200
+        assert replayed.json() == first.json()
+        assert replayed.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+
+        await idempotency_store.clear()
+        from_table = await client.post("/questions/", params={"text": "Вопрос"}, headers=headers)
+        assert from_table.json() == first.json()
+
+        other = await client.post("/questions/", params={"text": "Другой"}, headers=headers)
+        assert other.status_code == 422
+
+        spoofed = await client.post(
+            "/questions/", params={"text": "Другой"}, headers={**headers, "X-Client-Id": "second"}
+        )
+        assert spoofed.status_code == 422
+        other_ip = ASGITransport(app=sqlite_app, client=("10.0.0.2", 123))
+        async with AsyncClient(transport=other_ip, base_url="http://test") as second_client:
+            same_body = await second_client.post("/questions/", params={"text": "Вопрос"}, headers=headers)
+        assert "idempotent-replayed" not in same_body.headers
+        assert same_body.json()["id"] != first.json()["id"]
+
+        question_id = first.json()["id"]
+        answers = await asyncio.gather(*(
+            client.post(
+                f"/questions/{question_id}/answers/",
+                params={"text": "Ответ"},
+                headers={"Idempotency-Key": "answer-1"},
+            )
+            for _ in range(5)
+        ))
+        assert {response.json()["id"] for response in answers} == {answers[0].json()["id"]}
+
+        await client.post("/questions/", params={"text": "Вопрос"})
+
+    async with sqlite_session_factory() as session:
+        assert await session.scalar(select(func.count()).select_from(QuestionModels)) == 3
+        assert await session.scalar(select(func.count()).select_from(AnswerModels)) == 1
+
+    proxied = {"type": "http", "headers": [(b"x-client-id", b"bff")], "client": ("10.0.0.1", 1)}
+    assert idempotency_scope(proxied, "ip") == "ip:10.0.0.1"
+    assert idempotency_scope(proxied, "client") == "client:bff"
+
+
+@pytest.mark.asyncio
+async def test_idempotency_abandoned_claim_is_taken_over(sqlite_app, sqlite_session_factory, monkeypatch):
+    """
+        Проверяет ключ, брошенный упавшим процессом.
+
+        Логика теста:
+        - Ключ захвачен, ответ не сохранён, аренда истекла — повтор выполняет запрос
+          и сохраняет ответ, следующий повтор получает его.
+        - Пока аренда не истекла, повтор ждёт и получает 409.
+    """
+    monkeypatch.setattr(idempotency_store, "session_factory", sqlite_session_factory)
+    monkeypatch.setattr(idempotency_store, "wait_timeout", 0.2)
+    await idempotency_store.clear()
+    now = datetime.now(timezone.utc)
+    async with sqlite_session_factory() as session:
+        owner = "ip:127.0.0.1"
+        await IdempotencyRepository.claim(owner, "abandoned", "crashed", now - timedelta(seconds=1), now, session)
+        await IdempotencyRepository.claim(owner, "running", "crashed", now + timedelta(minutes=1), now, session)
+
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        headers = {"Idempotency-Key": "running"}
+        running = await client.post("/questions/", params={"text": "Вопрос"}, headers=headers)
+        assert running.status_code == 409
+
+        headers = {"Idempotency-Key": "abandoned"}
+        first = await client.post("/questions/", params={"text": "Вопрос"}, headers=headers)
+        assert first.status_code == 200
+        assert "idempotent-replayed" not in first.headers
+        await idempotency_store.clear()
+        replayed = await client.post("/questions/", params={"text": "Вопрос"}, headers=headers)
+        assert replayed.headers["idempotent-replayed"] == "true"
+        assert replayed.json() == first.json()
+
+    async with sqlite_session_factory() as session:
+        assert await session.scalar(select(func.count()).select_from(QuestionModels)) == 1
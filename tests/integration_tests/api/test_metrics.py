@@ -0,0 +1,44 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.monitoring.sql import instrument_engine
+
+DURATION_COUNT = 'http_request_duration_seconds_count{method="GET",route="/questions/{id}",status="200"}'
+STATEMENTS_LE_2 = 'db_statements_per_request_bucket{method="GET",route="/questions/{id}",le="2"}'
+
+
+def metric_value(text: str, series: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_server_timing_and_prometheus_metrics(sqlite_app, sqlite_session_factory):
+    """
+        Проверяет заголовок Server-Timing и текстовые метрики /metrics.
+
+        Логика теста:
+        - Хуки SQLAlchemy подключаются к движку временной базы.
+        - Первое чтение вопроса делает 2 SQL-запроса (вопрос и страница ответов),
+          повторное отдаётся из кэша без запросов — счётчик попадает в запрос
+          через contextvar, в том числе из greenlet'а SQLAlchemy.
+        - /metrics отдаёт гистограммы по шаблону маршрута в формате Prometheus
+          (реестр общий для процесса, поэтому сравниваются приращения).
+    """
+    instrument_engine(sqlite_session_factory.kw["bind"].sync_engine)
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        before = (await client.get("/metrics")).text
+        question_id = (await client.post("/questions/", params={"text": "Вопрос"})).json()["id"]
+        first = await client.get(f"/questions/{question_id}")
+        second = await client.get(f"/questions/{question_id}")
+        assert 'desc="2 queries"' in first.headers["server-timing"]
+        assert 'desc="0 queries"' in second.headers["server-timing"]
+
+        response = await client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert metric_value(text, DURATION_COUNT) - metric_value(before, DURATION_COUNT) == 2
+        assert metric_value(text, STATEMENTS_LE_2) - metric_value(before, STATEMENTS_LE_2) == 2
+        assert "# TYPE db_pool_checkouts_total counter" in text
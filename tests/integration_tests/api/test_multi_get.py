@@ -0,0 +1,64 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+
+from app.config import settings
+from app.database.models import AnswerModels, QuestionModels
+
+
+@pytest.mark.asyncio
+async def test_questions_and_answers_by_ids(sqlite_app, sqlite_session_factory, monkeypatch):
+    """
+        Проверяет GET /questions/?ids=... и GET /answers?ids=....
+
+        Логика теста:
+        - Элементы возвращаются в порядке запрошенных ID (с повторами), ненайденные — с found: false;
+          ID вне диапазона INTEGER тоже found: false, а не ошибка драйвера.
+        - Вопросы и ответы выбираются одним запросом каждый.
+        - Нечисловой ID даёт 422, превышение MULTI_GET_MAX_IDS — 413.
+    """
+    async with sqlite_session_factory() as session:
+        questions = [QuestionModels(text=f"Вопрос {i}") for i in range(3)]
+        session.add_all(questions)
+        await session.flush()
+        answers = [AnswerModels(question_id=questions[0].id, user_id=uuid.uuid4(), text=f"Ответ {i}") for i in range(2)]
+        session.add_all(answers)
+        await session.commit()
+    q1, q2, q3 = (question.id for question in questions)
+    a1, a2 = (answer.id for answer in answers)
+
+    engine = sqlite_session_factory.kw["bind"].sync_engine
+    statements = []
+
+    def count_selects(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_selects)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+            body = (await client.get("/questions/", params={"ids": f"{q3},999,{q1},{q3}"})).json()
+            assert [(item["id"], item["found"]) for item in body["items"]] == [
+                (q3, True), (999, False), (q1, True), (q3, True)
+            ]
+            assert body["items"][0]["question"]["text"] == "Вопрос 2"
+            assert body["items"][1]["question"] is None
+            assert len(statements) == 1
+
+            body = (await client.get("/answers", params={"ids": f"{a2},{a1},0"})).json()
+            assert [(item["id"], item["found"]) for item in body["items"]] == [(a2, True), (a1, True), (0, False)]
+            assert body["items"][0]["answer"]["text"] == "Ответ 1"
+            assert len(statements) == 2
+
+            body = (await client.get("/answers", params={"ids": f"99999999999999999999,{a1},-5,{2 ** 31}"})).json()
+            assert [(item["id"], item["found"]) for item in body["items"]] == [
+                (99999999999999999999, False), (a1, True), (-5, False), (2 ** 31, False)
+            ]
+
+            assert (await client.get("/answers", params={"ids": "1,x"})).status_code == 422
+            monkeypatch.setattr(settings, "MULTI_GET_MAX_IDS", 2)
+            assert (await client.get("/questions/", params={"ids": f"{q1},{q2},{q3}"})).status_code == 413
+    finally:
+        event.remove(engine, "before_cursor_execute", count_selects)
@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert
+
+from app.database.models import AnswerModels, QuestionModels
+
+
+@pytest.mark.asyncio
+async def test_question_answers_are_paginated(sqlite_app, sqlite_session_factory):
+    """
+        Проверяет постраничную выдачу ответов в GET /questions/{id}.
+
+        Логика теста:
+        - У вопроса 5 ответов; при answers_limit=2 они отдаются страницами 2 + 2 + 1
+          в порядке (created_at, id), у последней страницы нет курсора.
+        - answer_count содержит общее количество ответов.
+        - Добавление ответа инвалидирует все закэшированные страницы вопроса.
+        - Повреждённый курсор даёт 400.
+    """
+    start = datetime(2024, 1, 1)
+    async with sqlite_session_factory() as session:
+        question = QuestionModels(text="Вопрос", answer_count=5, created_at=start)
+        session.add(question)
+        await session.flush()
+        question_id = question.id
+        await session.execute(insert(AnswerModels), [
+            {"question_id": question_id, "user_id": uuid.uuid4(), "text": f"{i}",
+             "created_at": start + timedelta(seconds=i // 2)}
+            for i in range(5)
+        ])
+        await session.commit()
+
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        texts, cursor = [], None
+        for _ in range(3):
+            params = {"answers_limit": 2}
+            if cursor:
+                params["answers_cursor"] = cursor
+            page = (await client.get(f"/questions/{question_id}", params=params)).json()
+            assert page["answer_count"] == 5
+            texts.append([answer["text"] for answer in page["answers"]])
+            cursor = page["answers_next_cursor"]
+        assert texts == [["0", "1"], ["2", "3"], ["4"]]
+        assert cursor is None
+
+        await client.post(f"/questions/{question_id}/answers/", params={"text": "5"})
+        page = (await client.get(f"/questions/{question_id}", params={"answers_limit": 2})).json()
+        assert page["answer_count"] == 6
+        assert page["answers_next_cursor"] is not None
+
+        response = await client.get(f"/questions/{question_id}", params={"answers_cursor": "broken"})
+        assert response.status_code == 400
@@ -0,0 +1,53 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.cache.cache import cache
+
+
+@pytest.mark.asyncio
+async def test_question_etag_and_not_modified(sqlite_app):
+    """
+        Проверяет условные запросы к GET /questions/{id}.
+
+        Логика теста:
+        - Ответ содержит ETag, Last-Modified и Cache-Control: no-cache.
+        - If-None-Match с текущим ETag даёт 304 без тела — и из кэша, и из базы.
+        - If-Modified-Since не раньше Last-Modified тоже даёт 304.
+        - Добавление и удаление ответа поднимают версию: старый ETag больше не совпадает.
+        - Список вопросов и ответ отдаются с Cache-Control: max-age.
+    """
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        question_id = (await client.post("/questions/", params={"text": "Вопрос"})).json()["id"]
+        first = await client.get(f"/questions/{question_id}")
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "no-cache"
+        assert "last-modified" in first.headers
+
+        cached = await client.get(f"/questions/{question_id}", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+        await cache.clear()
+        from_db = await client.get(f"/questions/{question_id}", headers={"If-None-Match": f"W/{etag}"})
+        assert from_db.status_code == 304
+        since = await client.get(
+            f"/questions/{question_id}",
+            headers={"If-Modified-Since": first.headers["last-modified"]}
+        )
+        assert since.status_code == 304
+
+        answer_id = (await client.post(f"/questions/{question_id}/answers/", params={"text": "Ответ"})).json()["id"]
+        changed = await client.get(f"/questions/{question_id}", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert changed.json()["answer_count"] == 1
+
+        await client.delete(f"/answers/{answer_id}")
+        deleted = await client.get(f"/questions/{question_id}", headers={"If-None-Match": changed.headers["etag"]})
+        assert deleted.status_code == 200
+        assert deleted.headers["etag"] not in (etag, changed.headers["etag"])
+
+        answer = await client.post(f"/questions/{question_id}/answers/", params={"text": "Ответ"})
+        assert (await client.get(f"/answers/{answer.json()['id']}")).headers["cache-control"].startswith("public")
+        assert (await client.get("/questions/")).headers["cache-control"].startswith("public, max-age=")
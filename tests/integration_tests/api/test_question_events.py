@@ -0,0 +1,38 @@
+import json
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.events.bus import bus, question_channel
+
+
+@pytest.mark.asyncio
+async def test_answer_events_are_published(sqlite_app):
+    """
+        Проверяет события об ответах, которые получает подписчик вопроса.
+
+        Логика теста:
+        - Создание ответа публикует answer_created с самим ответом.
+        - Удаление ответа публикует answer_deleted с его ID.
+        - Подписка на несуществующий вопрос даёт 404.
+    """
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        question_id = (await client.post("/questions/", params={"text": "Вопрос"})).json()["id"]
+        subscription = bus.subscribe(question_channel(question_id))
+        try:
+            answer_id = (await client.post(
+                f"/questions/{question_id}/answers/", params={"text": "Ответ"}
+            )).json()["id"]
+            await client.delete(f"/answers/{answer_id}")
+
+            created = json.loads(await subscription.get())
+            assert created["type"] == "answer_created"
+            assert created["answer"]["id"] == answer_id
+            assert created["answer"]["text"] == "Ответ"
+            assert json.loads(await subscription.get()) == {
+                "type": "answer_deleted", "question_id": question_id, "ids": [answer_id],
+            }
+        finally:
+            bus.unsubscribe(subscription)
+
+        assert (await client.get(f"/questions/{question_id + 1000}/events")).status_code == 404
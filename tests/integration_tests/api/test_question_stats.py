@@ -0,0 +1,46 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.commands.backfill_question_stats import backfill
+from app.database.models import QuestionModels
+
+
+@pytest.mark.asyncio
+async def test_answer_count_and_sorting(sqlite_app, sqlite_session_factory):
+    """
+        Проверяет поддержку answer_count/last_answer_at и сортировку по ним.
+
+        Логика теста:
+        - Счётчик растёт при добавлении ответов (по одному и пачкой) и уменьшается при удалении.
+        - sort=most_answered отдаёт вопросы по убыванию числа ответов, курсор ведёт на следующую страницу.
+        - Курсор другой сортировки отклоняется с кодом 400.
+        - Команда пересчёта восстанавливает испорченный счётчик.
+    """
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        ids = [(await client.post("/questions/", params={"text": f"Вопрос {i}"})).json()["id"] for i in range(3)]
+        first = (await client.post(f"/questions/{ids[1]}/answers/", params={"text": "a"})).json()["id"]
+        await client.post(f"/questions/{ids[2]}/answers/bulk", json=[{"text": "b"}, {"text": "c"}])
+        await client.post(f"/questions/{ids[1]}/answers/", params={"text": "d"})
+        await client.post(f"/questions/{ids[2]}/answers/", params={"text": "e"})
+        await client.delete(f"/answers/{first}")
+        assert (await client.post("/questions/999/answers/", params={"text": "x"})).status_code == 404
+
+        page = (await client.get("/questions/", params={"sort": "most_answered", "limit": 2})).json()
+        assert [(q["id"], q["answer_count"]) for q in page["items"]] == [(ids[2], 3), (ids[1], 1)]
+        assert page["items"][0]["last_answer_at"] is not None
+        rest = (await client.get(
+            "/questions/", params={"sort": "most_answered", "cursor": page["next_cursor"]}
+        )).json()
+        assert [(q["id"], q["answer_count"]) for q in rest["items"]] == [(ids[0], 0)]
+        assert rest["next_cursor"] is None
+
+        response = await client.get("/questions/", params={"sort": "created", "cursor": page["next_cursor"]})
+        assert response.status_code == 400
+
+    async with sqlite_session_factory() as session:
+        question = await session.get(QuestionModels, ids[2])
+        question.answer_count = 0
+        await session.commit()
+    assert await backfill(sqlite_session_factory, batch_size=2) == 3
+    async with sqlite_session_factory() as session:
+        assert (await session.get(QuestionModels, ids[2])).answer_count == 3
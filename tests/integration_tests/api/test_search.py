@@ -0,0 +1,55 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app.search.index import search_index
+
+
+@pytest.mark.asyncio
+async def test_search_ranked_grouped_and_paginated(sqlite_app, sqlite_session_factory):
+    """
+        Проверяет GET /search на индексе в памяти (база тестов — SQLite).
+
+        Логика теста:
+        - Индекс строится по базе и дальше поддерживается use case'ами записи.
+        - Ищутся документы со всеми словами запроса; документ, где слово
+          встречается чаще, ранжируется выше.
+        - Страницы отдаются по курсору, group=true объединяет ответы с вопросом.
+        - Курсор не принимается с другим запросом.
+        - Удалённый ответ пропадает из выдачи.
+    """
+    await search_index.rebuild(sqlite_session_factory, 100)
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        first = (await client.post("/questions/", params={"text": "Как настроить индекс Postgres"})).json()["id"]
+        second = (await client.post("/questions/", params={"text": "Про кэш"})).json()["id"]
+        answer_id = (await client.post(
+            f"/questions/{second}/answers/", params={"text": "Индекс, индекс и ещё раз индекс"}
+        )).json()["id"]
+        await client.post(f"/questions/{second}/answers/", params={"text": "Нужен Redis"})
+
+        page = (await client.get("/search", params={"q": "ИНДЕКС", "limit": 1})).json()
+        assert [(hit["kind"], hit["id"]) for hit in page["items"]] == [("answer", answer_id)]
+        assert page["items"][0]["question_id"] == second
+        rest = (await client.get("/search", params={"q": "индекс", "cursor": page["next_cursor"]})).json()
+        assert [(hit["kind"], hit["id"]) for hit in rest["items"]] == [("question", first)]
+        assert rest["next_cursor"] is None
+
+        assert (await client.get("/search", params={"q": "индекс postgres"})).json()["items"][0]["id"] == first
+        grouped = (await client.get("/search", params={"q": "индекс", "group": True})).json()["items"]
+        assert [(group["question_id"], group["question_matched"], group["answer_ids"]) for group in grouped] == [
+            (second, False, [answer_id]),
+            (first, True, []),
+        ]
+        assert grouped[0]["text"] == "Про кэш"
+        grouped_page = (await client.get("/search", params={"q": "индекс", "group": True, "limit": 1})).json()
+        assert [group["question_id"] for group in grouped_page["items"]] == [second]
+        grouped_rest = (await client.get(
+            "/search", params={"q": "индекс", "group": True, "cursor": grouped_page["next_cursor"]}
+        )).json()
+        assert [group["question_id"] for group in grouped_rest["items"]] == [first]
+        other_query = await client.get("/search", params={"q": "redis", "cursor": grouped_page["next_cursor"]})
+        assert other_query.status_code == 400
+
+        await client.delete(f"/answers/{answer_id}")
+        hits = (await client.get("/search", params={"q": "индекс"})).json()["items"]
+        assert [hit["id"] for hit in hits] == [first]
+        assert (await client.get("/search", params={"q": "индекс", "cursor": "@@"})).status_code == 400
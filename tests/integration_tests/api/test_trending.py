@@ -0,0 +1,51 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
+
+from app.database.models import QuestionActivityModels
+from app.trending.leaderboard import TrendingLeaderboard, trending
+
+
+@pytest.mark.asyncio
+async def test_trending_questions(sqlite_app, sqlite_session_factory, monkeypatch):
+    """
+        Проверяет GET /questions/trending и синхронизацию рейтинга через свёртку в базе.
+
+        Логика теста:
+        - Созданные (по одному и пачкой) и удалённые ответы сразу меняют рейтинг процесса.
+        - После sync второй «воркер» загружает из question_activity тот же рейтинг.
+        - Удалённый вопрос пропадает из рейтинга, его строки удаляются из свёртки.
+    """
+    trending.clear()
+    monkeypatch.setattr(trending, "refresh_seconds", 0)
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        first = (await client.post("/questions/", params={"text": "Первый"})).json()["id"]
+        second = (await client.post("/questions/", params={"text": "Второй"})).json()["id"]
+        await client.post(f"/questions/{first}/answers/", params={"text": "Ответ"})
+        ids = (await client.post(
+            f"/questions/{second}/answers/bulk", json=[{"text": f"Ответ {i}"} for i in range(3)]
+        )).json()["ids"]
+        await client.delete(f"/answers/{ids[0]}")
+
+        response = await client.get("/questions/trending", params={"window": "1h"})
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [(item["id"], item["text"], item["answers_in_window"]) for item in items] == [
+            (second, "Второй", 2), (first, "Первый", 1),
+        ]
+        assert (await client.get("/questions/trending", params={"window": "30d"})).status_code == 422
+
+        await trending.sync(sqlite_session_factory)
+        worker = TrendingLeaderboard(bucket_seconds=trending.bucket_seconds, top_k=10, refresh_seconds=0, sync_seconds=10)
+        await worker.sync(sqlite_session_factory)
+        assert worker.top("7d", 10) == [(second, 2), (first, 1)]
+
+        await client.delete(f"/questions/{second}")
+        body = (await client.get("/questions/trending", params={"window": "7d"})).json()
+        assert [item["id"] for item in body["items"]] == [first]
+
+    await trending.sync(sqlite_session_factory)
+    async with sqlite_session_factory() as session:
+        rows = (await session.execute(select(QuestionActivityModels.question_id))).scalars().all()
+    assert set(rows) == {first}
+    trending.clear()
@@ -0,0 +1,61 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert, select
+
+from app.config import settings
+from app.database.models import AnswerModels, QuestionModels
+
+
+@pytest.mark.asyncio
+async def test_user_answers_page_and_delete(sqlite_app, sqlite_session_factory, monkeypatch):
+    """
+        Проверяет GET и DELETE /users/{user_id}/answers.
+
+        Логика теста:
+        - Ответы пользователя отдаются страницами, новые первыми, чужие ответы не попадают.
+        - Удаление идёт пачками (USER_DELETE_CHUNK_SIZE=2): удаляются все 5 ответов
+          пользователя, answer_count вопросов уменьшается, чужие ответы остаются.
+        - Повреждённый курсор даёт 400, некорректный UUID — 422.
+    """
+    user, other = uuid.uuid4(), uuid.uuid4()
+    start = datetime(2024, 1, 1)
+    async with sqlite_session_factory() as session:
+        questions = [QuestionModels(text=f"Вопрос {i}", answer_count=3, created_at=start) for i in range(2)]
+        session.add_all(questions)
+        await session.flush()
+        first, second = (question.id for question in questions)
+        await session.execute(insert(AnswerModels), [
+            {"question_id": (first, second)[i % 2], "user_id": other if i == 5 else user,
+             "text": f"{i}", "created_at": start + timedelta(seconds=i // 2)}
+            for i in range(6)
+        ])
+        await session.commit()
+
+    async with AsyncClient(transport=ASGITransport(app=sqlite_app), base_url="http://test") as client:
+        texts, cursor = [], None
+        for _ in range(3):
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = (await client.get(f"/users/{user}/answers", params=params)).json()
+            texts.append([answer["text"] for answer in page["items"]])
+            cursor = page["next_cursor"]
+        assert texts == [["4", "3"], ["2", "1"], ["0"]]
+        assert cursor is None
+
+        assert (await client.get(f"/users/{user}/answers", params={"cursor": "broken"})).status_code == 400
+        assert (await client.get("/users/not-a-uuid/answers")).status_code == 422
+
+        monkeypatch.setattr(settings, "USER_DELETE_CHUNK_SIZE", 2)
+        response = await client.delete(f"/users/{user}/answers")
+        assert response.json()["deleted"] == 5
+        assert (await client.get(f"/users/{user}/answers")).json()["items"] == []
+
+    async with sqlite_session_factory() as session:
+        counts = (await session.execute(
+            select(QuestionModels.id, QuestionModels.answer_count).order_by(QuestionModels.id)
+        )).all()
+        remaining = (await session.execute(select(AnswerModels.user_id))).scalars().all()
+    assert [tuple(row) for row in counts] == [(first, 0), (second, 1)]
+    assert remaining == [other]
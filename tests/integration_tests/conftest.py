@@ -0,0 +1,41 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.database.models import Base
+
+
+@pytest_asyncio.fixture
+async def sqlite_session_factory(tmp_path):
+    """
+        Фабрика сессий для отдельной временной базы SQLite.
+
+        Используется тестами, которым нужны собственные данные и которые
+        не должны трогать основную базу.
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def sqlite_app(sqlite_session_factory):
+    """
+        Приложение, у которого зависимость сессии подменена на временную базу SQLite.
+        Кэш очищается, чтобы не отдавать данные из предыдущих тестов.
+    """
+    from app.cache.cache import cache
+    from app.database.database import database
+    from app.main import app
+
+    await cache.clear()
+
+    async def get_session():
+        async with sqlite_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[database.get_session] = get_session
+    app.dependency_overrides[database.get_read_session] = get_session
+    yield app
+    app.dependency_overrides.clear()
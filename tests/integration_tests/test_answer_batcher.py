@@ -0,0 +1,48 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.batching.answers import AnswerBatcher
+from app.database.models import AnswerModels, QuestionModels
+
+
+@pytest.mark.asyncio
+async def test_batcher_writes_one_transaction_and_reports_missing_questions(sqlite_session_factory):
+    """
+        Проверяет групповую запись ответов.
+
+        Логика теста:
+        - 6 конкурентных ответов к двум вопросам и один к несуществующему
+          записываются одной пачкой.
+        - Каждый запрос получает свой ID, запрос к несуществующему вопросу — None,
+          остальные ответы при этом сохраняются.
+        - Счётчики ответов вопросов учитывают всю пачку.
+    """
+    async with sqlite_session_factory() as session:
+        questions = [QuestionModels(text="Первый"), QuestionModels(text="Второй")]
+        session.add_all(questions)
+        await session.commit()
+        first, second = (question.id for question in questions)
+
+    batcher = AnswerBatcher(max_items=10, max_delay_ms=50)
+    targets = [first, second, first, second + 100, first, second, first]
+
+    async def submit(question_id: int, i: int):
+        async with sqlite_session_factory() as session:
+            return await batcher.submit(question_id, f"Ответ {i}", uuid.uuid4(), session)
+
+    results = await asyncio.gather(*(submit(question_id, i) for i, question_id in enumerate(targets)))
+
+    assert batcher.batches == 1
+    assert results[3] is None
+    ids = [result.id for result in results if result is not None]
+    assert len(set(ids)) == 6
+    async with sqlite_session_factory() as session:
+        texts = dict((await session.execute(select(AnswerModels.id, AnswerModels.text))).all())
+        counts = dict((await session.execute(select(QuestionModels.id, QuestionModels.answer_count))).all())
+    assert [texts[result.id] for result in results if result is not None] == [
+        f"Ответ {i}" for i in (0, 1, 2, 4, 5, 6)
+    ]
+    assert counts == {first: 4, second: 2}
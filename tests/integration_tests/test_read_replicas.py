@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import select
+from starlette.requests import Request
+
+from app.database.database import Database
+from app.database.models import Base, QuestionModels
+
+
+def make_request(client_id: str) -> Request:
+    return Request({"type": "http", "headers": [(b"x-client-id", client_id.encode())], "client": None})
+
+
+async def read_texts(session_generator) -> list[str]:
+    session = await anext(session_generator)
+    try:
+        return list((await session.execute(select(QuestionModels.text))).scalars())
+    finally:
+        await session_generator.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replicas_and_writers_read_their_writes(tmp_path):
+    """
+        Проверяет маршрутизацию сессий между primary и репликами.
+
+        Логика теста:
+        - Primary и две реплики — отдельные файлы SQLite с разными данными.
+        - Чтение распределяется по репликам по кругу (round-robin).
+        - Запись идёт в primary; клиент, который только что писал, читает из primary,
+          а другой клиент — по-прежнему из реплик.
+    """
+    urls = [f"sqlite+aiosqlite:///{tmp_path / name}.db" for name in ("primary", "replica1", "replica2")]
+    database = Database(url=urls[0], replica_urls=urls[1:], read_your_writes_ms=60_000)
+    try:
+        for engine, name in zip(database.engines, ("primary", "replica1", "replica2")):
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.execute(QuestionModels.__table__.insert().values(text=name))
+
+        reads = [await read_texts(database.get_read_session(make_request("reader"))) for _ in range(4)]
+        assert reads == [["replica1"], ["replica2"], ["replica1"], ["replica2"]]
+
+        writer = database.get_session(make_request("writer"))
+        session = await anext(writer)
+        session.add(QuestionModels(text="new"))
+        await session.commit()
+        with pytest.raises(StopAsyncIteration):
+            await anext(writer)
+
+        assert await read_texts(database.get_read_session(make_request("writer"))) == ["primary", "new"]
+        assert await read_texts(database.get_read_session(make_request("reader"))) == ["replica1"]
+    finally:
+        await database.dispose()
+
+
+def test_least_connections_strategy_picks_idle_replica(tmp_path):
+    """
+        Проверяет, что стратегия least_connections выбирает реплику с меньшим числом занятых соединений.
+    """
+    urls = [f"sqlite+aiosqlite:///{tmp_path / name}.db" for name in ("primary", "replica1", "replica2")]
+    database = Database(url=urls[0], replica_urls=urls[1:], replica_strategy="least_connections")
+    busy, idle = database.replica_engines
+    busy.pool.checkedout = lambda: 3
+    idle.pool.checkedout = lambda: 1
+
+    assert database.read_session_factory("client") is database.replica_session_factories[1]
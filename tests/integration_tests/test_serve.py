@@ -0,0 +1,103 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(predicate, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.05)
+    raise TimeoutError
+
+
+def responds(port: int) -> bool:
+    try:
+        return httpx.get(f"http://127.0.0.1:{port}/questions/", timeout=1).status_code == 200
+    except httpx.HTTPError:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_prefork_launcher_restarts_and_stops(sqlite_session_factory, tmp_path):
+    """
+        Проверяет запуск API через app.commands.serve с двумя воркерами.
+
+        Логика теста:
+        - Мастер порождает два воркера, API отвечает, в лог пишется время старта воркеров.
+        - По SIGHUP воркеры заменяются новыми, API продолжает отвечать.
+        - По SIGTERM мастер плавно останавливает воркеров и завершается с кодом 0.
+    """
+    port = free_port()
+    log_path = tmp_path / "serve.log"
+    env = {
+        **os.environ,
+        "PG_URL": str(sqlite_session_factory.kw["bind"].url),
+        "LOG_FILE_ENABLED": "false",
+        "SEARCH_BACKEND": "postgres",
+        "WEB_ALLOW_LOCAL_STATE": "true",
+    }
+    with open(log_path, "w") as log:
+        master = subprocess.Popen(
+            [sys.executable, "-m", "app.commands.serve", "--workers", "2", "--port", str(port)],
+            cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+
+    def children() -> set[str]:
+        return set(subprocess.run(["pgrep", "-P", str(master.pid)], capture_output=True, text=True).stdout.split())
+
+    try:
+        wait_for(lambda: log_path.read_text().count("Все воркеры готовы") == 1)
+        assert responds(port)
+        assert "Приложение импортировано за" in log_path.read_text()
+        first = children()
+        assert len(first) == 2
+
+        master.send_signal(signal.SIGHUP)
+        wait_for(lambda: len(children()) == 2 and not children() & first)
+        assert responds(port)
+
+        master.send_signal(signal.SIGTERM)
+        assert master.wait(timeout=30) == 0
+    finally:
+        if master.poll() is None:
+            master.kill()
+    assert "Мастер остановлен" in log_path.read_text()
+
+
+def test_prefork_launcher_refuses_workers_with_local_state(sqlite_session_factory):
+    """
+        Проверяет, что мастер не запускает несколько воркеров при бэкендах в памяти без явного разрешения.
+
+        Логика теста:
+        - По умолчанию кэш и шина событий в памяти: с --workers 2 мастер завершается с кодом 1, не открывая порт.
+    """
+    env = {
+        **os.environ,
+        "PG_URL": str(sqlite_session_factory.kw["bind"].url),
+        "LOG_FILE_ENABLED": "false",
+        "CACHE_BACKEND": "memory",
+        "WEB_ALLOW_LOCAL_STATE": "false",
+    }
+    result = subprocess.run(
+        [sys.executable, "-m", "app.commands.serve", "--workers", "2", "--port", str(free_port())],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 1
+    assert "CACHE_BACKEND=memory" in result.stderr
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.admission.backends import MemoryRateLimiter, NullRateLimiter
+from app.admission.limits import LoadShedder
+from app.admission.middleware import AdmissionMiddleware
+
+
+@pytest.mark.asyncio
+async def test_memory_rate_limiter_token_bucket():
+    """
+        Проверяет token bucket: всплеск до burst, затем ожидание 1 / rate, корзины раздельны по клиентам.
+    """
+    limiter = MemoryRateLimiter(rate=10, burst=3, max_keys=100)
+    assert [await limiter.acquire("a") for _ in range(3)] == [0, 0, 0]
+    wait = await limiter.acquire("a")
+    assert 0 < wait <= 0.1
+    assert await limiter.acquire("b") == 0
+
+    await asyncio.sleep(0.11)
+    assert await limiter.acquire("a") == 0
+    assert limiter.stats()["limited"] == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_middleware_rejects_fast():
+    """
+        Проверяет AdmissionMiddleware на приложении с медленным маршрутом.
+
+        Логика теста:
+        - Пока выполняются max_inflight запросов, следующий сразу получает 503 + Retry-After.
+        - Большое недавнее ожидание пула тоже даёт 503, Retry-After — по ожиданию.
+        - Клиент сверх своего лимита получает 429, другой клиент — нет; /metrics не ограничивается.
+    """
+    release = asyncio.Event()
+
+    async def slow(request):
+        await release.wait()
+        return PlainTextResponse("ok")
+
+    async def fast(request):
+        return PlainTextResponse("ok")
+
+    pool_wait = 0.0
+    shedder = LoadShedder(max_inflight=2, max_pool_wait_ms=500, pool_wait=lambda: pool_wait)
+    app = Starlette(routes=[Route("/slow", slow), Route("/fast", fast), Route("/metrics", fast)])
+    async with AsyncClient(
+        transport=ASGITransport(app=AdmissionMiddleware(app, NullRateLimiter(1, 1), shedder, "client")),
+        base_url="http://test",
+    ) as client:
+        running = [asyncio.create_task(client.get("/slow")) for _ in range(2)]
+        while shedder.inflight < 2:
+            await asyncio.sleep(0.01)
+        shed = await client.get("/fast")
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "1"
+        release.set()
+        assert [(await task).status_code for task in running] == [200, 200]
+        assert shedder.inflight == 0
+
+        pool_wait = 2.5
+        overloaded = await client.get("/fast")
+        assert overloaded.status_code == 503
+        assert overloaded.headers["retry-after"] == "3"
+        assert shedder.stats()["shed"] == {"inflight": 1, "pool_wait": 1}
+
+    limiter = MemoryRateLimiter(rate=0.5, burst=2, max_keys=100)
+    shedder = LoadShedder(max_inflight=0, max_pool_wait_ms=0, pool_wait=lambda: 0.0)
+    async with AsyncClient(
+        transport=ASGITransport(app=AdmissionMiddleware(app, limiter, shedder, "client")),
+        base_url="http://test",
+    ) as client:
+        statuses = [(await client.get("/fast", headers={"X-Client-Id": "a"})).status_code for _ in range(3)]
+        assert statuses == [200, 200, 429]
+        limited = await client.get("/fast", headers={"X-Client-Id": "a"})
+        assert limited.headers["retry-after"] == "2"
+        assert (await client.get("/fast", headers={"X-Client-Id": "b"})).status_code == 200
+        assert (await client.get("/metrics", headers={"X-Client-Id": "a"})).status_code == 200
+
+    limiter = MemoryRateLimiter(rate=0.5, burst=2, max_keys=100)
+    async with AsyncClient(
+        transport=ASGITransport(app=AdmissionMiddleware(app, limiter, shedder)),
+        base_url="http://test",
+    ) as client:
+        # По умолчанию ключ — IP: смена X-Client-Id и user_id не даёт новую корзину.
+        statuses = [
+            (await client.get("/fast", params={"user_id": str(i)}, headers={"X-Client-Id": str(i)})).status_code
+            for i in range(3)
+        ]
+        assert statuses == [200, 200, 429]
@@ -0,0 +1,30 @@
+from app.cache.backends import NullCache
+from app.cache.cache import cache
+from app.config import settings
+from app.main import create_app
+from app.trending.leaderboard import trending
+
+
+def test_create_app_builds_components_from_settings():
+    """
+        Проверяет, что create_app применяет переданные настройки ко всем компонентам.
+
+        Логика теста:
+        - Кэш, рейтинг и настройки, которые use case'ы читают при запросе, берутся из аргумента.
+        - Повторный вызов с прежними настройками возвращает исходную конфигурацию.
+    """
+    original = settings.model_copy()
+    try:
+        app = create_app(settings.model_copy(update={
+            "CACHE_BACKEND": "none",
+            "TRENDING_TOP_K": original.TRENDING_TOP_K + 1,
+            "BULK_MAX_ITEMS": 3,
+        }))
+        assert isinstance(cache.target, NullCache)
+        assert trending.top_k == original.TRENDING_TOP_K + 1
+        assert settings.BULK_MAX_ITEMS == app.state.settings.BULK_MAX_ITEMS == 3
+    finally:
+        create_app(original)
+    assert not isinstance(cache.target, NullCache)
+    assert trending.top_k == original.TRENDING_TOP_K
+    assert settings == original
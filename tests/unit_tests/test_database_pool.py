@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import exc
+
+from app.database.database import Database
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_count_checkouts_and_timeouts(tmp_path):
+    """
+        Проверяет метрики ожидания соединения из пула.
+
+        Логика теста:
+        - Пул на одно соединение без overflow прогревается и отдаёт соединение.
+        - Пока оно занято, вторая попытка получить соединение падает по таймауту.
+        - Счётчики checkouts/timeouts и состояние пула отражают это.
+        - До первого обращения к движку метрики пусты и не создают его (URL может быть не задан).
+    """
+    database = Database(
+        url=f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+    assert database.pools() == [] and database.pool_stats() == {}
+    assert Database(url=None).pools() == []
+    try:
+        await database.warmup(1)
+        async with database.engine.connect():
+            assert database.pool_stats()["checked_out"] == 1
+            with pytest.raises(exc.TimeoutError):
+                await database.engine.connect()
+        stats = database.pool_stats()
+    finally:
+        await database.dispose()
+
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 3
+    assert stats["timeouts"] == 1
+    assert stats["wait_max_seconds"] >= 0.1
+    assert [name for name, _, _ in database.pools()] == ["primary"]
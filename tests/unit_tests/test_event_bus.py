@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from app.events.backends import BusUnavailable, MemoryBus, PostgresBus, TooManySubscribers
+from app.use_cases.questions.subscribe_question import SubscribeQuestionUseCase
+
+
+@pytest.mark.asyncio
+async def test_memory_bus_backpressure_and_limit():
+    """
+        Проверяет доставку, переполнение очереди и лимит подписок шины событий.
+
+        Логика теста:
+        - Событие канала получает только подписчик этого канала, в формате SSE.
+        - Подписчик с очередью на 2 события, не читающий поток, на третьем событии
+          отключается: он получает уже накопленные события и `resync`, публикация не блокируется.
+        - Третья подписка при лимите 2 отклоняется.
+    """
+    bus = MemoryBus(queue_size=2, max_subscribers=2)
+    slow = bus.subscribe("question:1")
+    other = bus.subscribe("question:2")
+    with pytest.raises(TooManySubscribers):
+        bus.subscribe("question:1")
+
+    for i in range(3):
+        await bus.publish("question:1", b'{"n":%d}' % i)
+    assert bus.stats()["overflows"] == 1
+    assert bus.subscribers == 1
+    assert other._queue.empty()
+
+    chunks = [chunk async for chunk in SubscribeQuestionUseCase.stream(slow, heartbeat=1)]
+    assert chunks == [b"retry: 3000\n\n", b'data: {"n":0}\n\n', b'data: {"n":1}\n\n', b"event: resync\ndata: {}\n\n"]
+
+    bus.subscribe("question:1")
+    await bus.stop()
+    assert bus.subscribers == 0
+
+
+class FakeConnection:
+    """Соединение asyncpg в памяти: NOTIFY раздаётся всем слушающим соединениям «сервера»."""
+
+    def __init__(self, server: list):
+        self.server = server
+        self.listeners = {}
+        self.termination_listeners = []
+        server.append(self)
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    def remove_termination_listener(self, callback):
+        self.termination_listeners.remove(callback)
+
+    async def execute(self, query, channel, payload):
+        for connection in list(self.server):
+            if channel in connection.listeners:
+                connection.listeners[channel](connection, 0, channel, payload)
+
+    def terminate(self):
+        self.server.remove(self)
+        for callback in list(self.termination_listeners):
+            callback(self)
+
+    async def close(self):
+        self.terminate()
+
+
+@pytest.mark.asyncio
+async def test_postgres_bus_reconnects_after_connection_loss():
+    """
+        Проверяет переподключение PostgresBus после обрыва соединения LISTEN.
+
+        Логика теста:
+        - При обрыве подписки закрываются с resync, новые подписки отклоняются.
+        - Первая попытка переподключения не удаётся, вторая (после задержки) восстанавливает LISTEN.
+        - После переподключения события снова доставляются; stop() не запускает переподключение.
+    """
+    server, attempts = [], []
+
+    async def connect(dsn):
+        attempts.append(dsn)
+        if len(attempts) == 3:
+            raise OSError("connection refused")
+        return FakeConnection(server)
+
+    bus = PostgresBus("postgresql://test", queue_size=2, max_subscribers=10, connect=connect)
+    bus.RECONNECT_DELAY = 0.01
+    await bus.start()
+    subscription = bus.subscribe("question:1")
+    await bus.publish("question:1", b'{"n":0}')
+    assert await subscription.get() == b'{"n":0}'
+
+    server[0].terminate()
+    assert await subscription.get() is None and subscription.resync
+    with pytest.raises(BusUnavailable):
+        bus.subscribe("question:1")
+
+    for _ in range(100):
+        if bus.reconnects:
+            break
+        await asyncio.sleep(0.01)
+    assert bus.reconnects == 1 and len(attempts) == 5
+    subscription = bus.subscribe("question:1")
+    await bus.publish("question:1", b'{"n":1}')
+    assert await subscription.get() == b'{"n":1}'
+
+    await bus.stop()
+    assert server == [] and bus.stats()["connected"] is False
+
+
+@pytest.mark.asyncio
+async def test_event_stream_closes_after_question_deleted():
+    """
+        Проверяет, что поток SSE закрывается после события question_deleted, не дожидаясь пинга.
+    """
+    bus = MemoryBus(queue_size=10, max_subscribers=10)
+    subscription = bus.subscribe("question:1")
+    await bus.publish("question:1", b'{"type":"answer_deleted","question_id":1,"ids":[2]}')
+    await bus.publish("question:1", b'{"type":"question_deleted","question_id":1}')
+
+    stream = SubscribeQuestionUseCase.stream(subscription, heartbeat=1)
+    chunks = await asyncio.wait_for(_collect(stream), timeout=1)
+    assert chunks[-1] == b'data: {"type":"question_deleted","question_id":1}\n\n'
+    assert len(chunks) == 3
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
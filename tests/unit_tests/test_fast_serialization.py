@@ -0,0 +1,37 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+from app.schemas.questions import QuestionIDResponse, question_json
+
+
+def test_question_json_matches_response_model():
+    """
+        Проверяет, что быстрый путь сериализации даёт тот же JSON, что и модель ответа.
+
+        Логика теста:
+        - Один и тот же вопрос с ответом сериализуется через QuestionIDResponse
+          и через TypeAdapter question_json из словаря колонок.
+        - Результаты совпадают, включая формат дат, UUID и null-поля.
+    """
+    created_at = datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+    data = {
+        "id": 1,
+        "text": "Вопрос",
+        "created_at": created_at,
+        "answer_count": 1,
+        "last_answer_at": None,
+        "answers": [{
+            "id": 7,
+            "question_id": 1,
+            "user_id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "text": "Ответ",
+            "created_at": created_at,
+        }],
+        "answers_next_cursor": None,
+    }
+
+    fast = question_json.dump_json(data)
+
+    assert fast == QuestionIDResponse.model_validate(data).model_dump_json().encode()
+    assert json.loads(fast)["answers"][0]["user_id"] == "12345678-1234-5678-1234-567812345678"
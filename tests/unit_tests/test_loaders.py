@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.repositories.loaders import BatchLoader
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_coalesces_lookups():
+    """
+        Проверяет загрузчик в духе DataLoader на поддельной выборке.
+
+        Логика теста:
+        - Обращения из задач asyncio.gather в одном такте уходят одним вызовом, каждый ключ — один раз.
+        - Результаты в порядке запроса, ненайденный ключ даёт None, повторный load берётся из памяти.
+        - Ошибка выборки получают все ожидающие, и ключ не запоминается.
+    """
+    calls = []
+    fail = False
+
+    async def load_many(keys, session):
+        calls.append(sorted(keys))
+        if fail:
+            raise RuntimeError("база недоступна")
+        return {key: f"v{key}" for key in keys if key != 404}
+
+    loader = BatchLoader(load_many, session=None, lock=asyncio.Lock())
+    assert await loader.load_many([3, 1, 404, 3]) == ["v3", "v1", None, "v3"]
+    assert await asyncio.gather(loader.load(1), loader.load(2), loader.load(5)) == ["v1", "v2", "v5"]
+    assert calls == [[1, 3, 404], [2, 5]]
+    assert loader.batches == 2
+
+    fail = True
+    with pytest.raises(RuntimeError):
+        await asyncio.gather(loader.load(7), loader.load(8))
+    fail = False
+    assert await loader.load(7) == "v7"
+    assert calls[-2:] == [[7, 8], [7]]
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_clear_after_dispatch():
+    """
+        Проверяет clear() между отправкой пачки и началом выборки.
+
+        Логика теста:
+        - Пачка уже отправлена (_dispatch), но выборка ещё не началась, и в этот момент вызывается clear().
+        - Ожидающие всё равно получают значения, а не зависают.
+    """
+    async def load_many(keys, session):
+        return {key: f"v{key}" for key in keys}
+
+    loader = BatchLoader(load_many, session=None, lock=asyncio.Lock())
+    first, second = loader.load(1), loader.load(2)
+    await asyncio.sleep(0)
+    loader.clear()
+    assert await asyncio.wait_for(asyncio.gather(first, second), timeout=1) == ["v1", "v2"]
@@ -0,0 +1,37 @@
+import json
+import logging
+
+from app.logs.logger import JsonFormatter, create_file_handler, create_queue_pipeline
+
+
+def test_queue_pipeline_drops_on_overflow_and_writes_json(tmp_path):
+    """
+        Проверяет очередь логов: отбрасывание при переполнении и запись в файл.
+
+        Логика теста:
+        - Пока поток вывода не запущен, в очередь на 2 записи помещаются только 2 из 5.
+        - Остальные 3 учитываются как отброшенные, логгер при этом не блокируется.
+        - После запуска потока записи попадают в файл JSON-строками.
+    """
+    path = tmp_path / "app.log"
+    file_handler = create_file_handler(path, rotation="size", max_bytes=1024, backup_count=1)
+    file_handler.setFormatter(JsonFormatter())
+    handler, listener = create_queue_pipeline([file_handler], queue_size=2)
+    logger = logging.getLogger("test_queue_pipeline")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.info("сообщение %s", i)
+        assert handler.stats() == {"enqueued": 2, "dropped": 3, "queued": 2, "capacity": 2}
+
+        listener.start()
+        listener.stop()
+    finally:
+        logger.removeHandler(handler)
+        file_handler.close()
+
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["message"] for record in records] == ["сообщение 0", "сообщение 1"]
+    assert records[0]["level"] == "INFO"
@@ -0,0 +1,51 @@
+import pytest
+
+from app.cache.backends import MemoryCache
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_lru_eviction():
+    """
+        Проверяет вытеснение по LRU и счётчики кэша.
+
+        Логика теста:
+        - В кэш на 2 записи кладутся "a" и "b", затем читается "a".
+        - После добавления "c" вытесняется "b" — к нему дольше всего не обращались.
+    """
+    cache = MemoryCache(ttl=60, max_size=2)
+    await cache.set("a", b"1")
+    await cache.set("b", b"2")
+    assert await cache.get("a") == b"1"
+
+    await cache.set("c", b"3")
+
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"1"
+    assert await cache.get("c") == b"3"
+    assert cache.stats() == {
+        "backend": "MemoryCache",
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+        "size": 2,
+        "max_size": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_ttl_and_delete(monkeypatch):
+    """
+        Проверяет истечение TTL и явную инвалидацию.
+    """
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.backends.time.monotonic", lambda: now[0])
+    cache = MemoryCache(ttl=10, max_size=10)
+    await cache.set("a", b"1")
+    await cache.set("b", b"2")
+
+    await cache.delete("b")
+    assert await cache.get("b") is None
+
+    now[0] += 11
+    assert await cache.get("a") is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from app.database.partitions import add_months, month_start, parse_partition, partition_name
+from app.repositories.answers import AnswerRepository
+
+
+def test_month_partitions():
+    """
+        Проверяет границы и имена месячных секций таблицы ответов.
+
+        Логика теста:
+        - Начало месяца считается в UTC, сдвиг на месяцы переходит через год в обе стороны.
+        - Имя секции разбирается обратно в месяц и признак архивной секции, посторонние имена — нет.
+    """
+    at = datetime(2025, 12, 31, 23, 30, tzinfo=timezone.utc)
+    month = month_start(at)
+    assert month == datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert add_months(month, 1) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert add_months(month, -12) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+
+    assert partition_name(month) == "answer_p202512"
+    assert parse_partition("answer_p202512") == ("answer_p202512", month, False)
+    assert parse_partition(partition_name(month, archived=True)).archived
+    assert parse_partition("answer_default") is None
+
+
+def test_answers_page_query_bounds_created_at():
+    """
+        Проверяет, что запрос страницы ответов ограничен датами вопроса — по ним PostgreSQL отсекает секции.
+    """
+    since = datetime(2025, 1, 10, tzinfo=timezone.utc)
+    until = datetime(2025, 3, 5, tzinfo=timezone.utc)
+    query = AnswerRepository.answers_page_query(7, 51, created_between=(since, until))
+    sql = str(query.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "answer.created_at >= '2025-01-10 00:00:00+00:00'" in sql
+    assert "answer.created_at <= '2025-03-05 00:00:00+00:00'" in sql
+
+    open_ended = AnswerRepository.answers_page_query(7, 51, created_between=(since, None))
+    assert "<=" not in str(open_ended.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
@@ -0,0 +1,35 @@
+from datetime import datetime, timezone
+
+from app.trending.leaderboard import TrendingLeaderboard
+
+
+def test_leaderboard_sliding_windows():
+    """
+        Проверяет счётчики рейтинга на управляемых часах.
+
+        Логика теста:
+        - Ответы попадают во все окна, удалённый ответ вычитается, при равенстве выше новый вопрос.
+        - Через час интервалы выходят из окна 1h, но остаются в 24h и 7d; через 7 дней — из всех.
+        - Ответ старше 7 дней не учитывается, удалённый вопрос пропадает из рейтинга.
+    """
+    now = 1_800_000_000.0
+    board = TrendingLeaderboard(bucket_seconds=300, top_k=10, refresh_seconds=0, sync_seconds=10, clock=lambda: now)
+    board.record(1)
+    board.record(2, delta=3)
+    board.record(2, datetime.fromtimestamp(now, timezone.utc), -1)
+    board.record(3, delta=2)
+    assert board.top("1h", 10) == [(3, 2), (2, 2), (1, 1)]
+    assert board.top("1h", 1) == [(3, 2)]
+
+    now += 3600
+    board.record(1)
+    assert board.top("1h", 10) == [(1, 1)]
+    assert board.top("24h", 10) == [(3, 2), (2, 2), (1, 2)]
+
+    board.record(4, datetime.fromtimestamp(now - 8 * 24 * 3600, timezone.utc))
+    board.remove_question(3)
+    assert board.top("7d", 10) == [(2, 2), (1, 2)]
+
+    now += 7 * 24 * 3600
+    assert board.top("7d", 10) == []
+    assert board.stats()["buckets"] == 0